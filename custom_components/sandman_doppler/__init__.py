@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable
 from datetime import timedelta
 import functools
 import logging
+import secrets
 from typing import Any
 
 from doppyler.client import DopplerClient
+from doppyler.const import ATTR_ALARM_SOUNDS, ATTR_ALARMS
 from doppyler.exceptions import DopplerException
 from doppyler.model.doppler import Doppler
 
@@ -23,16 +26,47 @@ from homeassistant.core import CoreState, HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_at, async_track_time_interval
 from homeassistant.helpers.network import get_url
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN
+from .alarms import DopplerAlarmIndex
+from .breaker import BreakerState, DopplerCircuitBreaker
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_PUSH_UPDATES,
+    CONF_WEBHOOK_TOKEN,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_PUSH_UPDATES,
+    DOMAIN,
+    LOCAL_API_SEMAPHORE_LIMIT,
+)
+from .helpers import FORCE_WRITE, REQUEST_ERRORS
 from .http import DopplerWebhookView
+from .polling import POLL_KEYS, POLL_TIERS, VOLATILE_KEYS, DopplerPollTier
+from .reconciler import DopplerReconciler, async_remove_profiles
+from .scheduler import REQUEST_PRIORITY, DopplerRequestScheduler, RequestPriority
 from .services import DopplerServices
-
-SCAN_INTERVAL = timedelta(seconds=60)
+from .snapshot import DopplerSnapshots, async_remove_snapshots
+from .storage import DopplerStore, async_remove_store, decode_data
+
+# The coordinator wakes up as often as the fastest tier and only fetches the tiers
+# that are due
+SCAN_INTERVAL = min(tier.update_interval for tier in POLL_TIERS)
+# When clocks push their state, every tier is polled as often as the slowest one as
+# a safety net for missed pushes
+PUSH_SCAN_INTERVAL = max(tier.update_interval for tier in POLL_TIERS)
+# Cached values confirmed by the device this recently are trusted to skip writes
+WRITE_CACHE_MAX_AGE = timedelta(minutes=5)
+# Keys whose data is managed by the library, so pushes to them trigger a refresh
+PUSH_REFRESH_KEYS = {ATTR_ALARMS, ATTR_ALARM_SOUNDS}
+# Seconds between attempts to get the initial data until the breaker opens
+RETRY_INTERVAL = 15
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -70,13 +104,38 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up config entry."""
     hass.data.setdefault(DOMAIN, {}).setdefault(entry.entry_id, {})
 
+    # The webhook view is unauthenticated and the device ID and serial number in
+    # its calls aren't secret, so clocks are given a URL with a token in it
+    if CONF_WEBHOOK_TOKEN not in entry.data:
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_TOKEN: secrets.token_urlsafe(32)}
+        )
+
     email = entry.data[CONF_EMAIL]
     password = entry.data[CONF_PASSWORD]
 
     session = async_get_clientsession(hass)
     client = DopplerClient(
-        email, password, client_session=session, local_api_semaphore_limit=1
+        email,
+        password,
+        client_session=session,
+        local_api_semaphore_limit=LOCAL_API_SEMAPHORE_LIMIT,
+    )
+    # Requests to a single clock are serialized in their own lane, but different
+    # clocks are polled in parallel up to the configured limit
+    scheduler = DopplerRequestScheduler(
+        entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)
     )
+    hass.data[DOMAIN][entry.entry_id]["scheduler"] = scheduler
+
+    store = DopplerStore(hass, entry, client)
+    alarm_index = DopplerAlarmIndex(hass)
+    hass.data[DOMAIN][entry.entry_id]["alarm_index"] = alarm_index
+    reconciler = DopplerReconciler(hass, entry)
+    await reconciler.async_load()
+    hass.data[DOMAIN][entry.entry_id]["reconciler"] = reconciler
+    snapshots = DopplerSnapshots(hass, entry)
+    await snapshots.async_load()
 
     dev_reg = dr.async_get(hass)
     ent_reg = er.async_get(hass)
@@ -86,10 +145,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     @callback
-    def async_on_device_added(doppler: Doppler) -> None:
+    def async_on_device_added(
+        doppler: Doppler, data: dict[str, Any] | None = None
+    ) -> None:
         """Handle device added."""
         # Create a new coordinator and device registry entry for every new device and
-        # trigger an initial refresh to get information
+        # either restore its last known data or trigger an initial refresh to get
+        # information
         _LOGGER.debug("Doppler added: %s", doppler)
         dev_entry = dev_reg.async_get_or_create(
             config_entry_id=entry.entry_id,
@@ -101,9 +163,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             name=doppler.name,
         )
         hass.data[DOMAIN][entry.entry_id][doppler.dsn] = coordinator = (
-            DopplerDataUpdateCoordinator(hass, entry, client, doppler, dev_entry)
+            DopplerDataUpdateCoordinator(
+                hass, entry, client, scheduler, store, alarm_index, doppler, dev_entry
+            )
         )
-        hass.async_create_task(coordinator.async_refresh())
+        if data:
+            coordinator.async_restore_data(data)
+        else:
+            hass.async_create_task(coordinator.async_refresh())
 
     @callback
     def async_on_device_removed(doppler: Doppler) -> None:
@@ -112,7 +179,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         dev_entry = dev_reg.async_get_device({(DOMAIN, doppler.dsn)})
         assert dev_entry
         dev_reg.async_remove_device(dev_entry.id)
-        hass.data[DOMAIN][entry.entry_id].pop(doppler.dsn)
+        coordinator: DopplerDataUpdateCoordinator = hass.data[DOMAIN][
+            entry.entry_id
+        ].pop(doppler.dsn)
+        hass.async_create_task(coordinator.async_shutdown())
+        store.async_remove_device(doppler.dsn)
 
     entry.async_on_unload(client.on_device_added(async_on_device_added))
     entry.async_on_unload(client.on_device_removed(async_on_device_removed))
@@ -130,17 +201,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
     )
 
+    # Devices we already know about get their entities right away from the last
+    # known data, and are marked stale until a live refresh confirms them
+    cached_devices = await store.async_load()
+    for dsn, (doppler, data) in cached_devices.items():
+        client.devices[dsn] = doppler
+        async_on_device_added(doppler, data)
+
+    @callback
+    def async_start(_: Any = None) -> None:
+        """Get devices from the cloud and refresh the cached devices."""
+        hass.async_create_task(_get_devices(client))
+        for dsn in cached_devices:
+            if coordinator := hass.data[DOMAIN][entry.entry_id].get(dsn):
+                hass.async_create_task(coordinator.async_refresh())
+
     # Since getting devies can take some time, we delay querying until after startup
     # so we don't hold everything up.
     if hass.state == CoreState.running:
-        hass.async_create_task(_get_devices(client))
+        async_start()
     else:
-        hass.bus.async_listen_once(
-            EVENT_HOMEASSISTANT_STARTED,
-            lambda _: hass.async_create_task(_get_devices(client)),
-        )
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, async_start)
+
+    entry.async_on_unload(
+        DopplerServices(
+            hass, ent_reg, dev_reg, client, alarm_index, reconciler, snapshots
+        ).async_register()
+    )
+    entry.async_on_unload(reconciler.async_start())
 
-    DopplerServices(hass, ent_reg, dev_reg, client).async_register()
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
@@ -156,15 +246,28 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
     )
     if unloaded:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await asyncio.gather(
+            *(
+                coordinator.async_shutdown()
+                for coordinator in entry_data.values()
+                if isinstance(coordinator, DopplerDataUpdateCoordinator)
+            )
+        )
 
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Handle removal of an entry."""
+    await async_remove_store(hass, entry)
+    await async_remove_profiles(hass, entry)
+    await async_remove_snapshots(hass, entry)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    await hass.config_entries.async_reload(entry.entry_id)
 
 
 class DopplerDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
@@ -175,18 +278,59 @@ class DopplerDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         hass: HomeAssistant,
         entry: ConfigEntry,
         client: DopplerClient,
+        scheduler: DopplerRequestScheduler,
+        store: DopplerStore,
+        alarm_index: DopplerAlarmIndex,
         doppler: Doppler,
         device_entry: dr.DeviceEntry,
     ) -> None:
         """Initialize."""
+        self._base_update_interval = (
+            PUSH_SCAN_INTERVAL
+            if entry.options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES)
+            else SCAN_INTERVAL
+        )
         super().__init__(
-            hass, _LOGGER, name=f"{DOMAIN}_{doppler.dsn}", update_interval=SCAN_INTERVAL
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{doppler.dsn}",
+            update_interval=self._base_update_interval,
         )
         self.data: dict[str, Any] = {}
         self.api = client
         self.doppler = doppler
+        self.stale = False
+        self.breaker = DopplerCircuitBreaker(
+            hass, f"{doppler.name} ({doppler.dsn})", self._async_handle_breaker_change
+        )
         self._entry = entry
+        self._store = store
+        self.alarm_index = alarm_index
+        self._untrack_alarms = alarm_index.async_track(doppler)
         self._entities_created = False
+        self._webhooks_configured = False
+        self._unsub_retry: Callable[[], None] | None = None
+        self._scheduler = scheduler
+        self._detach_scheduler = scheduler.async_attach(
+            doppler, self.async_reset_update_interval, self._async_reschedule_refresh
+        )
+        self._tier_next_refresh: dict[str, float] = {}
+        self._confirmed_at: dict[str, float] = {}
+        self.writes_sent = 0
+        self.writes_skipped = 0
+        self._changed_keys: set[str] | None = None
+        self._listeners_available = True
+        self._adaptive_polling: bool = entry.options.get(
+            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+        )
+        self._max_update_interval = max(
+            timedelta(
+                seconds=entry.options.get(
+                    CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+                )
+            ),
+            self._base_update_interval,
+        )
         base_url = get_url(
             self.hass,
             require_ssl=False,
@@ -199,23 +343,289 @@ class DopplerDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             prefer_cloud=False,
         )
         self._webhook_url = (
-            f"{base_url}/api/sandman_doppler/smart_button/{device_entry.id}"
+            f"{base_url}/api/sandman_doppler/smart_button/{device_entry.id}/"
+            f"{entry.data[CONF_WEBHOOK_TOKEN]}"
+        )
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call and stop routing requests through the lane."""
+        await super().async_shutdown()
+        if self._unsub_retry:
+            self._unsub_retry()
+            self._unsub_retry = None
+        self._detach_scheduler()
+        self._untrack_alarms()
+
+    @callback
+    def async_restore_data(self, data: dict[str, Any]) -> None:
+        """Create entities from the last known data until the device confirms it."""
+        self.data = data
+        self.stale = True
+        self._entities_created = True
+        async_dispatcher_send(
+            self.hass, f"{DOMAIN}_{self._entry.entry_id}_device_added", self.doppler
+        )
+
+    @callback
+    def async_push_data(self, data: dict[str, Any]) -> None:
+        """Patch the data with state changes pushed by the device.
+
+        `data` is encoded the same way as the stored data. Only the entities that
+        depend on keys that changed are updated. Pushes aren't proof that the
+        device is reachable or has a value, so they don't close the breaker, and
+        the values they change need a poll or write to confirm them again.
+        """
+        if not self.data:
+            return
+        data = decode_data({key: val for key, val in data.items() if key in POLL_KEYS})
+        if refresh_keys := PUSH_REFRESH_KEYS.intersection(data):
+            if ATTR_ALARMS in refresh_keys:
+                self.alarm_index.async_expire(self.doppler.dsn)
+            self.hass.async_create_task(self.async_refresh_keys(*refresh_keys))
+        changed_keys = {
+            key
+            for key, val in data.items()
+            if key not in refresh_keys and self.data.get(key) != val
+        }
+        _LOGGER.debug(
+            "Received push for device %s (%s), changed keys: %s",
+            self.doppler.name,
+            self.doppler.dsn,
+            changed_keys,
+        )
+        if not changed_keys:
+            return
+        for key in changed_keys:
+            self._confirmed_at.pop(key, None)
+        self._changed_keys = changed_keys
+        self.async_set_updated_data(
+            {**self.data, **{key: data[key] for key in changed_keys}}
+        )
+        self._store.async_schedule_save(self)
+
+    @callback
+    def async_confirm_keys(self, *keys: str) -> None:
+        """Mark the cached values of keys as just confirmed by the device."""
+        now = self.hass.loop.time()
+        for key in keys:
+            self._confirmed_at[key] = now
+
+    @callback
+    def async_record_write(self, *keys: str) -> None:
+        """Count a write that set the values of keys on the device."""
+        self.writes_sent += 1
+        self.async_confirm_keys(*keys)
+
+    @callback
+    def async_update_keys(self, *keys: str) -> None:
+        """Update the listeners of keys whose values were changed by a write."""
+        self.async_confirm_keys(*keys)
+        self._changed_keys = set(keys)
+        self.async_update_listeners()
+        self._store.async_schedule_save(self)
+
+    @callback
+    def async_should_write(
+        self, key: str, is_set: bool, force: bool | None = None
+    ) -> bool:
+        """Return whether a value needs to be written to the device.
+
+        A write is skipped when the cached value already matches (`is_set`) and was
+        confirmed by the device recently, unless the write is being forced. `force`
+        defaults to whether the caller's context is forcing writes.
+        """
+        if force is None:
+            force = FORCE_WRITE.get()
+        if (
+            is_set
+            and not force
+            and (confirmed_at := self._confirmed_at.get(key)) is not None
+            and self.hass.loop.time() - confirmed_at
+            < WRITE_CACHE_MAX_AGE.total_seconds()
+        ):
+            _LOGGER.debug(
+                "Skipping write of %s to device %s (%s), value is already set",
+                key,
+                self.doppler.name,
+                self.doppler.dsn,
+            )
+            self.writes_skipped += 1
+            return False
+        return True
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners that depend on keys that changed.
+
+        Listeners without a context, and all listeners when availability changed or
+        when we don't know what changed, are always updated.
+        """
+        changed_keys, self._changed_keys = self._changed_keys, None
+        if (
+            changed_keys is None
+            or self.last_update_success != self._listeners_available
+        ):
+            self._listeners_available = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or not context.isdisjoint(changed_keys):
+                update_callback()
+
+    @callback
+    def _async_handle_breaker_change(self) -> None:
+        """Update the entities that show the breaker state.
+
+        The breaker opens after refreshes have already failed, and the base class
+        doesn't update listeners when a failed refresh follows another one.
+        """
+        # Listeners without a context are updated no matter which keys changed
+        self._changed_keys = set()
+        self.async_update_listeners()
+
+    @callback
+    def async_reset_update_interval(self) -> None:
+        """Go back to polling at the base interval.
+
+        Called whenever something on the device is likely to have changed: a
+        command was sent, a smart button was pressed or a poll returned new data.
+        """
+        if self.update_interval == self._base_update_interval:
+            return
+        _LOGGER.debug(
+            "Resetting poll interval for device %s (%s) to %s",
+            self.doppler.name,
+            self.doppler.dsn,
+            self._base_update_interval,
         )
+        self.update_interval = self._base_update_interval
+        self._async_reschedule_refresh()
+
+    @callback
+    def _async_reschedule_refresh(self) -> None:
+        """Move the scheduled refresh to the current interval and refresh slot."""
+        # Only move a refresh that is already scheduled; one that is in progress
+        # will pick up the new schedule when it finishes
+        if self._unsub_refresh:
+            self._schedule_refresh()
 
-    async def _reschedule_refresh(self) -> None:
-        """Reschedule refresh due to failure."""
-        _LOGGER.debug("Update failed, scheduling a new one in 15 seconds")
-        await asyncio.sleep(15)
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule a refresh in the device's slot of the fleet refresh period.
+
+        This replaces the random per coordinator offset used by the base class so
+        the polls for all devices on the account are spread out evenly.
+        """
+        if self.update_interval is None:
+            return
+
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+
+        self._async_unsub_refresh()
+        next_refresh = self._scheduler.async_get_refresh_time(
+            self.doppler.dsn,
+            self.hass.loop.time() + self.update_interval.total_seconds(),
+            SCAN_INTERVAL.total_seconds(),
+        )
+        # Don't wake up before the breaker lets requests through again
+        if self.breaker.retry_at and self.breaker.retry_at > next_refresh:
+            next_refresh = self.breaker.retry_at
+        self._unsub_refresh = async_call_at(self.hass, self._job, next_refresh)
+
+    @callback
+    def _async_adapt_update_interval(self, changed_keys: set[str]) -> None:
+        """Back off the poll interval while polls keep returning the same data."""
+        if changed_keys:
+            self.async_reset_update_interval()
+            return
+        self.update_interval = min(self.update_interval * 2, self._max_update_interval)
+        _LOGGER.debug(
+            "No changes for device %s (%s), next poll in %s",
+            self.doppler.name,
+            self.doppler.dsn,
+            self.update_interval,
+        )
+
+    @callback
+    def _async_schedule_retry(self) -> None:
+        """Retry a failed refresh once the breaker lets requests through.
+
+        The base class only schedules refreshes while entities are listening, so
+        this keeps trying to get the initial data for a device.
+        """
+        if self._unsub_retry:
+            self._unsub_retry()
+        retry_at = self.breaker.retry_at or self.hass.loop.time() + RETRY_INTERVAL
+        _LOGGER.debug(
+            "Update failed, retrying in %.0f seconds",
+            retry_at - self.hass.loop.time(),
+        )
+        self._unsub_retry = async_call_at(self.hass, self._async_retry, retry_at)
+
+    async def _async_retry(self, _now: Any) -> None:
+        """Retry a failed refresh."""
+        self._unsub_retry = None
         await self.async_refresh()
 
+    @callback
+    def _async_get_due_tiers(self) -> list[DopplerPollTier]:
+        """Return the poll tiers that need to be refreshed."""
+        # Until we have a full set of data every tier is due
+        if not self.data:
+            return list(POLL_TIERS)
+        now = self.hass.loop.time()
+        return [
+            tier
+            for tier in POLL_TIERS
+            if self._tier_next_refresh.get(tier.name, 0) <= now
+        ]
+
+    async def _async_get_tier_data(
+        self, tiers: list[DopplerPollTier]
+    ) -> dict[str, Any]:
+        """Get data for the given poll tiers from the device."""
+        getters = [getter for tier in tiers for getter in tier.getters]
+        # Every getter is queued as its own request at poll priority, so commands
+        # can be sent in between them
+        token = REQUEST_PRIORITY.set(RequestPriority.POLL)
+        try:
+            results = await asyncio.gather(*(func(self.doppler) for _, func in getters))
+        finally:
+            REQUEST_PRIORITY.reset(token)
+        return {key: result for (key, _), result in zip(getters, results)}
+
+    async def async_refresh_keys(self, *keys: str) -> None:
+        """Refresh the poll tiers that include any of the given keys."""
+        for tier in POLL_TIERS:
+            if tier.keys.intersection(keys):
+                self._tier_next_refresh.pop(tier.name, None)
+        await self.async_request_refresh()
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Update data via library."""
+        tiers = self._async_get_due_tiers()
         _LOGGER.debug(
-            "Getting update for device %s (%s)", self.doppler.name, self.doppler.dsn
+            "Getting %s update for device %s (%s)",
+            "/".join(tier.name for tier in tiers),
+            self.doppler.name,
+            self.doppler.dsn,
         )
+        # Don't tie up a request slot on a device that we know isn't responding
+        if not self.breaker.async_allow_request():
+            raise UpdateFailed(
+                f"{self.doppler.name} ({self.doppler.dsn}) is unreachable, waiting "
+                "to retry"
+            )
+        start = self.hass.loop.time()
         try:
-            data = await self.doppler.get_all_data()
-        except DopplerException as exc:
+            if self.breaker.state == BreakerState.HALF_OPEN:
+                # Check that the device is back with a single request before
+                # sending the rest
+                await self.doppler.get_is_in_day_mode()
+            data = await self._async_get_tier_data(tiers)
+        except REQUEST_ERRORS as exc:
             _LOGGER.debug(
                 "Exception received during update for device %s (%s): %s: %s",
                 self.doppler.name,
@@ -223,17 +633,36 @@ class DopplerDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 type(exc).__name__,
                 exc,
             )
+            self.breaker.async_record_failure()
             if not self._entities_created:
-                self.hass.async_create_task(self._reschedule_refresh())
+                self._async_schedule_retry()
             raise UpdateFailed() from exc
         else:
+            self.breaker.async_record_success()
             _LOGGER.debug(
                 "Finished getting update for device %s (%s)",
                 self.doppler.name,
                 self.doppler.dsn,
             )
-        if not self.data:
-            self._entities_created = True
+        for tier in tiers:
+            self._tier_next_refresh[tier.name] = (
+                start + tier.update_interval.total_seconds()
+            )
+        self.async_confirm_keys(*data)
+        if ATTR_ALARMS in data:
+            self.alarm_index.async_confirm(self.doppler.dsn)
+        self._changed_keys = {
+            key
+            for key, val in data.items()
+            if key not in self.data or self.data[key] != val
+        }
+        if self._adaptive_polling and self.data:
+            self._async_adapt_update_interval(self._changed_keys - VOLATILE_KEYS)
+        if self.stale:
+            # Every entity needs to drop its assumed state
+            self.stale = False
+            self._changed_keys = None
+        if not self._webhooks_configured:
             await asyncio.gather(
                 *[
                     self.doppler.set_smart_button_configuration(
@@ -242,7 +671,11 @@ class DopplerDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                     for button_num in range(1, 3)
                 ]
             )
+            self._webhooks_configured = True
+        if not self._entities_created:
+            self._entities_created = True
             async_dispatcher_send(
                 self.hass, f"{DOMAIN}_{self._entry.entry_id}_device_added", self.doppler
             )
-        return data
+        self._store.async_schedule_save(self)
+        return {**self.data, **data}
@@ -0,0 +1,201 @@
+"""Alarm index for Sandman Doppler Clocks."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from doppyler.model.alarm import Alarm
+from doppyler.model.doppler import Doppler
+
+from homeassistant.core import HomeAssistant, callback
+
+# Alarms read from a device this recently are trusted without reading them again
+ALARM_CACHE_MAX_AGE = timedelta(minutes=5)
+# Statuses of an alarm that is turned on, including while it's going off
+ARMED_STATUSES = {"set", "ready", "activating", "active", "snoozing", "snoozed"}
+
+
+@dataclass
+class AlarmSyncPlan:
+    """Class to represent the writes that bring a device's alarms to a desired set."""
+
+    add: list[Alarm] = field(default_factory=list)
+    update: list[Alarm] = field(default_factory=list)
+    delete: list[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """Return whether there is anything to write."""
+        return bool(self.add or self.update or self.delete)
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests writing the plan sends to the device."""
+        # The library has to read the alarms after adding or removing them
+        return (
+            len(self.add)
+            + len(self.update)
+            + len(self.delete)
+            + bool(self.add or self.delete)
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the planned writes as a service response."""
+        return {
+            "add": [alarm.id for alarm in self.add],
+            "update": [alarm.id for alarm in self.update],
+            "delete": self.delete,
+        }
+
+
+def _alarm_matches(current: Alarm, desired: Alarm) -> bool:
+    """Return whether an alarm on the device already matches the desired alarm."""
+    if desired.status == "set":
+        # An alarm that is going off or snoozed is still turned on
+        status_matches = current.status in ARMED_STATUSES
+    else:
+        status_matches = current.status == desired.status
+    # The days an alarm repeats on are a set, whatever order the device lists them in
+    return status_matches and (
+        current.name,
+        current.time,
+        set(current.repeat),
+        current.color,
+        current.volume,
+        current.sound,
+    ) == (
+        desired.name,
+        desired.time,
+        set(desired.repeat),
+        desired.color,
+        desired.volume,
+        desired.sound,
+    )
+
+
+def plan_alarm_sync(
+    current: Mapping[int, Alarm], desired: Mapping[int, Alarm], prune: bool = True
+) -> AlarmSyncPlan:
+    """Plan the fewest writes that turn the current alarms into the desired ones.
+
+    Alarms that aren't in the desired set are deleted when `prune` is set.
+    """
+    plan = AlarmSyncPlan()
+    for alarm_id, alarm in desired.items():
+        if (existing := current.get(alarm_id)) is None:
+            plan.add.append(alarm)
+        elif not _alarm_matches(existing, alarm):
+            plan.update.append(alarm)
+    if prune:
+        plan.delete.extend(sorted(current.keys() - desired.keys()))
+    return plan
+
+
+class DopplerAlarmIndex:
+    """Index of the alarms on every Doppler, keyed by dsn and then alarm ID.
+
+    The alarms are the library's own `Doppler.alarms` objects, so they stay in line
+    with what the alarm switches show. Each device's alarms get a version stamp
+    whenever they are confirmed by the device, and lose it when the device reports
+    that they changed, so updates only need to read them first when they're stale.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize alarm index."""
+        self.hass = hass
+        self._alarms: dict[str, dict[int, Alarm]] = {}
+        self._synced_at: dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @callback
+    def async_track(self, doppler: Doppler) -> Callable[[], None]:
+        """Index a device's alarms and keep the index in line with the library.
+
+        Returns a callable that removes the device from the index.
+        """
+        dsn = doppler.dsn
+        device_alarms = self._alarms[dsn] = {
+            alarm.id: alarm for alarm in doppler.alarms.values()
+        }
+
+        @callback
+        def async_on_alarm_added(alarm: Alarm) -> None:
+            """Index an alarm the library found on the device."""
+            device_alarms[alarm.id] = alarm
+
+        @callback
+        def async_on_alarm_removed(alarm: Alarm) -> None:
+            """Drop an alarm the library no longer found on the device."""
+            device_alarms.pop(alarm.id, None)
+
+        unsubs = [
+            doppler.on_alarm_added(async_on_alarm_added),
+            doppler.on_alarm_removed(async_on_alarm_removed),
+        ]
+
+        @callback
+        def async_untrack() -> None:
+            """Stop tracking the device and drop its alarms."""
+            for unsub in unsubs:
+                unsub()
+            if self._alarms.get(dsn) is device_alarms:
+                del self._alarms[dsn]
+            self._synced_at.pop(dsn, None)
+
+        return async_untrack
+
+    @callback
+    def async_confirm(self, dsn: str) -> None:
+        """Stamp a device's alarms as just read from the device."""
+        self._synced_at[dsn] = self.hass.loop.time()
+
+    @callback
+    def async_expire(self, dsn: str) -> None:
+        """Drop the stamp of a device's alarms because they changed on the device."""
+        self._synced_at.pop(dsn, None)
+
+    @callback
+    def async_is_fresh(self, dsn: str) -> bool:
+        """Return whether a device's alarms were read from the device recently."""
+        return (synced_at := self._synced_at.get(dsn)) is not None and (
+            self.hass.loop.time() - synced_at < ALARM_CACHE_MAX_AGE.total_seconds()
+        )
+
+    @callback
+    def async_record_lookup(self, fresh: bool) -> None:
+        """Count whether an update could use the indexed alarms of a device."""
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    @callback
+    def async_get(self, dsn: str, alarm_id: int) -> Alarm | None:
+        """Return an indexed alarm."""
+        return self._alarms.get(dsn, {}).get(alarm_id)
+
+    @callback
+    def async_get_device_alarms(self, dsn: str) -> dict[int, Alarm]:
+        """Return the indexed alarms of a device by alarm ID."""
+        return dict(self._alarms.get(dsn, {}))
+
+    @callback
+    def async_process_response(self, dsn: str, alarms: Iterable[Alarm]) -> bool:
+        """Update the index from the alarm list a device returned for a write.
+
+        Alarms are updated in place and stamped when the device has the same alarm
+        IDs as the index. Otherwise the stamp is dropped, since the library has to
+        read the alarms again to add or remove them, and False is returned.
+        """
+        alarms = {alarm.id: alarm for alarm in alarms}
+        indexed = self._alarms.get(dsn, {})
+        if alarms.keys() != indexed.keys():
+            self.async_expire(dsn)
+            return False
+        for alarm_id, alarm in alarms.items():
+            indexed[alarm_id].update(alarm)
+        self.async_confirm(dsn)
+        return True
@@ -0,0 +1,219 @@
+"""Host-side light bar animations for Sandman Doppler Clocks."""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_right
+from collections.abc import Callable
+from datetime import timedelta
+import logging
+import math
+
+from doppyler.model.color import Color
+from doppyler.model.doppler import Doppler
+from doppyler.model.light_bar import LightBarDisplayEffect, Mode
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN
+from .helpers import REQUEST_ERRORS
+from .scheduler import REQUEST_PRIORITY, RequestPriority
+
+_LOGGER = logging.getLogger(__name__)
+
+# Weight of the latest round trip in the smoothed round trip time
+ROUND_TRIP_SMOOTHING = 0.3
+# Consecutive failed frames after which an animation stops
+MAX_CONSECUTIVE_FAILURES = 10
+# Longest wait in seconds before the next frame after failed frames
+MAX_FAILURE_BACKOFF = 5
+
+# Returns the colors of every LED at the given number of seconds into the animation
+FrameFunc = Callable[[float], list[Color]]
+
+
+def _flatten(colors: list[Color], led_count: int) -> list[int]:
+    """Flatten colors into one channel list covering every LED.
+
+    Like `set-each`, the last color is used for every LED after the given colors.
+    """
+    colors = colors[:led_count]
+    colors.extend(colors[-1:] * (led_count - len(colors)))
+    return [channel for color in colors for channel in color.to_list()]
+
+
+def _to_colors(channels: list[int]) -> list[Color]:
+    """Convert a flat channel list back into colors."""
+    return [Color(*channels[idx : idx + 3]) for idx in range(0, len(channels), 3)]
+
+
+def keyframe_animation(
+    keyframes: list[tuple[float, list[Color]]], led_count: int, loop: bool = True
+) -> FrameFunc:
+    """Return a frame function that blends linearly between keyframes.
+
+    Each keyframe is a (seconds, colors) pair. The animation repeats after the last
+    keyframe when `loop` is set and holds the last keyframe otherwise.
+    """
+    keyframes = sorted(keyframes, key=lambda keyframe: keyframe[0])
+    times = [offset for offset, _ in keyframes]
+    frames = [_flatten(list(colors), led_count) for _, colors in keyframes]
+    period = times[-1]
+
+    def _frame(elapsed: float) -> list[Color]:
+        """Return the frame at `elapsed` seconds."""
+        if loop and period > 0:
+            elapsed %= period
+        idx = bisect_right(times, elapsed)
+        if idx == 0:
+            return _to_colors(frames[0])
+        if idx == len(times):
+            return _to_colors(frames[-1])
+        start, end = frames[idx - 1], frames[idx]
+        fraction = (elapsed - times[idx - 1]) / (times[idx] - times[idx - 1])
+        return _to_colors([round(a + (b - a) * fraction) for a, b in zip(start, end)])
+
+    return _frame
+
+
+def rotate_animation(colors: list[Color], led_count: int, period: float) -> FrameFunc:
+    """Return a frame function that rotates colors around the bar once a period."""
+    channels = _flatten(colors, led_count)
+
+    def _frame(elapsed: float) -> list[Color]:
+        """Return the frame at `elapsed` seconds."""
+        offset = int(elapsed / period * led_count) % led_count * 3
+        return _to_colors(channels[offset:] + channels[:offset])
+
+    return _frame
+
+
+def breathe_animation(colors: list[Color], led_count: int, period: float) -> FrameFunc:
+    """Return a frame function that fades colors in and out once a period."""
+    channels = _flatten(colors, led_count)
+
+    def _frame(elapsed: float) -> list[Color]:
+        """Return the frame at `elapsed` seconds."""
+        scale = (1 - math.cos(2 * math.pi * elapsed / period)) / 2
+        return _to_colors([round(channel * scale) for channel in channels])
+
+    return _frame
+
+
+ANIMATION_GENERATORS: dict[str, Callable[[list[Color], int, float], FrameFunc]] = {
+    "rotate": rotate_animation,
+    "breathe": breathe_animation,
+}
+
+
+class DopplerLightBarAnimation:
+    """Play an animation on a Doppler's light bar as a series of `set-each` frames.
+
+    Frames are sent one at a time on slots of `1 / fps` seconds. When the device
+    takes longer than a slot to take a frame, the slots it can't keep up with are
+    dropped instead of queueing frames behind it. After a failed frame the next one
+    waits exponentially longer, and the animation stops when the device keeps
+    failing.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        doppler: Doppler,
+        frame_func: FrameFunc,
+        fps: float,
+        run_for: timedelta | None = None,
+    ) -> None:
+        """Initialize light bar animation."""
+        self.hass = hass
+        self.doppler = doppler
+        self.frame_func = frame_func
+        self.fps = fps
+        self.run_for = run_for
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.round_trip: float | None = None
+        self._task: asyncio.Task | None = None
+        self._on_done: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self, on_done: CALLBACK_TYPE | None = None) -> None:
+        """Start the animation and call `on_done` once it ends, however it ends."""
+        self._on_done = on_done
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN} light bar animation for {self.doppler.dsn}"
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the animation."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def _get_frame_duration(self, interval: float) -> timedelta:
+        """Return how long a frame stays up if the next one doesn't make it."""
+        return timedelta(seconds=math.ceil(2 * max(interval, self.round_trip or 0)))
+
+    async def _async_run(self) -> None:
+        """Send frames until the animation is stopped, runs out or keeps failing."""
+        # Animations run in the background, so don't hold up anything else
+        REQUEST_PRIORITY.set(RequestPriority.POLL)
+        try:
+            await self._async_send_frames()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected error animating %s", self.doppler)
+        finally:
+            self._task = None
+            if self._on_done:
+                self._on_done()
+
+    async def _async_send_frames(self) -> None:
+        """Send frames on their slots."""
+        loop = self.hass.loop
+        interval = 1 / self.fps
+        start = loop.time()
+        end = start + self.run_for.total_seconds() if self.run_for else None
+        slot = 0
+        failures = 0
+        while True:
+            sent_at = loop.time()
+            if end is not None and sent_at >= end:
+                return
+            lbde = LightBarDisplayEffect(
+                Mode.SET_EACH,
+                self._get_frame_duration(interval),
+                colors=self.frame_func(sent_at - start),
+            )
+            try:
+                await self.doppler.set_light_bar_effect(lbde)
+            except REQUEST_ERRORS as err:
+                _LOGGER.debug("Error sending frame to %s: %s", self.doppler, err)
+                failures += 1
+                if failures >= MAX_CONSECUTIVE_FAILURES:
+                    _LOGGER.warning(
+                        "Stopping light bar animation on %s after %s failed frames: "
+                        "%s",
+                        self.doppler,
+                        failures,
+                        err,
+                    )
+                    return
+            else:
+                self.frames_sent += 1
+                failures = 0
+
+            round_trip = loop.time() - sent_at
+            if self.round_trip is None:
+                self.round_trip = round_trip
+            else:
+                self.round_trip += ROUND_TRIP_SMOOTHING * (round_trip - self.round_trip)
+
+            # Skip to the first slot the device is expected to be ready for
+            ready_at = max(loop.time(), sent_at + self.round_trip)
+            if failures:
+                ready_at += min(interval * 2**failures, MAX_FAILURE_BACKOFF)
+            next_slot = max(slot + 1, math.ceil((ready_at - start) / interval))
+            self.frames_dropped += next_slot - slot - 1
+            slot = next_slot
+            await asyncio.sleep(start + slot * interval - loop.time())
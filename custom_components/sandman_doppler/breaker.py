@@ -0,0 +1,97 @@
+"""Circuit breaker for unreachable Sandman Doppler Clocks."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from enum import StrEnum
+import logging
+import random
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of consecutive failures before we stop polling a device
+FAILURE_THRESHOLD = 3
+MIN_BACKOFF = 30
+MAX_BACKOFF = 1800
+
+
+class BreakerState(StrEnum):
+    """States of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class DopplerCircuitBreaker:
+    """Track whether a Doppler is reachable and back off when it isn't.
+
+    The breaker opens after a number of consecutive failures. While it is open, no
+    requests are made until the backoff, which doubles every time the breaker opens
+    again and is jittered so dead clocks don't retry in lockstep, has passed. The
+    breaker then goes half open and lets a single cheap probe through, which either
+    closes it again or reopens it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        on_change: Callable[[], None] | None = None,
+    ) -> None:
+        """Initialize circuit breaker.
+
+        If provided, `on_change` is called whenever the breaker changes state.
+        """
+        self.hass = hass
+        self.name = name
+        self._on_change = on_change
+        self.state = BreakerState.CLOSED
+        self.retry_at: float | None = None
+        self._failures = 0
+        self._opened = 0
+
+    @callback
+    def async_allow_request(self) -> bool:
+        """Return whether a request to the device should be made."""
+        if self.state == BreakerState.OPEN:
+            if self.hass.loop.time() < self.retry_at:
+                return False
+            self._async_set_state(BreakerState.HALF_OPEN)
+        return True
+
+    @callback
+    def async_record_success(self) -> None:
+        """Record a successful request and close the breaker."""
+        if self.state != BreakerState.CLOSED:
+            _LOGGER.info("%s is reachable again", self.name)
+        self.retry_at = None
+        self._failures = 0
+        self._opened = 0
+        self._async_set_state(BreakerState.CLOSED)
+
+    @callback
+    def async_record_failure(self) -> None:
+        """Record a failed request and open the breaker if needed."""
+        self._failures += 1
+        if self.state != BreakerState.HALF_OPEN and self._failures < FAILURE_THRESHOLD:
+            return
+        backoff = min(MIN_BACKOFF * 2**self._opened, MAX_BACKOFF)
+        backoff = random.uniform(backoff / 2, backoff)
+        self._opened += 1
+        self.retry_at = self.hass.loop.time() + backoff
+        _LOGGER.debug(
+            "%s is unreachable, backing off for %.0f seconds", self.name, backoff
+        )
+        self._async_set_state(BreakerState.OPEN)
+
+    @callback
+    def _async_set_state(self, state: BreakerState) -> None:
+        """Change the state and let the listener know if it changed."""
+        if state == self.state:
+            return
+        self.state = state
+        if self._on_change:
+            self._on_change()
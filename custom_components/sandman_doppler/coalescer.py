@@ -0,0 +1,94 @@
+"""Write coalescing for Sandman Doppler Clocks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any, Generic, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+
+from .helpers import FORCE_WRITE
+
+# Seconds without new values to wait for before writing
+WRITE_DEBOUNCE = 0.25
+
+_T = TypeVar("_T")
+
+
+class DopplerWriteCoalescer(Generic[_T]):
+    """Coalesce rapid writes of a single value to a device.
+
+    A value is only written once no new value was requested for the debounce
+    window, and only the latest value is written. At most one write is in flight
+    at a time, and values requested while a write is in flight are coalesced into
+    a single write after it. A burst of calls that are less than the debounce
+    window apart therefore results in at most two writes, however long it lasts.
+
+    The write is forced when any of the calls it includes was made while forcing
+    writes, since the shared write task doesn't run in the callers' context.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        write_func: Callable[[_T, bool], Coroutine[Any, Any, Any]],
+        debounce: float = WRITE_DEBOUNCE,
+    ) -> None:
+        """Initialize write coalescer."""
+        self.hass = hass
+        self._write_func = write_func
+        self._debounce = debounce
+        self._value: _T | None = None
+        self._value_at = 0.0
+        self._force = False
+        self._waiters: list[asyncio.Future[None]] = []
+        self._task: asyncio.Task | None = None
+
+    async def async_write(self, value: _T) -> None:
+        """Write a value and wait until the write that includes it is done."""
+        self._value = value
+        self._value_at = self.hass.loop.time()
+        self._force = self._force or FORCE_WRITE.get()
+        waiter = self.hass.loop.create_future()
+        self._waiters.append(waiter)
+        if not self._task:
+            self._task = self.hass.async_create_task(self._async_write_pending())
+        await waiter
+
+    async def _async_write_pending(self) -> None:
+        """Write the latest value until there are no more values to write."""
+        try:
+            while self._waiters:
+                # Restart the debounce window while values keep coming in
+                while (
+                    wait := self._value_at + self._debounce - self.hass.loop.time()
+                ) > 0:
+                    await asyncio.sleep(wait)
+                value, force, count = self._value, self._force, len(self._waiters)
+                self._force = False
+                try:
+                    await self._write_func(value, force)
+                except Exception as err:  # pylint: disable=broad-except
+                    self._async_resolve_waiters(count, err)
+                else:
+                    self._async_resolve_waiters(count)
+        finally:
+            self._task = None
+            self._force = False
+            # Only left over if we were cancelled
+            for waiter in self._waiters:
+                waiter.cancel()
+            self._waiters.clear()
+
+    @callback
+    def _async_resolve_waiters(self, count: int, err: Exception | None = None) -> None:
+        """Let the callers waiting on a write know that it's done."""
+        waiters, self._waiters = self._waiters[:count], self._waiters[count:]
+        for waiter in waiters:
+            if waiter.done():
+                continue
+            if err:
+                waiter.set_exception(err)
+            else:
+                waiter.set_result(None)
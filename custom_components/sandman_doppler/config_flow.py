@@ -2,17 +2,30 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from doppyler.client import DopplerClient
 from doppyler.exceptions import DopplerException
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_PUSH_UPDATES,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_PUSH_UPDATES,
+    DOMAIN,
+)
 
 
 class DopplerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -20,6 +33,14 @@ class DopplerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> DopplerOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return DopplerOptionsFlowHandler(config_entry)
+
     async def async_step_user(self, user_input: dict[str, str] = None) -> FlowResult:
         """Handle a flow initialized by the user."""
         errors = {}
@@ -63,3 +84,49 @@ class DopplerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         except DopplerException:
             return False
         return True
+
+
+class DopplerOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for Doppler clocks."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input: dict[str, Any] = None) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=options.get(
+                            CONF_MAX_CONCURRENT_REQUESTS,
+                            DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+                    vol.Required(
+                        CONF_ADAPTIVE_POLLING,
+                        default=options.get(
+                            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                        ),
+                    ): cv.boolean,
+                    vol.Required(
+                        CONF_MAX_POLL_INTERVAL,
+                        default=options.get(
+                            CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=60, max=3600)),
+                    vol.Required(
+                        CONF_PUSH_UPDATES,
+                        default=options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES),
+                    ): cv.boolean,
+                }
+            ),
+        )
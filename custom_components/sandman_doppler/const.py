@@ -6,21 +6,71 @@ DOMAIN = "sandman_doppler"
 
 ATTR_DSN = "dsn"
 ATTR_BUTTON = "button"
+ATTR_ACTION = "action"
+ATTR_PATTERN = "pattern"
+ATTR_STATE = "state"
+ATTR_SOURCE_ENTITY_ID = "source_entity_id"
+ATTR_THRESHOLD = "threshold"
+ATTR_MIN_INTERVAL = "min_interval"
+ATTR_KEYFRAMES = "keyframes"
+ATTR_GENERATOR = "generator"
+ATTR_PERIOD = "period"
+ATTR_FPS = "fps"
+ATTR_LOOP = "loop"
+ATTR_STOPS = "stops"
+ATTR_PALETTE = "palette"
+ATTR_SPACE = "space"
+ATTR_LED_COUNT = "led_count"
+ATTR_FILE = "file"
+ATTR_PRUNE = "prune"
+ATTR_DRY_RUN = "dry_run"
+ATTR_SETTINGS = "settings"
+ATTR_SNAPSHOT = "snapshot"
+ATTR_PERSIST = "persist"
 CONF_SUBTYPE = "subtype"
 
 ATTR_DOPPLER_NAME = "doppler_name"
 
 EVENT_BUTTON_PRESSED = f"{DOMAIN}_button_pressed"
+EVENT_BUTTON_PATTERN = f"{DOMAIN}_button_pattern"
 
+# Number of dots on the light bar
+LIGHT_BAR_LED_COUNT = 29
+
+# Requests to a single clock are always sent one at a time
+LOCAL_API_SEMAPHORE_LIMIT = 1
+
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+DEFAULT_ADAPTIVE_POLLING = False
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+DEFAULT_MAX_POLL_INTERVAL = 900
+CONF_PUSH_UPDATES = "push_updates"
+DEFAULT_PUSH_UPDATES = False
+# Secret part of the webhook URL that clocks are configured to call
+CONF_WEBHOOK_TOKEN = "webhook_token"
+
+SERVICE_FORCE_WRITE = "force_write"
 SERVICE_SET_WEATHER_LOCATION = "set_weather_location"
 SERVICE_ADD_ALARM = "add_alarm"
 SERVICE_UPDATE_ALARM = "update_alarm"
 SERVICE_DELETE_ALARM = "delete_alarm"
+SERVICE_SYNC_ALARMS = "sync_alarms"
+SERVICE_SET_PROFILE = "set_profile"
+SERVICE_CLEAR_PROFILE = "clear_profile"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
 SERVICE_UPDATE_ALARM = "update_alarm"
 SERVICE_SET_MAIN_DISPLAY_TEXT = "set_main_display_text"
 SERVICE_SET_MINI_DISPLAY_NUMBER = "set_mini_display_number"
+SERVICE_START_MINI_DISPLAY_STREAM = "start_mini_display_stream"
+SERVICE_STOP_MINI_DISPLAY_STREAM = "stop_mini_display_stream"
 SERVICE_SET_RAINBOW_MODE = "set_rainbow_mode"
+SERVICE_START_LIGHT_BAR_ANIMATION = "start_light_bar_animation"
+SERVICE_STOP_LIGHT_BAR_ANIMATION = "stop_light_bar_animation"
 SERVICE_ACTIVATE_LIGHT_BAR_BLINK = "activate_light_bar_blink"
+SERVICE_ACTIVATE_LIGHT_BAR_GRADIENT = "activate_light_bar_gradient"
 SERVICE_ACTIVATE_LIGHT_BAR_COMET = "activate_light_bar_comet"
 SERVICE_ACTIVATE_LIGHT_BAR_PULSE = "activate_light_bar_pulse"
 SERVICE_ACTIVATE_LIGHT_BAR_SET = "activate_light_bar_set"
@@ -7,22 +7,22 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
-from homeassistant.components.homeassistant.triggers import event as event_trigger
 from homeassistant.const import (
-    ATTR_DEVICE_ID,
     CONF_DEVICE_ID,
     CONF_DOMAIN,
     CONF_PLATFORM,
     CONF_TYPE,
 )
-from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, Event, HassJob, HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
 from homeassistant.helpers.typing import ConfigType
 
 from .const import ATTR_BUTTON, CONF_SUBTYPE, DOMAIN, EVENT_BUTTON_PRESSED
+from .presses import PRESS_PATTERNS
 
-TRIGGER_TYPES = {EVENT_BUTTON_PRESSED}
+TRIGGER_TYPES = {EVENT_BUTTON_PRESSED, *PRESS_PATTERNS}
 
 TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
     {
@@ -56,10 +56,11 @@ async def async_get_triggers(
                 CONF_DOMAIN: DOMAIN,
                 CONF_DEVICE_ID: device_id,
                 ATTR_BUTTON: i,
-                CONF_TYPE: EVENT_BUTTON_PRESSED,
+                CONF_TYPE: trigger_type,
                 CONF_SUBTYPE: i,
             }
             for i in range(1, 3)
+            for trigger_type in (EVENT_BUTTON_PRESSED, *PRESS_PATTERNS)
         ]
     )
 
@@ -75,19 +76,33 @@ async def async_attach_trigger(
     """Attach a trigger."""
 
     if config[CONF_TYPE] in TRIGGER_TYPES:
-        event_config = event_trigger.TRIGGER_SCHEMA(
-            {
-                event_trigger.CONF_PLATFORM: "event",
-                event_trigger.CONF_EVENT_TYPE: EVENT_BUTTON_PRESSED,
-                event_trigger.CONF_EVENT_DATA: {
-                    ATTR_DEVICE_ID: config[CONF_DEVICE_ID],
-                    ATTR_BUTTON: config[ATTR_BUTTON],
+        trigger_data = automation_info["trigger_data"]
+        job = HassJob(action, f"{DOMAIN} device trigger {automation_info}")
+
+        @callback
+        def async_handle_press(event: Event) -> None:
+            """Run the action with the same trigger variables as an event trigger."""
+            hass.async_run_hass_job(
+                job,
+                {
+                    "trigger": {
+                        **trigger_data,
+                        CONF_PLATFORM: "device",
+                        "event": event,
+                        "description": f"event '{event.event_type}'",
+                    }
                 },
-            }
-        )
-
-        return await event_trigger.async_attach_trigger(
-            hass, event_config, action, automation_info, platform_type="device"
+                event.context,
+            )
+
+        # The webhook sends presses and press patterns straight to the triggers of
+        # the device and button that was pressed, so the cost of a press doesn't
+        # grow with the number of triggers attached for other buttons
+        return async_dispatcher_connect(
+            hass,
+            f"{DOMAIN}_{config[CONF_DEVICE_ID]}_{config[ATTR_BUTTON]}_"
+            f"{config[CONF_TYPE]}",
+            async_handle_press,
         )
 
     raise ValueError(f"Unsupported trigger type {config[CONF_TYPE]}")
@@ -0,0 +1,45 @@
+"""Diagnostics support for Sandman Doppler."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import DopplerDataUpdateCoordinator
+from .alarms import DopplerAlarmIndex
+from .const import DOMAIN
+from .reconciler import DopplerReconciler
+from .scheduler import DopplerRequestScheduler
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    scheduler: DopplerRequestScheduler = entry_data["scheduler"]
+    alarm_index: DopplerAlarmIndex = entry_data["alarm_index"]
+    reconciler: DopplerReconciler = entry_data["reconciler"]
+    return {
+        "scheduler": {
+            "max_concurrent_requests": scheduler.max_concurrent_requests,
+            "requests_in_flight": scheduler.requests_in_flight,
+            "peak_requests_in_flight": scheduler.peak_requests_in_flight,
+            "command_latency": scheduler.async_get_command_latency_percentiles(),
+        },
+        "alarm_index": {"hits": alarm_index.hits, "misses": alarm_index.misses},
+        "reconciler": reconciler.async_get_metrics(),
+        "devices": {
+            dsn: {
+                "poll_interval": coordinator.update_interval.total_seconds(),
+                "last_update_success": coordinator.last_update_success,
+                "stale": coordinator.stale,
+                "writes_sent": coordinator.writes_sent,
+                "writes_skipped": coordinator.writes_skipped,
+            }
+            for dsn, coordinator in entry_data.items()
+            if isinstance(coordinator, DopplerDataUpdateCoordinator)
+        },
+    }
@@ -16,6 +16,17 @@ from .const import DOMAIN
 
 _EntityDescriptionT = TypeVar("_EntityDescriptionT", bound="EntityDescription")
 
+# Entity description attributes that name the coordinator data keys an entity uses
+DATA_KEY_ATTRS = ("state_key", "color_key", "brightness_key", "available_tones_key")
+
+
+def get_data_keys(description: EntityDescription) -> frozenset[str] | None:
+    """Get the coordinator data keys an entity description depends on."""
+    keys = frozenset(
+        key for attr in DATA_KEY_ATTRS if (key := getattr(description, attr, None))
+    )
+    return keys or None
+
 
 class DopplerEntity(
     CoordinatorEntity[DopplerDataUpdateCoordinator], Generic[_EntityDescriptionT]
@@ -31,7 +42,9 @@ class DopplerEntity(
         device: Doppler,
         description: _EntityDescriptionT,
     ):
-        super().__init__(coordinator)
+        # The data keys are used as the coordinator context so the entity is only
+        # updated when one of its keys changes
+        super().__init__(coordinator, context=get_data_keys(description))
         self.entity_description: _EntityDescriptionT = description
         self.ed: _EntityDescriptionT = description
         self.config_entry = config_entry
@@ -42,6 +55,11 @@ class DopplerEntity(
         )
         self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, self.device.dsn)})
 
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while the state comes from the cache and isn't confirmed."""
+        return self.coordinator.stale
+
     @property
     def device_data(self) -> dict[str, Any]:
         """Return device data."""
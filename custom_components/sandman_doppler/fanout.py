@@ -0,0 +1,103 @@
+"""Bounded fan-out of requests across Sandman Doppler Clocks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable
+from dataclasses import dataclass, field
+import logging
+from typing import Any
+
+from doppyler.model.doppler import Doppler
+
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of devices to send requests to at the same time
+FAN_OUT_MAX_CONCURRENT = 10
+# Seconds a device gets to answer each request once its call has started
+FAN_OUT_TIMEOUT = 15
+
+
+@dataclass
+class FanOutResult:
+    """Class to represent the outcome of a request sent to multiple devices."""
+
+    succeeded: dict[Doppler, Any] = field(default_factory=dict)
+    failed: dict[Doppler, Exception] = field(default_factory=dict)
+    timed_out: list[Doppler] = field(default_factory=list)
+
+    def raise_for_errors(self) -> None:
+        """Raise an error describing every device that failed or timed out."""
+        lines = [
+            f"{device} - {type(error).__name__}: {error}"
+            for device, error in self.failed.items()
+        ]
+        lines.extend(f"{device} - timed out" for device in self.timed_out)
+        if not lines:
+            return
+        if len(lines) > 1:
+            lines.insert(0, f"{len(lines)} error(s):")
+        raise HomeAssistantError("\n".join(lines))
+
+
+async def async_iter_fan_out(
+    devices: Iterable[Doppler],
+    func: Callable[[Doppler], Coroutine[Any, Any, Any]],
+    max_concurrent: int = FAN_OUT_MAX_CONCURRENT,
+    timeout: float = FAN_OUT_TIMEOUT,
+    requests: Callable[[Doppler], int] | None = None,
+) -> AsyncIterator[tuple[Doppler, Any, BaseException | None]]:
+    """Call `func` for every device and yield (device, result, error) as they finish.
+
+    At most `max_concurrent` calls run at the same time and each one gets `timeout`
+    seconds from when it starts for every request it sends, as counted by
+    `requests` for calls that send more than one. A call that times out yields a
+    `TimeoutError`.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def _async_call(
+        device: Doppler,
+    ) -> tuple[Doppler, Any, BaseException | None]:
+        """Call `func` for a single device."""
+        async with semaphore:
+            try:
+                async with asyncio.timeout(
+                    timeout * (requests(device) if requests else 1)
+                ):
+                    return device, await func(device), None
+            except Exception as err:  # pylint: disable=broad-except
+                return device, None, err
+
+    tasks = [asyncio.create_task(_async_call(device)) for device in devices]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def async_fan_out(
+    devices: Iterable[Doppler],
+    func: Callable[[Doppler], Coroutine[Any, Any, Any]],
+    max_concurrent: int = FAN_OUT_MAX_CONCURRENT,
+    timeout: float = FAN_OUT_TIMEOUT,
+    requests: Callable[[Doppler], int] | None = None,
+) -> FanOutResult:
+    """Call `func` for every device and collect the outcome for each one."""
+    result = FanOutResult()
+    async for device, value, err in async_iter_fan_out(
+        devices, func, max_concurrent, timeout, requests
+    ):
+        if err is None:
+            result.succeeded[device] = value
+        elif isinstance(err, TimeoutError):
+            _LOGGER.debug("Request to %s timed out", device)
+            result.timed_out.append(device)
+        else:
+            _LOGGER.debug("Request to %s failed: %s", device, err)
+            result.failed[device] = err
+    return result
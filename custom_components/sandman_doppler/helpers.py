@@ -1,13 +1,73 @@
 """Helpers for Sandman Doppler Clocks."""
 
+from __future__ import annotations
+
+from contextvars import ContextVar
 from enum import Enum
+import functools
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientError
+from doppyler.exceptions import DopplerException
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from . import DopplerDataUpdateCoordinator
+
+# Set while handling a force_write service call so writes skip the cache check
+FORCE_WRITE: ContextVar[bool] = ContextVar("doppler_force_write", default=False)
+
+# Errors a request to a clock can fail with. The library only wraps timeouts in
+# its own exceptions, so connection errors come through from aiohttp.
+REQUEST_ERRORS = (DopplerException, ClientError, TimeoutError)
+
+
+@functools.cache
+def _get_enum_names(enum_cls: type[Enum]) -> dict[Enum, str]:
+    """Return the normalized names of an enum's values."""
+    return {enum_val: enum_val.name.replace("_", " ").title() for enum_val in enum_cls}
+
+
+@functools.cache
+def _get_enum_values(enum_cls: type[Enum]) -> dict[str, Enum]:
+    """Return an enum's values by normalized name."""
+    return {name: enum_val for enum_val, name in _get_enum_names(enum_cls).items()}
+
+
+@functools.cache
+def get_enum_options(enum_cls: type[Enum]) -> tuple[str, ...]:
+    """Return the normalized names of an enum's values as select options.
+
+    The cached options are shared, so they are a tuple that callers can't change.
+    """
+    return tuple(_get_enum_names(enum_cls).values())
 
 
 def normalize_enum_name(enum_val: Enum) -> str:
     """Normalize an enum's name to a string."""
-    return enum_val.name.replace("_", " ").title()
+    return _get_enum_names(type(enum_val))[enum_val]
 
 
-def get_enum_from_name(enum: Enum, name: str) -> Enum:
+def get_enum_from_name(enum: type[Enum], name: str) -> Enum:
     """Get an enum value from a name."""
+    if (enum_val := _get_enum_values(enum).get(name)) is not None:
+        return enum_val
     return enum[name.replace(" ", "_").upper()]
+
+
+@callback
+def async_get_coordinator(
+    hass: HomeAssistant, dsn: str
+) -> DopplerDataUpdateCoordinator | None:
+    """Get the coordinator for a Doppler from whichever entry it belongs to."""
+    return next(
+        (
+            entry_data[dsn]
+            for entry_data in hass.data.get(DOMAIN, {}).values()
+            if dsn in entry_data
+        ),
+        None,
+    )
@@ -2,77 +2,210 @@
 
 from __future__ import annotations
 
+import functools
+import hmac
 from http import HTTPStatus
 import logging
+from typing import Any, NamedTuple
 
 from aiohttp.web import Request, Response
 
 from homeassistant.components.http.view import HomeAssistantView
 from homeassistant.const import ATTR_DEVICE_ID, ATTR_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Context, Event, HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
 
-from .const import ATTR_DOPPLER_NAME, ATTR_DSN, DOMAIN, EVENT_BUTTON_PRESSED
+from .const import (
+    ATTR_ACTION,
+    ATTR_BUTTON,
+    ATTR_DOPPLER_NAME,
+    ATTR_DSN,
+    ATTR_PATTERN,
+    ATTR_STATE,
+    CONF_WEBHOOK_TOKEN,
+    DOMAIN,
+    EVENT_BUTTON_PATTERN,
+    EVENT_BUTTON_PRESSED,
+)
+from .helpers import async_get_coordinator
+from .presses import DopplerPressTracker
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class DopplerDeviceInfo(NamedTuple):
+    """Registry details of a Doppler needed to handle its webhook calls."""
+
+    dsn: str
+    doppler_name: str | None
+    name: str | None
+    webhook_token: str | None
+
+
 class DopplerWebhookView(HomeAssistantView):
     """Provide a page for the device to call."""
 
     requires_auth = False
     cors_allowed = True
-    url = r"/api/sandman_doppler/smart_button/{device_id}"
+    url = r"/api/sandman_doppler/smart_button/{device_id}/{token}"
     name = "api:sandman_doppler:smart_button"
 
     def __init__(self) -> None:
         """Initialize view."""
         super().__init__()
         self._dev_reg: dr.DeviceRegistry | None = None
+        # Registry details by device ID, or None for devices that aren't Dopplers.
+        # Entries are dropped whenever their device registry entry changes.
+        self._devices: dict[str, DopplerDeviceInfo | None] = {}
+        self._presses: DopplerPressTracker | None = None
+
+    @callback
+    def _async_handle_device_registry_updated(self, event: Event) -> None:
+        """Drop the cached details of a device that changed."""
+        self._devices.pop(event.data["device_id"], None)
+
+    @callback
+    def _async_get_device_info(
+        self, hass: HomeAssistant, device_id: str
+    ) -> DopplerDeviceInfo | None:
+        """Return the registry details of a Doppler by device ID."""
+        if device_id in self._devices:
+            return self._devices[device_id]
 
-    async def post(self, request: Request, device_id: str) -> Response:
-        """Respond to requests from the device."""
-        hass: HomeAssistant = request.app["hass"]
         if not self._dev_reg:
             self._dev_reg = dr.async_get(hass)
+            hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED,
+                self._async_handle_device_registry_updated,
+            )
 
-        device = self._dev_reg.async_get(device_id)
-        if not device:
+        # Unknown device IDs aren't cached since anyone can call the view
+        if not (device := self._dev_reg.async_get(device_id)):
             _LOGGER.error("Device not found: %s", device_id)
+            return None
+
+        webhook_token = next(
+            (
+                entry.data.get(CONF_WEBHOOK_TOKEN)
+                for entry_id in device.config_entries
+                if (entry := hass.config_entries.async_get_entry(entry_id))
+                and entry.domain == DOMAIN
+            ),
+            None,
+        )
+        info = self._devices[device_id] = next(
+            (
+                DopplerDeviceInfo(
+                    identifier[1],
+                    device.name,
+                    device.name_by_user or device.name,
+                    webhook_token,
+                )
+                for identifier in device.identifiers
+                if identifier[0] == DOMAIN
+            ),
+            None,
+        )
+        return info
+
+    @callback
+    def _async_fire_pattern(
+        self, hass: HomeAssistant, pattern: str, data: dict[str, Any]
+    ) -> None:
+        """Send a press pattern to its device triggers and fire its event."""
+        context = Context()
+        data = {**data, ATTR_PATTERN: pattern}
+        async_dispatcher_send(
+            hass,
+            f"{DOMAIN}_{data[ATTR_DEVICE_ID]}_{data[ATTR_BUTTON]}_{pattern}",
+            Event(EVENT_BUTTON_PATTERN, data, context=context),
+        )
+        hass.bus.async_fire(EVENT_BUTTON_PATTERN, data, context=context)
+
+    async def post(self, request: Request, device_id: str, token: str) -> Response:
+        """Respond to requests from the device."""
+        hass: HomeAssistant = request.app["hass"]
+        if not (info := self._async_get_device_info(hass, device_id)):
+            if device_id in self._devices:
+                _LOGGER.error("Device not a Sandman Doppler device: %s", device_id)
             return Response(status=HTTPStatus.OK)
-        if not (
-            identifier := next(
-                (
-                    identifier
-                    for identifier in device.identifiers
-                    if identifier[0] == DOMAIN
-                ),
-                None,
-            )
-        ):
-            _LOGGER.error("Device not a Sandman Doppler device: %s", device_id)
-            return Response(status=HTTPStatus.OK)
+        if not info.webhook_token or not hmac.compare_digest(token, info.webhook_token):
+            _LOGGER.error("Invalid webhook token for device: %s", device_id)
+            return Response(status=HTTPStatus.UNAUTHORIZED)
 
-        data = await request.json()
-        if not (dsn := data.get(ATTR_DSN)):
+        try:
+            data = json_loads(await request.read())
+        except JSON_DECODE_EXCEPTIONS:
+            _LOGGER.error("Invalid request from %s", device_id)
+            return Response(status=HTTPStatus.OK)
+        if not isinstance(data, dict) or not (dsn := data.get(ATTR_DSN)):
             _LOGGER.error("Invalid request: %s", data)
             return Response(status=HTTPStatus.OK)
-        if identifier[1] != dsn:
+        if dsn != info.dsn:
             _LOGGER.error(
                 "DSN sent (%s) does not match device entry: %s (%s)",
                 dsn,
                 device_id,
-                identifier[1],
+                info.dsn,
             )
             return Response(status=HTTPStatus.OK)
+        # Buttons are numbers, whether the device sends them as one or as a string,
+        # since they pick the device triggers a press is sent to
+        if (button := data.get(ATTR_BUTTON)) is not None:
+            try:
+                data[ATTR_BUTTON] = int(button)
+            except (TypeError, ValueError):
+                _LOGGER.error("Invalid button pressed on %s: %s", dsn, button)
+                return Response(status=HTTPStatus.OK)
 
-        hass.bus.async_fire(
-            EVENT_BUTTON_PRESSED,
-            {
-                **data,
-                ATTR_DOPPLER_NAME: device.name,
-                ATTR_NAME: device.name_by_user or device.name,
-                ATTR_DEVICE_ID: device_id,
-            },
-        )
+        coordinator = async_get_coordinator(hass, dsn)
+
+        # State changes pushed by the device are applied right away instead of
+        # waiting for the next poll
+        # The raw state isn't passed on to the button press event
+        if (state := data.pop(ATTR_STATE, None)) is not None:
+            if not isinstance(state, dict):
+                _LOGGER.error("Invalid state pushed by %s: %s", dsn, state)
+                return Response(status=HTTPStatus.OK)
+            if coordinator:
+                try:
+                    coordinator.async_push_data(state)
+                except (KeyError, TypeError, ValueError) as err:
+                    _LOGGER.error("Invalid state pushed by %s: %s", dsn, err)
+            # A push without a button press is only a state update
+            if ATTR_BUTTON not in data:
+                return Response(status=HTTPStatus.OK)
+
+        # A button press usually means someone is at the clock, so poll it closely
+        if coordinator:
+            coordinator.async_reset_update_interval()
+
+        # The parsed body is only used here, so it becomes the event data
+        data[ATTR_DOPPLER_NAME] = info.doppler_name
+        data[ATTR_NAME] = info.name
+        data[ATTR_DEVICE_ID] = device_id
+        if (button := data.get(ATTR_BUTTON)) is not None:
+            if not self._presses:
+                self._presses = DopplerPressTracker(
+                    hass, functools.partial(self._async_fire_pattern, hass)
+                )
+            if not self._presses.async_process(
+                device_id, button, data.get(ATTR_ACTION), data
+            ):
+                _LOGGER.debug("Ignoring duplicate delivery from %s: %s", dsn, data)
+                return Response(status=HTTPStatus.OK)
+
+        context = Context()
+        # Device triggers listen for their own device and button, so a press only
+        # reaches the triggers it matches. The bus event is kept for automations
+        # and integrations listening to it directly.
+        if button is not None:
+            async_dispatcher_send(
+                hass,
+                f"{DOMAIN}_{device_id}_{button}_{EVENT_BUTTON_PRESSED}",
+                Event(EVENT_BUTTON_PRESSED, data, context=context),
+            )
+        hass.bus.async_fire(EVENT_BUTTON_PRESSED, data, context=context)
         return Response(status=HTTPStatus.OK)
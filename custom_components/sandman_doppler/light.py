@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
 from collections.abc import Callable, Coroutine
 from dataclasses import dataclass
 import functools
@@ -18,6 +19,9 @@ from doppyler.const import (
     ATTR_NIGHT_DISPLAY_BRIGHTNESS,
     ATTR_NIGHT_DISPLAY_COLOR,
     ATTR_SMART_BUTTON_COLOR,
+    ATTR_SYNC_BUTTON_AND_DISPLAY_BRIGHTNESS,
+    ATTR_SYNC_BUTTON_AND_DISPLAY_COLOR,
+    ATTR_SYNC_DAY_AND_NIGHT_COLOR,
 )
 from doppyler.model.color import Color
 from doppyler.model.doppler import Doppler
@@ -30,19 +34,14 @@ from homeassistant.components.light import (
     LightEntity,
     LightEntityDescription,
 )
-from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import STATE_ON
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.dispatcher import (
-    async_dispatcher_connect,
-    async_dispatcher_send,
-)
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import slugify
 
 from . import DopplerDataUpdateCoordinator
+from .coalescer import DopplerWriteCoalescer
 from .const import DOMAIN
 from .entity import DopplerEntity
 
@@ -160,6 +159,40 @@ def get_opposite_button_or_display(
     return "button" if button_or_display == "display" else "display"
 
 
+# Coordinator data keys of the sync switches by kind of sync and light property.
+# There is no switch to sync day and night brightness.
+SYNC_KEYS = {
+    ("day_night", "color"): ATTR_SYNC_DAY_AND_NIGHT_COLOR,
+    ("button_display", "color"): ATTR_SYNC_BUTTON_AND_DISPLAY_COLOR,
+    ("button_display", "brightness"): ATTR_SYNC_BUTTON_AND_DISPLAY_BRIGHTNESS,
+}
+
+
+def get_sync_graph(
+    entity_descriptions: list[DopplerLightEntityDescription],
+) -> dict[tuple[str, str], tuple[tuple[str, str], ...]]:
+    """Map each light and property to the lights synced from it.
+
+    Keys are (light key, light property) and values are (target light key, sync
+    switch data key) pairs, so a sync only happens while its switch is on.
+    """
+    light_keys = {slugify(ed.key): ed.key for ed in entity_descriptions}
+    graph: defaultdict[tuple[str, str], list[tuple[str, str]]] = defaultdict(list)
+    for ed in entity_descriptions:
+        for light_property in ("color", "brightness"):
+            for light_type, switch_type in zip(
+                get_sync_light_types(ed), ("day_night", "button_display")
+            ):
+                if sync_key := SYNC_KEYS.get((switch_type, light_property)):
+                    graph[(light_keys[light_type], light_property)].append(
+                        (ed.key, sync_key)
+                    )
+    return {source: tuple(targets) for source, targets in graph.items()}
+
+
+LIGHT_SYNC_GRAPH = get_sync_graph(LIGHT_ENTITY_DESCRIPTIONS)
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_devices: AddEntitiesCallback
 ) -> None:
@@ -171,8 +204,10 @@ async def async_setup_entry(
         coordinator: DopplerDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
             device.dsn
         ]
+        # The device's lights by key, shared so they can sync each other
+        lights: dict[str, DopplerLight] = {}
         entities = [
-            DopplerLight(coordinator, entry, device, description)
+            DopplerLight(coordinator, entry, device, description, lights)
             for description in LIGHT_ENTITY_DESCRIPTIONS
         ]
         entities.extend(
@@ -214,6 +249,7 @@ class BaseDopplerLight(DopplerEntity[DopplerLightEntityDescription], LightEntity
         brightness = self.device_data[self.ed.brightness_key] = (
             await self.ed.set_brightness_func(self.device, brightness)
         )
+        self.coordinator.async_record_write(self.ed.brightness_key)
         return brightness
 
     async def _async_set_rgb_color(self, rgb_color: list[int]) -> Color:
@@ -221,8 +257,25 @@ class BaseDopplerLight(DopplerEntity[DopplerLightEntityDescription], LightEntity
         color = Color(rgb_color[0], rgb_color[1], rgb_color[2])
         await self.ed.set_color_func(self.device, color)
         self.device_data[self.ed.color_key] = color
+        self.coordinator.async_record_write(self.ed.color_key)
         return color
 
+    @callback
+    def _async_should_write(
+        self,
+        light_property: Literal["brightness", "color"],
+        val: int | list[int],
+        force: bool,
+    ) -> bool:
+        """Return whether a light property needs to be written to the device."""
+        if light_property == "brightness":
+            key = self.ed.brightness_key
+            is_set = self.device_data.get(key) == val * 100 // 255
+        else:
+            key = self.ed.color_key
+            is_set = self.rgb_color == tuple(val)
+        return self.coordinator.async_should_write(key, is_set, force)
+
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the device off."""
         _LOGGER.warning(
@@ -239,16 +292,18 @@ class DopplerLight(BaseDopplerLight):
         config_entry: ConfigEntry,
         device: Doppler,
         description: DopplerLightEntityDescription,
+        lights: dict[str, DopplerLight],
     ):
         """Initialize the Doppler Light."""
         super().__init__(coordinator, config_entry, device, description)
-        self._ent_reg: er.EntityRegistry | None = None
-        self._sync_signal_prefix = (
-            f"{DOMAIN}_{self.config_entry.entry_id}_{self.device.dsn}_sync_from"
-        )
-        self._sync_unique_id_prefix = (
-            f"{self.config_entry.unique_id}_{self.device.dsn}_sync"
-        )
+        self._lights = lights
+        # Sliders send a burst of values, so only the latest one gets written
+        self._writers: dict[str, DopplerWriteCoalescer] = {
+            light_property: DopplerWriteCoalescer(
+                coordinator.hass, functools.partial(self._async_write, light_property)
+            )
+            for light_property in ("brightness", "color")
+        }
 
     @property
     def brightness(self) -> int:
@@ -263,103 +318,80 @@ class DopplerLight(BaseDopplerLight):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the device on."""
         if (brightness := kwargs.get(ATTR_BRIGHTNESS)) is not None:
-            brightness = await self._async_set_brightness(brightness)
-            signal_name = (
-                f"{self._sync_signal_prefix}_{slugify(self.ed.key)}_brightness"
-            )
-            _LOGGER.debug("%s sending signal %s", self.entity_id, signal_name)
-            async_dispatcher_send(self.hass, signal_name, self.entity_id, brightness)
+            await self._writers["brightness"].async_write(brightness)
         if (rgb_color := kwargs.get(ATTR_RGB_COLOR)) is not None:
-            color = await self._async_set_rgb_color(rgb_color)
-            signal_name = f"{self._sync_signal_prefix}_{slugify(self.ed.key)}_color"
-            _LOGGER.debug("%s sending signal %s", self.entity_id, signal_name)
-            async_dispatcher_send(self.hass, signal_name, self.entity_id, color)
-        if brightness is not None or rgb_color is not None:
-            self.async_write_ha_state()
+            await self._writers["color"].async_write(rgb_color)
 
-    @callback
-    def async_sync_from_other_entity(
+    async def _async_write(
         self,
-        switch_type: str,
-        light_property: str,
-        src_entity_id: str,
-        val: int | Color,
+        light_property: Literal["brightness", "color"],
+        val: int | list[int],
+        force: bool,
     ) -> None:
-        """Sync this entity from another entity."""
-        unique_id = slugify(
-            f"{self._sync_unique_id_prefix}_{switch_type}_{light_property}"
-        )
-        if not (
-            sync_entity_id := self._ent_reg.async_get_entity_id(
-                SWITCH_DOMAIN, DOMAIN, unique_id
-            )
-        ):
-            _LOGGER.debug(
-                (
-                    "No sync required for %s %s from %s %s because sync entity with "
-                    "unique ID %s does not exist"
-                ),
-                self.entity_id,
-                light_property,
-                src_entity_id,
-                light_property,
-                unique_id,
-            )
+        """Write a light property to the device and sync other lights from it."""
+        if not self._async_should_write(light_property, val, force):
             return
+        if light_property == "brightness":
+            val = await self._async_set_brightness(val)
+        else:
+            val = await self._async_set_rgb_color(val)
+        self.async_write_ha_state()
+        self._async_sync_other_lights(light_property, val)
 
-        if not (
-            (state := self.hass.states.get(sync_entity_id)) and state.state == STATE_ON
+    @callback
+    def _async_sync_other_lights(
+        self, light_property: Literal["brightness", "color"], val: int | Color
+    ) -> None:
+        """Sync the lights whose sync switch is on from this light."""
+        for target_key, sync_key in LIGHT_SYNC_GRAPH.get(
+            (self.ed.key, light_property), ()
         ):
+            if not self.device_data.get(sync_key) or not (
+                target := self._lights.get(target_key)
+            ):
+                continue
             _LOGGER.debug(
-                (
-                    "No sync required for %s %s from %s %s because sync entity %s is "
-                    "not on"
-                ),
-                self.entity_id,
+                "Syncing %s %s from %s (%s) because %s is on",
+                target.entity_id,
                 light_property,
-                src_entity_id,
-                light_property,
-                sync_entity_id,
+                self.entity_id,
+                val,
+                sync_key,
             )
-            return
-
-        _LOGGER.debug(
-            "Syncing %s %s from %s %s (%s) because sync entity %s is on",
-            self.entity_id,
-            light_property,
-            src_entity_id,
-            light_property,
-            val,
-            sync_entity_id,
-        )
-        self.device_data[getattr(self.ed, f"{light_property}_key")] = val
-        self.async_write_ha_state()
+            self.device_data[getattr(target.ed, f"{light_property}_key")] = val
+            target.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         await super().async_added_to_hass()
-
-        self._ent_reg = er.async_get(self.hass)
-        for light_property in ("color", "brightness"):
-            for light_type, switch_type in zip(
-                get_sync_light_types(self.ed), ("day_night", "button_display")
-            ):
-                signal_name = (
-                    f"{self._sync_signal_prefix}_{light_type}_{light_property}"
-                )
-                listener_callback: Callable[[Color | int], None] = functools.partial(
-                    self.async_sync_from_other_entity, switch_type, light_property
-                )
-                self.async_on_remove(
-                    async_dispatcher_connect(self.hass, signal_name, listener_callback)
-                )
+        self._lights[self.ed.key] = self
+        self.async_on_remove(functools.partial(self._lights.pop, self.ed.key, None))
 
 
 class DopplerSmartButtonLight(BaseDopplerLight):
     """Doppler Smart Button Light class."""
 
+    def __init__(
+        self,
+        coordinator: DopplerDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        device: Doppler,
+        description: DopplerLightEntityDescription,
+    ):
+        """Initialize the Doppler Smart Button Light."""
+        super().__init__(coordinator, config_entry, device, description)
+        self._color_writer = DopplerWriteCoalescer(
+            coordinator.hass, self._async_write_rgb_color
+        )
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the device on."""
         if (rgb_color := kwargs.get(ATTR_RGB_COLOR)) is not None:
-            await self._async_set_rgb_color(rgb_color)
-            self.async_write_ha_state()
+            await self._color_writer.async_write(rgb_color)
+
+    async def _async_write_rgb_color(self, rgb_color: list[int], force: bool) -> None:
+        """Write the color to the device."""
+        if not self._async_should_write("color", rgb_color, force):
+            return
+        await self._async_set_rgb_color(rgb_color)
+        self.async_write_ha_state()
@@ -143,7 +143,12 @@ class DopplerNumber(DopplerEntity[DopplerNumberEntityDescription], NumberEntity)
 
     async def async_set_native_value(self, value: int) -> None:
         """Set the value of the number."""
+        if not self.coordinator.async_should_write(
+            self.ed.state_key, self.native_value == value
+        ):
+            return
         self.device_data[self.ed.state_key] = await self.ed.set_value_func(
             self.device, value
         )
+        self.coordinator.async_record_write(self.ed.state_key)
         self.async_write_ha_state()
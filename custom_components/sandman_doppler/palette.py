@@ -0,0 +1,118 @@
+"""Gradients and palettes for Sandman Doppler light bars."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+import colorsys
+from enum import StrEnum
+from functools import lru_cache
+
+from doppyler.model.color import Color
+
+# Number of distinct gradients to keep computed
+GRADIENT_CACHE_SIZE = 64
+
+PALETTES: dict[str, tuple[tuple[int, int, int], ...]] = {
+    "rainbow": (
+        (255, 0, 0),
+        (255, 127, 0),
+        (255, 255, 0),
+        (0, 255, 0),
+        (0, 0, 255),
+        (139, 0, 255),
+    ),
+    "sunset": ((255, 94, 0), (255, 0, 85), (94, 0, 140)),
+    "ocean": ((0, 30, 90), (0, 119, 182), (144, 224, 239)),
+    "fire": ((128, 0, 0), (255, 69, 0), (255, 200, 0)),
+    "forest": ((0, 60, 20), (34, 139, 34), (154, 205, 50)),
+}
+
+
+class InterpolationSpace(StrEnum):
+    """Color space to blend gradient stops in."""
+
+    RGB = "rgb"
+    LINEAR_RGB = "linear_rgb"
+    HSV = "hsv"
+
+
+def _to_space(
+    stop: tuple[int, int, int], space: InterpolationSpace
+) -> tuple[float, float, float]:
+    """Convert an RGB stop into the interpolation space."""
+    if space is InterpolationSpace.HSV:
+        return colorsys.rgb_to_hsv(*(channel / 255 for channel in stop))
+    if space is InterpolationSpace.LINEAR_RGB:
+        return tuple((channel / 255) ** 2.2 for channel in stop)
+    return stop
+
+
+def _from_space(values: tuple[float, float, float], space: InterpolationSpace) -> Color:
+    """Convert a value in the interpolation space back into a color."""
+    if space is InterpolationSpace.HSV:
+        values = tuple(channel * 255 for channel in colorsys.hsv_to_rgb(*values))
+    elif space is InterpolationSpace.LINEAR_RGB:
+        values = tuple(channel ** (1 / 2.2) * 255 for channel in values)
+    return Color(*(round(channel) for channel in values))
+
+
+@lru_cache(maxsize=GRADIENT_CACHE_SIZE)
+def _gradient(
+    stops: tuple[tuple[int, int, int], ...],
+    space: InterpolationSpace,
+    led_count: int,
+) -> tuple[Color, ...]:
+    """Compute a gradient across evenly spaced stops."""
+    if len(stops) == 1 or led_count == 1:
+        return (Color(*stops[0]),) * led_count
+
+    points = [_to_space(stop, space) for stop in stops]
+    if space is InterpolationSpace.HSV:
+        # Take the short way around the hue circle between neighbouring stops
+        for idx in range(1, len(points)):
+            hue = points[idx][0]
+            prev_hue = points[idx - 1][0]
+            hue += round(prev_hue - hue)
+            points[idx] = (hue, *points[idx][1:])
+
+    scale = (len(points) - 1) / (led_count - 1)
+    last_segment = len(points) - 2
+    colors = []
+    for led in range(led_count):
+        position = led * scale
+        segment = min(int(position), last_segment)
+        fraction = position - segment
+        start, end = points[segment], points[segment + 1]
+        values = tuple(a + (b - a) * fraction for a, b in zip(start, end))
+        if space is InterpolationSpace.HSV:
+            values = (values[0] % 1, *values[1:])
+        colors.append(_from_space(values, space))
+    return tuple(colors)
+
+
+def gradient(
+    stops: Sequence[Color],
+    led_count: int,
+    space: InterpolationSpace = InterpolationSpace.RGB,
+) -> list[Color]:
+    """Return the color of every LED in a gradient across evenly spaced stops.
+
+    Results are cached by stops, space and LED count, so the colors returned are
+    shared and must not be modified in place.
+    """
+    return list(
+        _gradient(
+            tuple((stop.red, stop.green, stop.blue) for stop in stops),
+            InterpolationSpace(space),
+            led_count,
+        )
+    )
+
+
+def palette_gradient(
+    name: str,
+    led_count: int,
+    space: InterpolationSpace = InterpolationSpace.RGB,
+) -> list[Color]:
+    """Return the color of every LED in a gradient across a named palette."""
+    return list(_gradient(PALETTES[name], InterpolationSpace(space), led_count))
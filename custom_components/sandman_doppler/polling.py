@@ -0,0 +1,165 @@
+"""Polling tiers for Sandman Doppler Clocks."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from doppyler.const import (
+    ATTR_ALARM_SOUNDS,
+    ATTR_ALARMS,
+    ATTR_ALEXA_TAP_TO_TALK_TONE_ENABLED,
+    ATTR_ALEXA_USE_ASCENDING_ALARMS,
+    ATTR_ALEXA_WAKE_WORD_TONE_ENABLED,
+    ATTR_COLON_BLINK,
+    ATTR_CONNECTED_TO_ALEXA,
+    ATTR_DAY_BUTTON_BRIGHTNESS,
+    ATTR_DAY_BUTTON_COLOR,
+    ATTR_DAY_DISPLAY_BRIGHTNESS,
+    ATTR_DAY_DISPLAY_COLOR,
+    ATTR_DAY_TO_NIGHT_TRANSITION_VALUE,
+    ATTR_DISPLAY_SECONDS,
+    ATTR_IS_IN_DAY_MODE,
+    ATTR_LIGHT_SENSOR_VALUE,
+    ATTR_NIGHT_BUTTON_BRIGHTNESS,
+    ATTR_NIGHT_BUTTON_COLOR,
+    ATTR_NIGHT_DISPLAY_BRIGHTNESS,
+    ATTR_NIGHT_DISPLAY_COLOR,
+    ATTR_NIGHT_TO_DAY_TRANSITION_VALUE,
+    ATTR_SMART_BUTTON_COLOR,
+    ATTR_SOUND_PRESET,
+    ATTR_SOUND_PRESET_MODE,
+    ATTR_SYNC_BUTTON_AND_DISPLAY_BRIGHTNESS,
+    ATTR_SYNC_BUTTON_AND_DISPLAY_COLOR,
+    ATTR_SYNC_DAY_AND_NIGHT_COLOR,
+    ATTR_TIME_MODE,
+    ATTR_TIME_OFFSET,
+    ATTR_TIMEZONE,
+    ATTR_USE_COLON,
+    ATTR_USE_FADE_TIME,
+    ATTR_USE_LEADING_ZERO,
+    ATTR_VOLUME_LEVEL,
+    ATTR_WEATHER,
+    ATTR_WEATHER_WAKE_UP_TIME,
+    ATTR_WIFI,
+)
+from doppyler.model.doppler import Doppler
+
+
+@dataclass(frozen=True)
+class DopplerPollTier:
+    """Class to describe a group of data keys polled on the same interval."""
+
+    name: str
+    update_interval: timedelta
+    getters: tuple[tuple[str, Callable[[Doppler], Coroutine[Any, Any, Any]]], ...]
+
+    @property
+    def keys(self) -> frozenset[str]:
+        """Return the data keys fetched by this tier."""
+        return frozenset(key for key, _ in self.getters)
+
+
+def get_smart_button_color_func(
+    i: int,
+) -> Callable[[Doppler], Coroutine[Any, Any, Any]]:
+    """Return a coroutine to get the smart button color."""
+    return lambda dev: dev.get_smart_button_color(i)
+
+
+# Values that can change at any moment without anyone touching the clock
+FAST_POLL_TIER = DopplerPollTier(
+    "fast",
+    timedelta(seconds=60),
+    (
+        (ATTR_LIGHT_SENSOR_VALUE, lambda dev: dev.get_light_sensor_value()),
+        (ATTR_IS_IN_DAY_MODE, lambda dev: dev.get_is_in_day_mode()),
+    ),
+)
+
+# Display and light state that users commonly change from the clock or the app
+MEDIUM_POLL_TIER = DopplerPollTier(
+    "medium",
+    timedelta(minutes=10),
+    (
+        (ATTR_VOLUME_LEVEL, lambda dev: dev.get_volume_level()),
+        (ATTR_USE_COLON, lambda dev: dev.get_use_colon_mode()),
+        (ATTR_COLON_BLINK, lambda dev: dev.get_colon_blink_mode()),
+        (ATTR_USE_LEADING_ZERO, lambda dev: dev.get_use_leading_zero_mode()),
+        (ATTR_USE_FADE_TIME, lambda dev: dev.get_use_fade_time()),
+        (ATTR_DISPLAY_SECONDS, lambda dev: dev.get_display_seconds_mode()),
+        (ATTR_DAY_DISPLAY_BRIGHTNESS, lambda dev: dev.get_day_display_brightness()),
+        (ATTR_DAY_BUTTON_BRIGHTNESS, lambda dev: dev.get_day_button_brightness()),
+        (
+            ATTR_NIGHT_DISPLAY_BRIGHTNESS,
+            lambda dev: dev.get_night_display_brightness(),
+        ),
+        (ATTR_NIGHT_BUTTON_BRIGHTNESS, lambda dev: dev.get_night_button_brightness()),
+        (
+            ATTR_SYNC_BUTTON_AND_DISPLAY_BRIGHTNESS,
+            lambda dev: dev.get_sync_button_display_brightness(),
+        ),
+        (
+            ATTR_SYNC_BUTTON_AND_DISPLAY_COLOR,
+            lambda dev: dev.get_sync_button_display_color(),
+        ),
+        (ATTR_SYNC_DAY_AND_NIGHT_COLOR, lambda dev: dev.get_sync_day_night_color()),
+        (ATTR_DAY_DISPLAY_COLOR, lambda dev: dev.get_day_display_color()),
+        (ATTR_DAY_BUTTON_COLOR, lambda dev: dev.get_day_button_color()),
+        (ATTR_NIGHT_DISPLAY_COLOR, lambda dev: dev.get_night_display_color()),
+        (ATTR_NIGHT_BUTTON_COLOR, lambda dev: dev.get_night_button_color()),
+        *(
+            (f"{ATTR_SMART_BUTTON_COLOR}_{i}", get_smart_button_color_func(i))
+            for i in range(1, 3)
+        ),
+    ),
+)
+
+# Configuration, alarms and connection info which rarely change
+SLOW_POLL_TIER = DopplerPollTier(
+    "slow",
+    timedelta(hours=1),
+    (
+        (ATTR_WIFI, lambda dev: dev.get_wifi_status()),
+        (ATTR_TIME_MODE, lambda dev: dev.get_time_mode()),
+        (ATTR_TIMEZONE, lambda dev: dev.get_timezone()),
+        (ATTR_TIME_OFFSET, lambda dev: dev.get_offset()),
+        (ATTR_SOUND_PRESET, lambda dev: dev.get_sound_preset()),
+        (ATTR_SOUND_PRESET_MODE, lambda dev: dev.get_sound_preset_mode()),
+        (ATTR_ALARMS, lambda dev: dev.get_all_alarms()),
+        (ATTR_ALARM_SOUNDS, lambda dev: dev.get_alarm_sounds()),
+        (
+            ATTR_ALEXA_USE_ASCENDING_ALARMS,
+            lambda dev: dev.get_alexa_ascending_alarms_mode(),
+        ),
+        (
+            ATTR_DAY_TO_NIGHT_TRANSITION_VALUE,
+            lambda dev: dev.get_day_to_night_transition_value(),
+        ),
+        (
+            ATTR_NIGHT_TO_DAY_TRANSITION_VALUE,
+            lambda dev: dev.get_night_to_day_transition_value(),
+        ),
+        (ATTR_WEATHER, lambda dev: dev.get_weather_configuration()),
+        (ATTR_WEATHER_WAKE_UP_TIME, lambda dev: dev.get_weather_wake_up_time()),
+        (ATTR_CONNECTED_TO_ALEXA, lambda dev: dev.get_is_connected_to_alexa()),
+        (
+            ATTR_ALEXA_TAP_TO_TALK_TONE_ENABLED,
+            lambda dev: dev.get_is_alexa_tap_to_talk_tone_enabled(),
+        ),
+        (
+            ATTR_ALEXA_WAKE_WORD_TONE_ENABLED,
+            lambda dev: dev.get_is_alexa_wake_word_tone_enabled(),
+        ),
+    ),
+)
+
+POLL_TIERS = (FAST_POLL_TIER, MEDIUM_POLL_TIER, SLOW_POLL_TIER)
+
+POLL_KEYS = frozenset().union(*(tier.keys for tier in POLL_TIERS))
+
+# Values that differ on almost every poll, so they don't count as changes when
+# deciding whether to back off the poll interval
+VOLATILE_KEYS = frozenset({ATTR_LIGHT_SENSOR_VALUE})
@@ -0,0 +1,143 @@
+"""Press pattern detection for Sandman Doppler smart buttons."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import math
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+# Seconds within which a delivery identical to the last one is a duplicate
+PRESS_DEDUP_WINDOW = 0.08
+# Seconds after a press to wait for the next press of a double or triple press
+MULTI_PRESS_WINDOW = 0.4
+# Seconds a button has to be held for a long press, on clocks that report releases
+LONG_PRESS_DURATION = 0.8
+
+PATTERN_SINGLE = "single"
+PATTERN_DOUBLE = "double"
+PATTERN_TRIPLE = "triple"
+PATTERN_LONG = "long"
+# Patterns by number of presses
+MULTI_PRESS_PATTERNS = (PATTERN_SINGLE, PATTERN_DOUBLE, PATTERN_TRIPLE)
+PRESS_PATTERNS = (*MULTI_PRESS_PATTERNS, PATTERN_LONG)
+
+ACTION_RELEASE = "release"
+# Actions of clocks that report a held button themselves
+HOLD_ACTIONS = {"hold", "long_press"}
+
+# Called with the pattern and the data of the last delivery of the pattern
+PatternCallback = Callable[[str, dict[str, Any]], None]
+
+
+@dataclass(slots=True)
+class _ButtonState:
+    """State of a single smart button."""
+
+    count: int = 0
+    last_action: str | None = None
+    last_delivery_at: float = -math.inf
+    # When the button went down, while it's held on clocks that report releases
+    pressed_at: float | None = None
+    reports_release: bool = False
+    data: dict[str, Any] = field(default_factory=dict)
+    timer: asyncio.TimerHandle | None = None
+
+
+class DopplerPressTracker:
+    """Turn the raw deliveries of smart buttons into press patterns.
+
+    Every (device ID, button) pair has a small state machine driven by loop timers,
+    so patterns are emitted without keeping automation runs waiting. Presses are
+    counted until no press follows within `MULTI_PRESS_WINDOW`, then emitted as a
+    single, double or triple press. A long press is emitted when the clock reports
+    the button as held, or once it's held for `LONG_PRESS_DURATION` on clocks that
+    report releases.
+    """
+
+    def __init__(self, hass: HomeAssistant, on_pattern: PatternCallback) -> None:
+        """Initialize press tracker."""
+        self.hass = hass
+        self._on_pattern = on_pattern
+        self._buttons: dict[tuple[str, Any], _ButtonState] = {}
+        self.duplicates = 0
+
+    @callback
+    def async_process(
+        self, device_id: str, button: Any, action: str | None, data: dict[str, Any]
+    ) -> bool:
+        """Process a delivery of a button and return False if it's a duplicate."""
+        now = self.hass.loop.time()
+        if (state := self._buttons.get((device_id, button))) is None:
+            state = self._buttons[(device_id, button)] = _ButtonState()
+        if action == state.last_action and (
+            now - state.last_delivery_at < PRESS_DEDUP_WINDOW
+        ):
+            self.duplicates += 1
+            return False
+        state.last_action = action
+        state.last_delivery_at = now
+        state.data = data
+
+        if action in HOLD_ACTIONS:
+            self._async_emit_long(state)
+        elif action == ACTION_RELEASE:
+            state.reports_release = True
+            # A release after a long press, or of a press we didn't see, is ignored
+            if state.pressed_at is not None:
+                state.pressed_at = None
+                self._async_count_press(state)
+        elif state.reports_release:
+            state.pressed_at = now
+            self._async_set_timer(
+                state, now + LONG_PRESS_DURATION, self._async_emit_long, state
+            )
+        else:
+            self._async_count_press(state)
+        return True
+
+    @callback
+    def _async_set_timer(
+        self, state: _ButtonState, when: float, func: Callable[..., None], *args: Any
+    ) -> None:
+        """Replace the pending timer of a button."""
+        if state.timer:
+            state.timer.cancel()
+        state.timer = self.hass.loop.call_at(when, func, *args)
+
+    @callback
+    def _async_count_press(self, state: _ButtonState) -> None:
+        """Count a press and emit the pattern once no more presses can follow."""
+        state.count += 1
+        if state.count == len(MULTI_PRESS_PATTERNS):
+            self._async_emit_count(state)
+            return
+        self._async_set_timer(
+            state,
+            self.hass.loop.time() + MULTI_PRESS_WINDOW,
+            self._async_emit_count,
+            state,
+        )
+
+    @callback
+    def _async_emit_count(self, state: _ButtonState) -> None:
+        """Emit the pattern of the presses counted so far."""
+        if state.timer:
+            state.timer.cancel()
+            state.timer = None
+        pattern = MULTI_PRESS_PATTERNS[state.count - 1]
+        state.count = 0
+        self._on_pattern(pattern, state.data)
+
+    @callback
+    def _async_emit_long(self, state: _ButtonState) -> None:
+        """Emit a long press, dropping any presses counted before it."""
+        if state.timer:
+            state.timer.cancel()
+            state.timer = None
+        state.count = 0
+        state.pressed_at = None
+        self._on_pattern(PATTERN_LONG, state.data)
@@ -0,0 +1,234 @@
+"""Desired-state reconciler for fleets of Sandman Doppler Clocks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import timedelta
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .helpers import REQUEST_ERRORS, async_get_coordinator
+from .scheduler import REQUEST_PRIORITY, RequestPriority
+from .settings import async_get_drift, async_write_settings
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# How often every device is compared against its profile
+RECONCILE_INTERVAL = timedelta(minutes=1)
+# Writes made to bring devices back to their profiles, across all devices
+RECONCILE_WRITES_PER_SECOND = 2
+# Seconds a device gets to answer each write
+RECONCILE_WRITE_TIMEOUT = 15
+
+
+class DopplerReconciler:
+    """Keep Dopplers in line with the settings profiles assigned to them.
+
+    A pass compares every profile against the device's coordinator data, so it
+    doesn't send any requests for devices that haven't drifted. Drifted settings
+    are written one at a time in the background, at most
+    `RECONCILE_WRITES_PER_SECOND` per second, so a fleet that drifted at once
+    doesn't crowd out polls and user commands.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize reconciler."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.profiles"
+        )
+        self._profiles: dict[str, dict[str, Any]] = {}
+        self._drift: dict[str, list[str]] = {}
+        self._checked: list[str] = []
+        self._skipped: list[str] = []
+        self._task: asyncio.Task | None = None
+        self._pass_requested = False
+        self._last_write_at: float | None = None
+        self.passes = 0
+        self.writes_sent = 0
+        self.writes_failed = 0
+        self.last_pass_duration: float | None = None
+
+    async def async_load(self) -> None:
+        """Load the stored profiles."""
+        if stored := await self._store.async_load():
+            self._profiles = stored.get("profiles", {})
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start reconciling on an interval and return a callable to stop."""
+        unsub = async_track_time_interval(
+            self.hass, self._async_handle_interval, RECONCILE_INTERVAL
+        )
+
+        @callback
+        def async_stop() -> None:
+            """Stop reconciling."""
+            unsub()
+            if self._task:
+                self._task.cancel()
+                self._task = None
+
+        return async_stop
+
+    @callback
+    def _async_handle_interval(self, _now: Any) -> None:
+        """Run a pass on the reconcile interval."""
+        self.async_request_pass()
+
+    @callback
+    def async_get_profile(self, dsn: str) -> dict[str, Any] | None:
+        """Return the profile assigned to a device."""
+        return self._profiles.get(dsn)
+
+    @callback
+    def async_set_profile(self, dsn: str, settings: dict[str, Any]) -> None:
+        """Assign a profile to a device and bring the device in line with it."""
+        self._profiles[dsn] = dict(settings)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        self.async_request_pass()
+
+    @callback
+    def async_clear_profile(self, dsn: str) -> None:
+        """Stop reconciling a device."""
+        if self._profiles.pop(dsn, None) is not None:
+            self._drift.pop(dsn, None)
+            if dsn in self._checked:
+                self._checked.remove(dsn)
+            if dsn in self._skipped:
+                self._skipped.remove(dsn)
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_request_pass(self) -> None:
+        """Run a pass now, or right after the one that is running."""
+        if self._task:
+            self._pass_requested = True
+            return
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN} reconciler"
+        )
+
+    @callback
+    def async_get_metrics(self) -> dict[str, Any]:
+        """Return how far the fleet is from its profiles as of the last pass.
+
+        Devices whose data couldn't be trusted in the last pass are skipped, so they
+        count as neither converged nor drifted.
+        """
+        return {
+            "devices_with_profile": len(self._profiles),
+            "devices_converged": len(self._checked) - len(self._drift),
+            "devices_drifted": len(self._drift),
+            "devices_skipped": len(self._skipped),
+            "settings_drifted": sum(len(keys) for keys in self._drift.values()),
+            "passes": self.passes,
+            "writes_sent": self.writes_sent,
+            "writes_failed": self.writes_failed,
+            "last_pass_duration": self.last_pass_duration,
+            "drift": self._drift,
+            "skipped": self._skipped,
+        }
+
+    async def _async_run(self) -> None:
+        """Run passes until no more are requested."""
+        # Reconciling runs in the background, so don't hold up anything else
+        REQUEST_PRIORITY.set(RequestPriority.POLL)
+        try:
+            while True:
+                self._pass_requested = False
+                await self._async_reconcile()
+                if not self._pass_requested:
+                    return
+        finally:
+            self._task = None
+
+    async def _async_reconcile(self) -> None:
+        """Write the drifted settings of every device with a profile."""
+        loop = self.hass.loop
+        start = loop.time()
+        checked: list[str] = []
+        skipped: list[str] = []
+        for dsn, profile in list(self._profiles.items()):
+            coordinator = async_get_coordinator(self.hass, dsn)
+            # Only trust data the device has confirmed
+            if (
+                not coordinator
+                or not coordinator.data
+                or coordinator.stale
+                or not coordinator.last_update_success
+            ):
+                skipped.append(dsn)
+                continue
+            checked.append(dsn)
+            for key, val in async_get_drift(coordinator, profile).items():
+                if self._profiles.get(dsn) is not profile:
+                    # The profile changed during the pass, so it starts over
+                    break
+                await self._async_wait_for_write_slot()
+                try:
+                    async with asyncio.timeout(RECONCILE_WRITE_TIMEOUT):
+                        await async_write_settings(coordinator, {key: val})
+                except REQUEST_ERRORS as err:
+                    self.writes_failed += 1
+                    _LOGGER.warning(
+                        "Error setting %s to %s on %s: %s",
+                        key,
+                        val,
+                        coordinator.doppler,
+                        str(err) or type(err).__name__,
+                    )
+                else:
+                    self.writes_sent += 1
+
+        # Profiles may have been cleared during the pass
+        self._checked = [dsn for dsn in checked if dsn in self._profiles]
+        self._skipped = [dsn for dsn in skipped if dsn in self._profiles]
+        self._drift = {
+            dsn: sorted(drift)
+            for dsn in self._checked
+            if (coordinator := async_get_coordinator(self.hass, dsn))
+            and (drift := async_get_drift(coordinator, self._profiles[dsn]))
+        }
+        self.passes += 1
+        self.last_pass_duration = loop.time() - start
+        _LOGGER.debug(
+            "Reconciled %s device(s) in %.3f seconds, %s still drifted, %s skipped",
+            len(self._checked),
+            self.last_pass_duration,
+            len(self._drift),
+            len(self._skipped),
+        )
+
+    async def _async_wait_for_write_slot(self) -> None:
+        """Wait until the next write is allowed by the write rate."""
+        now = self.hass.loop.time()
+        if (
+            self._last_write_at is not None
+            and (wait := self._last_write_at + 1 / RECONCILE_WRITES_PER_SECOND - now)
+            > 0
+        ):
+            await asyncio.sleep(wait)
+        self._last_write_at = self.hass.loop.time()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the profiles to store."""
+        return {"profiles": self._profiles}
+
+
+async def async_remove_profiles(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored profiles for a config entry."""
+    await Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.profiles"
+    ).async_remove()
@@ -0,0 +1,213 @@
+"""Request scheduling for Sandman Doppler local API calls."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from enum import IntEnum
+import functools
+import heapq
+import itertools
+import logging
+import statistics
+from typing import Any
+
+from doppyler.model.doppler import Doppler
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of command latencies to keep for the latency percentiles
+COMMAND_LATENCY_SAMPLES = 1000
+
+
+class RequestPriority(IntEnum):
+    """Priority of a request, lower values go first."""
+
+    COMMAND = 0
+    POLL = 1
+
+
+# Requests are commands unless they are made from a context that says otherwise
+REQUEST_PRIORITY: ContextVar[RequestPriority] = ContextVar(
+    "doppler_request_priority", default=RequestPriority.COMMAND
+)
+
+
+class PriorityLimiter:
+    """Limit the number of concurrent holders, letting higher priority waiters in first.
+
+    Waiters with the same priority are let in in the order they arrived.
+    """
+
+    def __init__(self, value: int) -> None:
+        """Initialize limiter."""
+        self._value = value
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+
+    async def acquire(self, priority: int) -> None:
+        """Wait for a free slot."""
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Pass the slot on if it was handed to us right before we got cancelled
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Release a slot to the next waiter in line."""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._value += 1
+
+
+class DopplerRequestScheduler:
+    """Schedule local API requests for every Doppler on an account.
+
+    Each device gets its own lane so requests to the same clock run one at a time,
+    while requests to different clocks run in parallel up to a global cap. Commands
+    skip ahead of queued poll requests in both, so a command only ever waits for
+    the requests that are already in flight. Devices are also given evenly spread
+    slots in the refresh period so their polls don't all start at the same moment.
+    """
+
+    def __init__(self, max_concurrent_requests: int) -> None:
+        """Initialize scheduler."""
+        self.max_concurrent_requests = max_concurrent_requests
+        self._limiter = PriorityLimiter(max_concurrent_requests)
+        self._lanes: dict[str, PriorityLimiter] = {}
+        self._refresh_phases: dict[str, float] = {}
+        self._rebalance_listeners: dict[str, Callable[[], None]] = {}
+        self._detachers: dict[str, Callable[[], None]] = {}
+        self.requests_in_flight = 0
+        self.peak_requests_in_flight = 0
+        self.command_latencies: deque[float] = deque(maxlen=COMMAND_LATENCY_SAMPLES)
+
+    @callback
+    def async_attach(
+        self,
+        doppler: Doppler,
+        on_write: Callable[[], None] | None = None,
+        on_rebalance: Callable[[], None] | None = None,
+    ) -> Callable[[], None]:
+        """Route all API calls for a Doppler through the scheduler.
+
+        If provided, `on_write` is called after every command that changes something
+        on the device, and `on_rebalance` is called whenever the refresh slots are
+        reassigned because a device was attached or detached.
+        """
+        dsn = doppler.dsn
+        # A device that is attached again before its last attachment was detached,
+        # like when it's re-added while the old coordinator is still shutting down,
+        # replaces that attachment. Stacking a second wrapper on `_call_api` would
+        # make every request wait for the lane slot the outer wrapper holds.
+        if previous_detach := self._detachers.get(dsn):
+            previous_detach()
+        lane = self._lanes[dsn] = PriorityLimiter(1)
+        if on_rebalance:
+            self._rebalance_listeners[dsn] = on_rebalance
+        # Every getter and setter in doppyler goes through `_call_api`, so wrapping
+        # it on the instance puts each sub-request of a poll in the lane as well.
+        # pylint: disable-next=protected-access
+        call_api = doppler._call_api
+        own_call_api = vars(doppler).get("_call_api")
+        wrapper = doppler._call_api = functools.partial(
+            self._async_call_api, lane, call_api, on_write
+        )
+        self._async_rebalance()
+
+        @callback
+        def async_detach() -> None:
+            """Stop routing API calls for the Doppler through the scheduler."""
+            if vars(doppler).get("_call_api") is wrapper:
+                if own_call_api is None:
+                    del doppler._call_api
+                else:
+                    doppler._call_api = own_call_api
+            if self._detachers.get(dsn) is async_detach:
+                del self._detachers[dsn]
+                del self._lanes[dsn]
+                self._rebalance_listeners.pop(dsn, None)
+                self._async_rebalance()
+
+        self._detachers[dsn] = async_detach
+        return async_detach
+
+    @callback
+    def _async_rebalance(self) -> None:
+        """Spread the refresh slots of all devices evenly over the refresh period."""
+        dsns = sorted(self._lanes)
+        self._refresh_phases = {dsn: idx / len(dsns) for idx, dsn in enumerate(dsns)}
+        for listener in list(self._rebalance_listeners.values()):
+            listener()
+
+    @callback
+    def async_get_refresh_time(self, dsn: str, when: float, period: float) -> float:
+        """Move a refresh time to the closest point in time in the device's slot.
+
+        `when` is a loop time and `period` the length of the refresh cycle in
+        seconds, so the refresh moves by at most half a period.
+        """
+        if (phase := self._refresh_phases.get(dsn)) is None:
+            return when
+        delta = (phase * period - when) % period
+        if delta > period / 2:
+            delta -= period
+        return when + delta
+
+    async def _async_call_api(
+        self,
+        lane: PriorityLimiter,
+        call_api: Callable[..., Coroutine[Any, Any, dict]],
+        on_write: Callable[[], None] | None,
+        endpoint: str,
+        method: str = "GET",
+        data: dict | None = None,
+    ) -> dict:
+        """Make an API call once both the device lane and a global slot are free."""
+        priority = REQUEST_PRIORITY.get()
+        start = asyncio.get_running_loop().time()
+        # The lane is acquired first so a device waiting on itself never holds one
+        # of the global slots that other devices could be using.
+        await lane.acquire(priority)
+        try:
+            await self._limiter.acquire(priority)
+            self.requests_in_flight += 1
+            self.peak_requests_in_flight = max(
+                self.peak_requests_in_flight, self.requests_in_flight
+            )
+            try:
+                result = await call_api(endpoint, method=method, data=data)
+            finally:
+                self.requests_in_flight -= 1
+                self._limiter.release()
+        finally:
+            lane.release()
+        if priority == RequestPriority.COMMAND:
+            self.command_latencies.append(asyncio.get_running_loop().time() - start)
+        # Background writes like streams and animations don't mean someone is using
+        # the clock, and would otherwise keep it from ever backing off
+        if method != "GET" and priority == RequestPriority.COMMAND and on_write:
+            on_write()
+        return result
+
+    @callback
+    def async_get_command_latency_percentiles(self) -> dict[str, float] | None:
+        """Return the p50 and p99 latency in seconds of recent commands."""
+        if len(self.command_latencies) < 2:
+            return None
+        percentiles = statistics.quantiles(self.command_latencies, n=100)
+        return {"p50": percentiles[49], "p99": percentiles[98]}
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Sequence
 from dataclasses import dataclass
 from enum import Enum
+import functools
 from typing import Any
 import zoneinfo
 
@@ -28,7 +29,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import DopplerDataUpdateCoordinator
 from .const import DOMAIN
 from .entity import DopplerEntity
-from .helpers import get_enum_from_name, normalize_enum_name
+from .helpers import get_enum_from_name, get_enum_options, normalize_enum_name
 
 
 @dataclass
@@ -46,11 +47,22 @@ class DopplerSelectEntityDescription(SelectEntityDescription):
     """Class to describe Doppler select entities."""
 
     state_key: str | None = None
-    options_func: Callable[[Doppler], list[str]] = None
+    options_func: Callable[[Doppler], Sequence[str]] = None
     state_func: Callable[[Any], str] = lambda x: str(x)
     set_value_func: Callable[[Doppler, str], Coroutine[Any, Any, Any]] = None
 
 
+@functools.cache
+def get_timezone_options() -> tuple[str, ...]:
+    """Return the timezones a clock can be set to.
+
+    Listing the timezones reads the tz database from disk, so the list is built
+    once, in the executor when the platform is set up, and shared by all clocks.
+    It's a tuple so that none of them can change it for the others.
+    """
+    return tuple(sorted(zoneinfo.available_timezones()))
+
+
 ENUM_SELECT_ENTITY_DESCRIPTIONS = [
     DopplerEnumSelectEntityDescription(
         "Sound Preset",
@@ -89,7 +101,7 @@ SELECT_ENTITY_DESCRIPTIONS = [
         icon="mdi:map-clock",
         entity_category=EntityCategory.CONFIG,
         state_key=ATTR_TIMEZONE,
-        options_func=lambda _: sorted(list(zoneinfo.available_timezones())),
+        options_func=lambda _: get_timezone_options(),
         set_value_func=lambda dev, val: dev.set_timezone(zoneinfo.ZoneInfo(val)),
     ),
 ]
@@ -99,6 +111,7 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_devices: AddEntitiesCallback
 ) -> None:
     """Setup select platform."""
+    await hass.async_add_executor_job(get_timezone_options)
 
     @callback
     def async_add_device(device: Doppler) -> None:
@@ -133,7 +146,7 @@ class DopplerEnumSelect(
     @property
     def options(self) -> list[str]:
         """Return a set of selectable options."""
-        return [normalize_enum_name(enum_val) for enum_val in self.ed.enum_cls]
+        return list(get_enum_options(self.ed.enum_cls))
 
     @property
     def current_option(self) -> str | None:
@@ -147,10 +160,15 @@ class DopplerEnumSelect(
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
+        if not self.coordinator.async_should_write(
+            self.ed.state_key, self.current_option == option
+        ):
+            return
         enum_val = get_enum_from_name(self.ed.enum_cls, option)
         self.device_data[self.ed.state_key] = await self.ed.set_value_func(
             self.device, enum_val
         )
+        self.coordinator.async_record_write(self.ed.state_key)
         self.async_write_ha_state()
 
 
@@ -160,7 +178,7 @@ class DopplerSelect(DopplerEntity[DopplerSelectEntityDescription], SelectEntity)
     @property
     def options(self) -> list[str]:
         """Return a set of selectable options."""
-        return self.ed.options_func(self.device)
+        return list(self.ed.options_func(self.device))
 
     @property
     def current_option(self) -> str | None:
@@ -174,7 +192,12 @@ class DopplerSelect(DopplerEntity[DopplerSelectEntityDescription], SelectEntity)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
+        if not self.coordinator.async_should_write(
+            self.ed.state_key, self.current_option == option
+        ):
+            return
         self.device_data[self.ed.state_key] = await self.ed.set_value_func(
             self.device, option
         )
+        self.coordinator.async_record_write(self.ed.state_key)
         self.async_write_ha_state()
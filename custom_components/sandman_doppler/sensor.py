@@ -17,7 +17,7 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE
+from homeassistant.const import PERCENTAGE, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
@@ -25,6 +25,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import dt as dt_util
 
 from . import DopplerDataUpdateCoordinator
+from .breaker import BreakerState
 from .const import DOMAIN
 from .entity import DopplerEntity
 
@@ -40,6 +41,13 @@ class DopplerSensorEntityDescription(SensorEntityDescription):
     icon_func: Callable[[Any], Any] | None = None
 
 
+@dataclass
+class DopplerCoordinatorSensorEntityDescription(SensorEntityDescription):
+    """Class describing Doppler sensor entities for the integration's own state."""
+
+    value_func: Callable[[DopplerDataUpdateCoordinator], Any] | None = None
+
+
 SENSOR_ENTITY_DESCRIPTIONS = [
     DopplerSensorEntityDescription(
         "Light Detected",
@@ -85,6 +93,27 @@ SENSOR_ENTITY_DESCRIPTIONS = [
     ),
 ]
 
+COORDINATOR_SENSOR_ENTITY_DESCRIPTIONS = [
+    DopplerCoordinatorSensorEntityDescription(
+        "Poll Interval",
+        name="Poll Interval",
+        icon="mdi:timer-sync-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_func=lambda coordinator: coordinator.update_interval.total_seconds(),
+    ),
+    DopplerCoordinatorSensorEntityDescription(
+        "Circuit Breaker",
+        name="Circuit Breaker",
+        icon="mdi:electric-switch",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.ENUM,
+        options=[state.value for state in BreakerState],
+        value_func=lambda coordinator: coordinator.breaker.state.value,
+    ),
+]
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_devices: AddEntitiesCallback
@@ -101,6 +130,10 @@ async def async_setup_entry(
             DopplerSensor(coordinator, entry, device, description)
             for description in SENSOR_ENTITY_DESCRIPTIONS
         ]
+        entities.extend(
+            DopplerCoordinatorSensor(coordinator, entry, device, description)
+            for description in COORDINATOR_SENSOR_ENTITY_DESCRIPTIONS
+        )
         async_add_devices(entities)
 
     entry.async_on_unload(
@@ -131,6 +164,22 @@ class DopplerSensor(DopplerEntity[DopplerSensorEntityDescription], SensorEntity)
         return self.ed.state_func(raw_value)
 
 
+class DopplerCoordinatorSensor(
+    DopplerEntity[DopplerCoordinatorSensorEntityDescription], SensorEntity
+):
+    """Doppler sensor class for the integration's own state."""
+
+    @property
+    def available(self) -> bool:
+        """Return True since this state is known even when the device isn't."""
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        """Return the native value of the sensor."""
+        return self.ed.value_func(self.coordinator)
+
+
 # class DopplerAlarmsSensor(DopplerEntity,SensorEntity):
 #     """Doppler Alarms Sensor class."""
 
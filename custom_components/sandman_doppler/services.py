@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import asyncio
+import dataclasses
 from datetime import timedelta, time
 import functools
 import logging
@@ -10,6 +10,7 @@ from typing import Any
 
 from doppyler.client import DopplerClient
 from doppyler.const import (
+    ATTR_ALARMS,
     ATTR_COLOR,
     ATTR_COLORS,
     ATTR_DEVICES,
@@ -30,6 +31,7 @@ from doppyler.const import (
     ATTR_STATUS,
     ATTR_TEXT,
     ATTR_VOLUME,
+    ATTR_WEATHER,
 )
 from doppyler.model.alarm import Alarm, AlarmSource, RepeatDayOfWeek
 from doppyler.model.color import Color
@@ -40,8 +42,27 @@ from doppyler.model.mini_display_number import MiniDisplayNumber
 from doppyler.model.rainbow import RainbowConfiguration, RainbowMode
 import voluptuous as vol
 
-from homeassistant.const import ATTR_AREA_ID, ATTR_DEVICE_ID, ATTR_ENTITY_ID, ATTR_TIME
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.components.number import SERVICE_SET_VALUE
+from homeassistant.const import (
+    ATTR_AREA_ID,
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
+    ATTR_SERVICE,
+    ATTR_SERVICE_DATA,
+    ATTR_TIME,
+    SERVICE_SELECT_OPTION,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    Platform,
+)
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import (
     config_validation as cv,
@@ -49,24 +70,75 @@ from homeassistant.helpers import (
     entity_registry as er,
 )
 from homeassistant.helpers.service import ServiceCall
+from homeassistant.util.json import load_json
+from homeassistant.util.yaml import load_yaml
 
+from .alarms import AlarmSyncPlan, DopplerAlarmIndex, plan_alarm_sync
+from .animation import (
+    ANIMATION_GENERATORS,
+    DopplerLightBarAnimation,
+    FrameFunc,
+    keyframe_animation,
+)
 from .const import (
+    ATTR_DRY_RUN,
+    ATTR_FILE,
+    ATTR_FPS,
+    ATTR_GENERATOR,
+    ATTR_KEYFRAMES,
+    ATTR_LED_COUNT,
+    ATTR_LOOP,
+    ATTR_MIN_INTERVAL,
+    ATTR_PALETTE,
+    ATTR_PERIOD,
+    ATTR_PRUNE,
+    ATTR_PERSIST,
+    ATTR_SETTINGS,
+    ATTR_SNAPSHOT,
+    ATTR_SOURCE_ENTITY_ID,
+    ATTR_SPACE,
+    ATTR_STOPS,
+    ATTR_THRESHOLD,
     DOMAIN,
+    LIGHT_BAR_LED_COUNT,
     SERVICE_ACTIVATE_LIGHT_BAR_BLINK,
     SERVICE_ACTIVATE_LIGHT_BAR_COMET,
+    SERVICE_ACTIVATE_LIGHT_BAR_GRADIENT,
     SERVICE_ACTIVATE_LIGHT_BAR_PULSE,
     SERVICE_ACTIVATE_LIGHT_BAR_SET,
     SERVICE_ACTIVATE_LIGHT_BAR_SET_EACH,
     SERVICE_ACTIVATE_LIGHT_BAR_SWEEP,
     SERVICE_ADD_ALARM,
+    SERVICE_CLEAR_PROFILE,
     SERVICE_DELETE_ALARM,
+    SERVICE_FORCE_WRITE,
+    SERVICE_RESTORE,
     SERVICE_UPDATE_ALARM,
     SERVICE_SET_MAIN_DISPLAY_TEXT,
     SERVICE_SET_MINI_DISPLAY_NUMBER,
+    SERVICE_SET_PROFILE,
     SERVICE_SET_WEATHER_LOCATION,
+    SERVICE_SNAPSHOT,
     SERVICE_SET_RAINBOW_MODE,
+    SERVICE_START_LIGHT_BAR_ANIMATION,
+    SERVICE_START_MINI_DISPLAY_STREAM,
+    SERVICE_STOP_LIGHT_BAR_ANIMATION,
+    SERVICE_STOP_MINI_DISPLAY_STREAM,
+    SERVICE_SYNC_ALARMS,
     SERVICE_UPDATE_ALARM,
 )
+from .fanout import FanOutResult, async_fan_out
+from .helpers import FORCE_WRITE, async_get_coordinator
+from .palette import PALETTES, InterpolationSpace, gradient, palette_gradient
+from .reconciler import DopplerReconciler
+from .settings import (
+    async_get_drift,
+    async_get_setting_values,
+    async_write_settings,
+    validate_settings,
+)
+from .snapshot import DopplerSnapshots
+from .stream import DopplerMiniDisplayStream
 
 SCAN_INTERVAL = timedelta(seconds=60)
 
@@ -102,28 +174,117 @@ LIGHT_BAR_SET_SCHEMA = LIGHT_BAR_BLINK_SCHEMA = LIGHT_BAR_BASE_SCHEMA.extend(
     }
 )
 
+LIGHT_BAR_ANIMATION_SCHEMA = {
+    vol.Exclusive(ATTR_KEYFRAMES, "animation"): vol.All(
+        cv.ensure_list,
+        vol.Length(min=1),
+        [
+            vol.Schema(
+                {
+                    vol.Required(ATTR_TIME): vol.All(
+                        vol.Coerce(float), vol.Range(min=0)
+                    ),
+                    vol.Required(ATTR_COLORS): vol.All(
+                        cv.ensure_list, vol.Length(min=1), [COLOR_SCHEMA]
+                    ),
+                }
+            )
+        ],
+    ),
+    vol.Exclusive(ATTR_GENERATOR, "animation"): vol.In(ANIMATION_GENERATORS),
+    vol.Optional(ATTR_COLORS): vol.All(
+        cv.ensure_list, vol.Length(min=1), [COLOR_SCHEMA]
+    ),
+    vol.Optional(ATTR_PERIOD, default=2): vol.All(
+        vol.Coerce(float), vol.Range(min=0, min_included=False)
+    ),
+    vol.Optional(ATTR_LOOP, default=True): cv.boolean,
+    vol.Optional(ATTR_FPS, default=5): vol.All(vol.Coerce(float), vol.Range(1, 30)),
+    vol.Optional(ATTR_DURATION): cv.time_period,
+}
+
+LIGHT_BAR_GRADIENT_SCHEMA = {
+    vol.Exclusive(ATTR_STOPS, "gradient"): vol.All(
+        cv.ensure_list, vol.Length(min=1), [COLOR_SCHEMA]
+    ),
+    vol.Exclusive(ATTR_PALETTE, "gradient"): vol.In(PALETTES),
+    vol.Optional(ATTR_SPACE, default=InterpolationSpace.RGB): vol.Coerce(
+        InterpolationSpace
+    ),
+    vol.Optional(ATTR_LED_COUNT, default=LIGHT_BAR_LED_COUNT): vol.All(
+        vol.Coerce(int), vol.Range(1, LIGHT_BAR_LED_COUNT)
+    ),
+    vol.Required(ATTR_DURATION): cv.time_period,
+    vol.Optional(ATTR_SPARKLE): vol.Coerce(Sparkle),
+}
+
+# Services that write the values of Doppler entities and can be forced
+FORCE_WRITE_SERVICES = {
+    f"{Platform.LIGHT}.{SERVICE_TURN_ON}",
+    f"{Platform.NUMBER}.{SERVICE_SET_VALUE}",
+    f"{Platform.SELECT}.{SERVICE_SELECT_OPTION}",
+    f"{Platform.SWITCH}.{SERVICE_TURN_OFF}",
+    f"{Platform.SWITCH}.{SERVICE_TURN_ON}",
+}
+
 VALID_STATUSES = {"Enabled": "set", "Disabled": "unarmed"}
 VALID_STATUSES_WITH_SNOOZE = {**VALID_STATUSES, "Snoozed": "snoozed"}
 
+ALARM_SCHEMA = {
+    vol.Required(ATTR_ID): vol.Coerce(int),
+    vol.Required(ATTR_NAME): cv.string,
+    vol.Required(ATTR_TIME): cv.time,
+    vol.Required(ATTR_REPEAT, default=[]): vol.All(
+        cv.ensure_list, [vol.Coerce(RepeatDayOfWeek)]
+    ),
+    vol.Required(ATTR_COLOR): COLOR_SCHEMA,
+    vol.Required(ATTR_VOLUME): vol.All(vol.Coerce(int), vol.Range(1, 100)),
+    vol.Required(ATTR_STATUS, default="Enabled"): vol.All(
+        vol.Title,
+        vol.In(VALID_STATUSES.keys()),
+        lambda x: VALID_STATUSES_WITH_SNOOZE[x],
+    ),
+    vol.Required(ATTR_SOUND): cv.string,
+}
+
 
 async def call_doppyler_api_across_devices(
     devices: set[Doppler], func_name: str, *args, **kwargs
-) -> Any:
+) -> FanOutResult:
     """Call Doppyler API across all devices."""
-    results = await asyncio.gather(
-        *(getattr(device, func_name)(*args, **kwargs) for device in devices),
-        return_exceptions=True,
+    result = await async_fan_out(
+        devices, lambda device: getattr(device, func_name)(*args, **kwargs)
     )
-    if errors := [
-        tup for tup in zip(devices, results) if isinstance(tup[1], Exception)
-    ]:
-        lines = [
-            f"{device} - {type(error).__name__}: {error}" for device, error in errors
-        ]
-        if len(lines) > 1:
-            lines.insert(0, f"{len(errors)} error(s):")
-        raise HomeAssistantError("\n".join(lines))
-    return results
+    result.raise_for_errors()
+    return result
+
+
+def _load_alarms_file(path: str) -> Any:
+    """Load desired alarms from a YAML or JSON file."""
+    if path.endswith(".json"):
+        return load_json(path)
+    return load_yaml(path)
+
+
+def _get_frame_func(data: dict[str, Any]) -> FrameFunc:
+    """Get the frame function for a start_light_bar_animation service call."""
+    if keyframes := data.get(ATTR_KEYFRAMES):
+        return keyframe_animation(
+            [(keyframe[ATTR_TIME], keyframe[ATTR_COLORS]) for keyframe in keyframes],
+            LIGHT_BAR_LED_COUNT,
+            data[ATTR_LOOP],
+        )
+    return ANIMATION_GENERATORS[data[ATTR_GENERATOR]](
+        data[ATTR_COLORS], LIGHT_BAR_LED_COUNT, data[ATTR_PERIOD]
+    )
+
+
+def _validate_animation(data: dict[str, Any]) -> dict[str, Any]:
+    """Validate animation in service call dict."""
+    cv.has_at_least_one_key(ATTR_KEYFRAMES, ATTR_GENERATOR)(data)
+    if ATTR_GENERATOR in data and ATTR_COLORS not in data:
+        raise vol.Invalid(f"`{ATTR_COLORS}` is required with `{ATTR_GENERATOR}`")
+    return data
 
 
 def _validate_colors(data: dict[str, Any]) -> dict[str, Any]:
@@ -146,53 +307,111 @@ class DopplerServices:
         ent_reg: er.EntityRegistry,
         dev_reg: dr.DeviceRegistry,
         client: DopplerClient,
+        alarm_index: DopplerAlarmIndex,
+        reconciler: DopplerReconciler,
+        snapshots: DopplerSnapshots,
     ) -> None:
         """Initialize services."""
         self.hass = hass
         self.ent_reg = ent_reg
         self.dev_reg = dev_reg
         self.client = client
+        self.alarm_index = alarm_index
+        self.reconciler = reconciler
+        self.snapshots = snapshots
+        # Resolved devices for each set of targets, and Dopplers by device ID. Both
+        # are cleared whenever the device or entity registry changes, or the client
+        # adds or removes a device, since a device whose registry entry doesn't
+        # change doesn't fire a registry event.
+        self._target_cache: dict[
+            tuple[frozenset[str], frozenset[str], frozenset[str]], frozenset[Doppler]
+        ] = {}
+        self._device_index: dict[str, Doppler] | None = None
+        self._streams: dict[str, DopplerMiniDisplayStream] = {}
+        self._animations: dict[str, DopplerLightBarAnimation] = {}
 
     @callback
-    def get_dopplers_from_targets(self, data: dict[str, Any]) -> dict[str, Any]:
-        """Get dopplers from service targets."""
-        devices: set[Doppler] = set()
-        device_ids: set[str] = set()
-        device_ids.update(data.pop(ATTR_DEVICE_ID, []))
-        device_ids.update(
+    def _async_get_device_index(self) -> dict[str, Doppler]:
+        """Return a map of device registry IDs to Dopplers."""
+        if self._device_index is None:
+            self._device_index = {
+                device_entry.id: doppler
+                for dsn, doppler in self.client.devices.items()
+                if (device_entry := self.dev_reg.async_get_device({(DOMAIN, dsn)}))
+            }
+        return self._device_index
+
+    @callback
+    def _async_invalidate_targets(self, _: Event | Doppler | None = None) -> None:
+        """Clear the resolved service targets."""
+        self._target_cache.clear()
+        self._device_index = None
+
+    @callback
+    def _async_resolve_targets(
+        self,
+        device_ids: frozenset[str],
+        entity_ids: frozenset[str],
+        area_ids: frozenset[str],
+    ) -> frozenset[Doppler]:
+        """Resolve service targets to the Dopplers they include."""
+        all_device_ids = set(device_ids)
+        all_device_ids.update(
             {
                 entity_entry.device_id
-                for entity_id in data.pop(ATTR_ENTITY_ID, [])
+                for entity_id in entity_ids
                 if (entity_entry := self.ent_reg.async_get(entity_id))
                 and entity_entry.device_id
             }
         )
-        device_ids.update(
+        all_device_ids.update(
             {
                 dev.id
-                for area_id in data.pop(ATTR_AREA_ID, [])
+                for area_id in area_ids
                 for dev in dr.async_entries_for_area(self.dev_reg, area_id)
             }
         )
 
-        for device_id in device_ids:
-            if not (device_entry := self.dev_reg.async_get(device_id)):
-                continue
-            identifier = next(id for id in device_entry.identifiers)
-            if identifier[0] != DOMAIN:
-                _LOGGER.warning(
-                    "Skipping device %s for service call because it is not a supported "
-                    "Sandman Doppler device"
+        device_index = self._async_get_device_index()
+        devices: set[Doppler] = set()
+        for device_id in all_device_ids:
+            if not (doppler := device_index.get(device_id)):
+                _LOGGER.debug(
+                    "Skipping device %s for service call because it is not a known "
+                    "Sandman Doppler device",
+                    device_id,
                 )
                 continue
-            devices.add(self.client.devices[identifier[1]])
+            devices.add(doppler)
+        return frozenset(devices)
+
+    @callback
+    def get_dopplers_from_targets(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Get dopplers from service targets."""
+        key = (
+            frozenset(data.pop(ATTR_DEVICE_ID, [])),
+            frozenset(data.pop(ATTR_ENTITY_ID, [])),
+            frozenset(data.pop(ATTR_AREA_ID, [])),
+        )
+        if (devices := self._target_cache.get(key)) is None:
+            devices = self._async_resolve_targets(*key)
+            # Don't cache misses, the devices may just not have been added yet
+            if devices:
+                self._target_cache[key] = devices
 
         if not devices:
             raise vol.Invalid("No devices found in given targets!")
 
-        data[ATTR_DEVICES] = devices
+        data[ATTR_DEVICES] = set(devices)
         return data
 
+    @callback
+    def _async_refresh_keys(self, devices: set[Doppler], *keys: str) -> None:
+        """Refresh the poll tiers of the given keys on each device's coordinator."""
+        for device in devices:
+            if coordinator := async_get_coordinator(self.hass, device.dsn):
+                self.hass.async_create_task(coordinator.async_refresh_keys(*keys))
+
     def _expand_schema(self, schema: dict[vol.Marker, Any]) -> vol.Schema:
         """Get expanded schema from service specific schema."""
         return vol.All(
@@ -211,8 +430,18 @@ class DopplerServices:
         )
 
     @callback
-    def async_register(self):
-        """Register services."""
+    def async_register(self) -> CALLBACK_TYPE:
+        """Register services and return a callback to stop tracking the devices."""
+        unsubs = [
+            self.hass.bus.async_listen(event_type, self._async_invalidate_targets)
+            for event_type in (
+                dr.EVENT_DEVICE_REGISTRY_UPDATED,
+                er.EVENT_ENTITY_REGISTRY_UPDATED,
+            )
+        ]
+        unsubs.append(self.client.on_device_added(self._async_invalidate_targets))
+        unsubs.append(self.client.on_device_removed(self._async_invalidate_targets))
+
         self.hass.services.async_register(
             DOMAIN,
             SERVICE_SET_WEATHER_LOCATION,
@@ -224,26 +453,27 @@ class DopplerServices:
             DOMAIN,
             SERVICE_ADD_ALARM,
             self.handle_add_alarm,
-            schema=self._expand_schema(
-                {
-                    vol.Required(ATTR_ID): vol.Coerce(int),
-                    vol.Required(ATTR_NAME): cv.string,
-                    vol.Required(ATTR_TIME): cv.time,
-                    vol.Required(ATTR_REPEAT, default=[]): vol.All(
-                        cv.ensure_list, [vol.Coerce(RepeatDayOfWeek)]
-                    ),
-                    vol.Required(ATTR_COLOR): COLOR_SCHEMA,
-                    vol.Required(ATTR_VOLUME): vol.All(
-                        vol.Coerce(int), vol.Range(1, 100)
-                    ),
-                    vol.Required(ATTR_STATUS, default="Enabled"): vol.All(
-                        vol.Title,
-                        vol.In(VALID_STATUSES.keys()),
-                        lambda x: VALID_STATUSES_WITH_SNOOZE[x],
-                    ),
-                    vol.Required(ATTR_SOUND): cv.string,
-                }
+            schema=self._expand_schema(ALARM_SCHEMA),
+        )
+
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_SYNC_ALARMS,
+            self.handle_sync_alarms,
+            schema=vol.All(
+                self._expand_schema(
+                    {
+                        vol.Exclusive(ATTR_ALARMS, "alarms"): vol.All(
+                            cv.ensure_list, [vol.Schema(ALARM_SCHEMA)]
+                        ),
+                        vol.Exclusive(ATTR_FILE, "alarms"): cv.string,
+                        vol.Optional(ATTR_PRUNE, default=True): cv.boolean,
+                        vol.Optional(ATTR_DRY_RUN, default=False): cv.boolean,
+                    }
+                ),
+                cv.has_at_least_one_key(ATTR_ALARMS, ATTR_FILE),
             ),
+            supports_response=SupportsResponse.OPTIONAL,
         )
 
         self.hass.services.async_register(
@@ -321,6 +551,58 @@ class DopplerServices:
             ),
         )
 
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_START_MINI_DISPLAY_STREAM,
+            self.handle_start_mini_display_stream,
+            schema=self._expand_schema(
+                {
+                    vol.Required(ATTR_SOURCE_ENTITY_ID): cv.entity_id,
+                    vol.Required(ATTR_DURATION): cv.time_period,
+                    vol.Required(ATTR_COLOR): COLOR_SCHEMA,
+                    vol.Optional(ATTR_THRESHOLD, default=0): vol.All(
+                        vol.Coerce(float), vol.Range(min=0)
+                    ),
+                    vol.Optional(
+                        ATTR_MIN_INTERVAL, default=timedelta(seconds=5)
+                    ): cv.time_period,
+                }
+            ),
+        )
+
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_STOP_MINI_DISPLAY_STREAM,
+            self.handle_stop_mini_display_stream,
+            schema=self._expand_schema({}),
+        )
+
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_START_LIGHT_BAR_ANIMATION,
+            self.handle_start_light_bar_animation,
+            schema=vol.All(
+                self._expand_schema(LIGHT_BAR_ANIMATION_SCHEMA), _validate_animation
+            ),
+        )
+
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_STOP_LIGHT_BAR_ANIMATION,
+            self.handle_stop_light_bar_animation,
+            schema=self._expand_schema({}),
+        )
+
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_ACTIVATE_LIGHT_BAR_GRADIENT,
+            self.handle_activate_light_bar_gradient,
+            schema=vol.All(
+                self._expand_schema(LIGHT_BAR_GRADIENT_SCHEMA),
+                cv.has_at_least_one_key(ATTR_STOPS, ATTR_PALETTE),
+            ),
+        )
+
         self.hass.services.async_register(
             DOMAIN,
             SERVICE_ACTIVATE_LIGHT_BAR_BLINK,
@@ -400,6 +682,60 @@ class DopplerServices:
                 )
             ),
         )
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_SET_PROFILE,
+            self.handle_set_profile,
+            schema=self._expand_schema(
+                {vol.Required(ATTR_SETTINGS): validate_settings}
+            ),
+        )
+
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_CLEAR_PROFILE,
+            self.handle_clear_profile,
+            schema=self._expand_schema({}),
+        )
+
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_SNAPSHOT,
+            self.handle_snapshot,
+            schema=self._expand_schema(
+                {
+                    vol.Optional(ATTR_SNAPSHOT, default="default"): cv.string,
+                    vol.Optional(ATTR_PERSIST, default=False): cv.boolean,
+                }
+            ),
+        )
+
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_RESTORE,
+            self.handle_restore,
+            schema=self._expand_schema(
+                {vol.Optional(ATTR_SNAPSHOT, default="default"): cv.string}
+            ),
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+        self.hass.services.async_register(
+            DOMAIN,
+            SERVICE_FORCE_WRITE,
+            self.handle_force_write,
+            schema=vol.Schema(
+                {
+                    vol.Required(ATTR_SERVICE): vol.All(
+                        cv.service, vol.In(FORCE_WRITE_SERVICES)
+                    ),
+                    vol.Required(ATTR_SERVICE_DATA): vol.Schema(
+                        {vol.Required(ATTR_ENTITY_ID): cv.entity_ids},
+                        extra=vol.ALLOW_EXTRA,
+                    ),
+                }
+            ),
+        )
         self.hass.services.async_register(
             DOMAIN,
             SERVICE_SET_RAINBOW_MODE,
@@ -414,6 +750,20 @@ class DopplerServices:
             ),
         )
 
+        @callback
+        def async_unsub() -> None:
+            """Stop tracking the devices and stop all streams and animations."""
+            for unsub in unsubs:
+                unsub()
+            for stream in self._streams.values():
+                stream.async_stop()
+            self._streams.clear()
+            for animation in self._animations.values():
+                animation.async_stop()
+            self._animations.clear()
+
+        return async_unsub
+
     async def handle_set_weather_location(self, call: ServiceCall) -> None:
         """Handle set_weather_location service."""
         data = call.data.copy()
@@ -422,6 +772,7 @@ class DopplerServices:
         await call_doppyler_api_across_devices(
             devices, "set_weather_configuration", **data
         )
+        self._async_refresh_keys(devices, ATTR_WEATHER)
 
     async def handle_add_alarm(self, call: ServiceCall) -> None:
         """Handle add_alarm service."""
@@ -431,6 +782,7 @@ class DopplerServices:
         alarm = Alarm(**data, src=AlarmSource.APP)
         _LOGGER.debug("Called add_alarm service, sending %s", alarm)
         await call_doppyler_api_across_devices(devices, "add_alarm", alarm)
+        self._async_refresh_keys(devices, ATTR_ALARMS)
 
     async def handle_update_alarm(self, call: ServiceCall) -> None:
         """Handle update_alarm service."""
@@ -438,62 +790,148 @@ class DopplerServices:
         devices: set[Doppler] = data.pop(ATTR_DEVICES)
         alarm_id: int = data.pop(ATTR_ID)
 
-        # Get all exisitng alarms for all devices
-        try:
-            existing_alarms_all: list[list[Alarm]] = await asyncio.gather(
-                *(device.get_all_alarms() for device in devices)
-            )
-        except Exception as err:
-            raise HomeAssistantError from err
+        await self._async_read_stale_alarms(devices)
 
         # Filter to only the alarms that are being updated
-        existing_alarms = [
-            (
-                device,
-                next(
-                    (
-                        alarm
-                        for alarm_id_, alarm in alarms.items()
-                        if alarm_id_ == alarm_id
-                    ),
-                    None,
-                ),
-            )
-            for device, alarms in zip(devices, existing_alarms_all)
-        ]
+        existing_alarms: dict[Doppler, Alarm | None] = {
+            device: self.alarm_index.async_get(device.dsn, alarm_id)
+            for device in devices
+        }
 
         # If the alarm ID was not found on a device, raise an error
         if devices_missing_alarm := [
-            device for device, alarm in existing_alarms if alarm is None
+            device for device, alarm in existing_alarms.items() if alarm is None
         ]:
             raise HomeAssistantError(
-                f"Alarm with id {data[ATTR_ID]} not found on device(s) {devices_missing_alarm}"
+                f"Alarm with id {alarm_id} not found on device(s) {devices_missing_alarm}"
             )
 
-        # Update the alarm data
-        for _, alarm in existing_alarms:
-            for key, val in data.items():
-                setattr(alarm, key, val)
+        # Update the alarm data. The indexed alarms are only updated once the device
+        # confirms the update.
+        new_alarms = {
+            device: dataclasses.replace(alarm, **data)
+            for device, alarm in existing_alarms.items()
+        }
 
-        _LOGGER.debug("Called update_alarm service, sending %s", existing_alarms)
+        _LOGGER.debug("Called update_alarm service, sending %s", new_alarms)
         # Iterate through each device and update each alarm
-        results = await asyncio.gather(
-            *(
-                device.update_alarm(alarm_id, alarm)
-                for device, alarm in existing_alarms
-            ),
-            return_exceptions=True,
+        result = await async_fan_out(
+            devices,
+            lambda device: device.update_alarm(alarm_id, new_alarms[device]),
         )
-        if errors := [
-            tup for tup in zip(devices, results) if isinstance(tup[1], Exception)
-        ]:
-            lines = [
-                f"{device} - {type(error).__name__}: {error}"
-                for device, error in errors
-            ]
-            if len(lines) > 1:
-                lines.insert(0, f"{len(errors)} error(s):")
-            raise HomeAssistantError("\n".join(lines))
+        self._async_process_alarm_responses(result)
+        result.raise_for_errors()
+
+    async def _async_read_stale_alarms(self, devices: set[Doppler]) -> None:
+        """Read the alarms of devices whose indexed alarms can't be trusted."""
+        stale_devices = set()
+        for device in devices:
+            fresh = self.alarm_index.async_is_fresh(device.dsn)
+            self.alarm_index.async_record_lookup(fresh)
+            if not fresh:
+                stale_devices.add(device)
+        if stale_devices:
+            await call_doppyler_api_across_devices(stale_devices, "get_all_alarms")
+            for device in stale_devices:
+                self.alarm_index.async_confirm(device.dsn)
+
+    async def _async_load_alarms_file(self, path: str) -> list[dict[str, Any]]:
+        """Load and validate desired alarms from a file in an allowed directory."""
+        path = self.hass.config.path(path)
+        if not self.hass.config.is_allowed_path(path):
+            raise HomeAssistantError(f"Access to {path} is not allowed")
+        try:
+            alarms = await self.hass.async_add_executor_job(_load_alarms_file, path)
+        except (HomeAssistantError, OSError) as err:
+            raise HomeAssistantError(
+                f"Unable to load alarms from {path}: {err}"
+            ) from err
+        try:
+            return vol.Schema(vol.All(cv.ensure_list, [vol.Schema(ALARM_SCHEMA)]))(
+                alarms
+            )
+        except vol.Invalid as err:
+            raise HomeAssistantError(f"Invalid alarms in {path}: {err}") from err
+
+    async def _async_apply_alarm_sync(
+        self, device: Doppler, plan: AlarmSyncPlan
+    ) -> None:
+        """Write the planned alarm changes to a device, one at a time."""
+        synced = False
+        try:
+            for alarm_id in plan.delete:
+                alarms = await device.delete_alarm(alarm_id)
+            for alarm in plan.update:
+                alarms = await device.update_alarm(alarm.id, alarm)
+            for alarm in plan.add:
+                alarms = await device.add_alarm(alarm)
+            if plan.add or plan.delete:
+                # The library has to read the alarms to add or remove them
+                await device.get_all_alarms()
+                self.alarm_index.async_confirm(device.dsn)
+            else:
+                self.alarm_index.async_process_response(device.dsn, alarms)
+            synced = True
+        finally:
+            if not synced:
+                # We don't know which of the writes made it, also when the fan-out
+                # cancelled the sync partway through, so read the alarms again
+                self.alarm_index.async_expire(device.dsn)
+                self._async_refresh_keys({device}, ATTR_ALARMS)
+            elif coordinator := async_get_coordinator(self.hass, device.dsn):
+                coordinator.async_update_keys(ATTR_ALARMS)
+
+    @callback
+    def _async_process_alarm_responses(self, result: FanOutResult) -> None:
+        """Update the alarm index from the alarms devices returned for a write."""
+        for device, alarms in result.succeeded.items():
+            if not (coordinator := async_get_coordinator(self.hass, device.dsn)):
+                continue
+            if self.alarm_index.async_process_response(device.dsn, alarms):
+                coordinator.async_update_keys(ATTR_ALARMS)
+            else:
+                # Alarms were added or removed, which the library has to pick up
+                self.hass.async_create_task(coordinator.async_refresh_keys(ATTR_ALARMS))
+
+    async def handle_sync_alarms(self, call: ServiceCall) -> ServiceResponse:
+        """Handle sync_alarms service."""
+        data = call.data
+        devices: set[Doppler] = data[ATTR_DEVICES]
+        if (path := data.get(ATTR_FILE)) is not None:
+            alarms_data = await self._async_load_alarms_file(path)
+        else:
+            alarms_data = data[ATTR_ALARMS]
+
+        desired: dict[int, Alarm] = {}
+        for alarm_data in alarms_data:
+            if alarm_data[ATTR_ID] in desired:
+                raise HomeAssistantError(
+                    f"Alarm with id {alarm_data[ATTR_ID]} is listed more than once"
+                )
+            desired[alarm_data[ATTR_ID]] = Alarm(**alarm_data, src=AlarmSource.APP)
+
+        await self._async_read_stale_alarms(devices)
+        plans = {
+            device: plan_alarm_sync(
+                self.alarm_index.async_get_device_alarms(device.dsn),
+                desired,
+                data[ATTR_PRUNE],
+            )
+            for device in devices
+        }
+        _LOGGER.debug("Called sync_alarms service, planned %s", plans)
+
+        if not data[ATTR_DRY_RUN]:
+            result = await async_fan_out(
+                [device for device, plan in plans.items() if plan],
+                lambda device: self._async_apply_alarm_sync(device, plans[device]),
+                requests=lambda device: plans[device].requests,
+            )
+            result.raise_for_errors()
+
+        if not call.return_response:
+            return None
+        return {device.dsn: plan.as_dict() for device, plan in plans.items()}
 
     async def handle_delete_alarm(self, call: ServiceCall) -> None:
         """Handle delete_alarm service."""
@@ -501,6 +939,7 @@ class DopplerServices:
         devices: set[Doppler] = data.pop(ATTR_DEVICES)
         _LOGGER.debug("Called delete_alarm service for id %s", data[ATTR_ID])
         await call_doppyler_api_across_devices(devices, "delete_alarm", data[ATTR_ID])
+        self._async_refresh_keys(devices, ATTR_ALARMS)
 
     async def handle_set_main_display(self, call: ServiceCall) -> None:
         """Handle set_main_display service."""
@@ -518,16 +957,95 @@ class DopplerServices:
         _LOGGER.debug("Called display_num_mini service, sending %s", mdn)
         await call_doppyler_api_across_devices(devices, "set_mini_display_number", mdn)
 
+    async def handle_start_mini_display_stream(self, call: ServiceCall) -> None:
+        """Handle start_mini_display_stream service."""
+        data = call.data.copy()
+        devices: set[Doppler] = data.pop(ATTR_DEVICES)
+        _LOGGER.debug("Called start_mini_display_stream service with %s", data)
+        for device in devices:
+            if stream := self._streams.pop(device.dsn, None):
+                stream.async_stop()
+            stream = self._streams[device.dsn] = DopplerMiniDisplayStream(
+                self.hass,
+                device,
+                data[ATTR_SOURCE_ENTITY_ID],
+                data[ATTR_DURATION],
+                data[ATTR_COLOR],
+                data[ATTR_THRESHOLD],
+                data[ATTR_MIN_INTERVAL],
+            )
+            stream.async_start()
+
+    async def handle_stop_mini_display_stream(self, call: ServiceCall) -> None:
+        """Handle stop_mini_display_stream service."""
+        devices: set[Doppler] = call.data[ATTR_DEVICES]
+        _LOGGER.debug("Called stop_mini_display_stream service for %s", devices)
+        for device in devices:
+            if stream := self._streams.pop(device.dsn, None):
+                stream.async_stop()
+
+    @callback
+    def _async_stop_animations(self, devices: set[Doppler]) -> None:
+        """Stop the light bar animations running on the given devices."""
+        for device in devices:
+            if animation := self._animations.pop(device.dsn, None):
+                animation.async_stop()
+
+    async def handle_start_light_bar_animation(self, call: ServiceCall) -> None:
+        """Handle start_light_bar_animation service."""
+        data = call.data.copy()
+        devices: set[Doppler] = data.pop(ATTR_DEVICES)
+        _LOGGER.debug("Called start_light_bar_animation service with %s", data)
+        frame_func = _get_frame_func(data)
+        self._async_stop_animations(devices)
+        for device in devices:
+            animation = self._animations[device.dsn] = DopplerLightBarAnimation(
+                self.hass, device, frame_func, data[ATTR_FPS], data.get(ATTR_DURATION)
+            )
+            animation.async_start(
+                functools.partial(self._async_animation_done, animation)
+            )
+
+    @callback
+    def _async_animation_done(self, animation: DopplerLightBarAnimation) -> None:
+        """Forget an animation that ended, unless it was already replaced."""
+        if self._animations.get(animation.doppler.dsn) is animation:
+            del self._animations[animation.doppler.dsn]
+
+    async def handle_stop_light_bar_animation(self, call: ServiceCall) -> None:
+        """Handle stop_light_bar_animation service."""
+        devices: set[Doppler] = call.data[ATTR_DEVICES]
+        _LOGGER.debug("Called stop_light_bar_animation service for %s", devices)
+        self._async_stop_animations(devices)
+
     async def handle_activate_light_bar(self, mode: Mode, call: ServiceCall) -> None:
         """Handle activate_light_bar_* services."""
         data = call.data.copy()
         devices: set[Doppler] = data.pop(ATTR_DEVICES)
+        # An animation would overwrite the effect with its next frame
+        self._async_stop_animations(devices)
         lbde = LightBarDisplayEffect(mode, **data)
         _LOGGER.debug(
             "Called activate_light_bar_%s service, sending %s", mode.value, lbde
         )
         await call_doppyler_api_across_devices(devices, "set_light_bar_effect", lbde)
 
+    async def handle_activate_light_bar_gradient(self, call: ServiceCall) -> None:
+        """Handle activate_light_bar_gradient service."""
+        data = call.data.copy()
+        devices: set[Doppler] = data.pop(ATTR_DEVICES)
+        led_count, space = data.pop(ATTR_LED_COUNT), data.pop(ATTR_SPACE)
+        if stops := data.pop(ATTR_STOPS, None):
+            colors = gradient(stops, led_count, space)
+        else:
+            colors = palette_gradient(data.pop(ATTR_PALETTE), led_count, space)
+        # The gradient only produces valid colors, so they go straight into the
+        # effect instead of through COLOR_SCHEMA
+        lbde = LightBarDisplayEffect(Mode.SET_EACH, colors=colors, **data)
+        _LOGGER.debug("Called activate_light_bar_gradient service, sending %s", lbde)
+        self._async_stop_animations(devices)
+        await call_doppyler_api_across_devices(devices, "set_light_bar_effect", lbde)
+
     async def handle_set_rainbow_mode(self, call: ServiceCall) -> None:
         """Handle set rainbow mode"""
         data = call.data.copy()
@@ -535,3 +1053,102 @@ class DopplerServices:
         rbc = RainbowConfiguration(**data)
         _LOGGER.debug("Called set_rainbow_mode service, sending %s", rbc)
         await call_doppyler_api_across_devices(devices, "set_rainbow_mode", rbc)
+
+    async def handle_set_profile(self, call: ServiceCall) -> None:
+        """Handle set_profile service."""
+        devices: set[Doppler] = call.data[ATTR_DEVICES]
+        _LOGGER.debug("Called set_profile service with %s", call.data[ATTR_SETTINGS])
+        for device in devices:
+            self.reconciler.async_set_profile(device.dsn, call.data[ATTR_SETTINGS])
+
+    async def handle_clear_profile(self, call: ServiceCall) -> None:
+        """Handle clear_profile service."""
+        for device in call.data[ATTR_DEVICES]:
+            self.reconciler.async_clear_profile(device.dsn)
+
+    async def handle_snapshot(self, call: ServiceCall) -> None:
+        """Handle snapshot service."""
+        devices: set[Doppler] = call.data[ATTR_DEVICES]
+        coordinators = {
+            device: async_get_coordinator(self.hass, device.dsn) for device in devices
+        }
+        if devices_without_data := [
+            device
+            for device, coordinator in coordinators.items()
+            if not coordinator or not coordinator.data
+        ]:
+            raise HomeAssistantError(
+                f"No data to take a snapshot of for device(s) {devices_without_data}"
+            )
+        _LOGGER.debug("Called snapshot service for %s", call.data[ATTR_SNAPSHOT])
+        self.snapshots.async_save(
+            call.data[ATTR_SNAPSHOT],
+            {
+                device.dsn: async_get_setting_values(coordinator)
+                for device, coordinator in coordinators.items()
+            },
+            call.data[ATTR_PERSIST],
+        )
+
+    async def handle_restore(self, call: ServiceCall) -> ServiceResponse:
+        """Handle restore service."""
+        devices: set[Doppler] = call.data[ATTR_DEVICES]
+        name: str = call.data[ATTR_SNAPSHOT]
+        snapshots = {
+            device: self.snapshots.async_get(name, device.dsn) for device in devices
+        }
+        if devices_missing_snapshot := [
+            device for device, snapshot in snapshots.items() if snapshot is None
+        ]:
+            raise HomeAssistantError(
+                f"Snapshot {name} not found for device(s) {devices_missing_snapshot}"
+            )
+
+        # Only the settings that changed since the snapshot are written
+        changes = {
+            device: async_get_drift(coordinator, snapshot)
+            for device, snapshot in snapshots.items()
+            if (coordinator := async_get_coordinator(self.hass, device.dsn))
+        }
+        _LOGGER.debug("Called restore service for %s, writing %s", name, changes)
+
+        # Devices are restored in parallel, but each device's settings are written
+        # one at a time
+        result = await async_fan_out(
+            [device for device, values in changes.items() if values],
+            lambda device: async_write_settings(
+                async_get_coordinator(self.hass, device.dsn), changes[device]
+            ),
+            requests=lambda device: len(changes[device]),
+        )
+        result.raise_for_errors()
+
+        if not call.return_response:
+            return None
+        return {device.dsn: sorted(values) for device, values in changes.items()}
+
+    async def handle_force_write(self, call: ServiceCall) -> None:
+        """Handle force_write service."""
+        domain, service = call.data[ATTR_SERVICE].split(".", 1)
+        _LOGGER.debug("Called force_write service for %s", call.data[ATTR_SERVICE])
+        ent_reg = er.async_get(self.hass)
+        for entity_id in call.data[ATTR_SERVICE_DATA][ATTR_ENTITY_ID]:
+            entry = ent_reg.async_get(entity_id)
+            if not entry or entry.platform != DOMAIN or entry.domain != domain:
+                raise HomeAssistantError(
+                    f"{entity_id} is not a Doppler {domain} entity, so "
+                    f"{call.data[ATTR_SERVICE]} can't be forced for it"
+                )
+        # Writes made while handling the wrapped service call skip the check for
+        # values that are already set on the device
+        token = FORCE_WRITE.set(True)
+        try:
+            await self.hass.services.async_call(
+                domain,
+                service,
+                call.data[ATTR_SERVICE_DATA],
+                blocking=True,
+                context=call.context,
+            )
+        finally:
+            FORCE_WRITE.reset(token)
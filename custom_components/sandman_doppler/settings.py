@@ -0,0 +1,200 @@
+"""Writable settings of Sandman Doppler Clocks."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine, Iterable, Sequence
+from dataclasses import dataclass
+import functools
+from typing import TYPE_CHECKING, Any
+
+from doppyler.model.color import Color
+from doppyler.model.doppler import Doppler
+import voluptuous as vol
+
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import slugify
+
+from .helpers import get_enum_from_name, get_enum_options, normalize_enum_name
+
+if TYPE_CHECKING:
+    from . import DopplerDataUpdateCoordinator
+
+RGB_SCHEMA = vol.All(
+    [vol.All(vol.Coerce(int), vol.Range(0, 255))], vol.Length(3, 3), list
+)
+
+
+@dataclass(frozen=True)
+class DopplerSetting:
+    """Class to describe a setting that can be read from and written to a device.
+
+    Setting values are the plain values shown by the setting's entity, so they can
+    be used in service calls and stored as JSON.
+    """
+
+    key: str
+    state_key: str
+    validator: Callable[[Any], Any]
+    get_func: Callable[[Any], Any]
+    set_func: Callable[[Doppler, Any], Coroutine[Any, Any, Any]]
+
+
+async def _async_set_color(
+    set_color_func: Callable[[Doppler, Color], Coroutine[Any, Any, Any]],
+    device: Doppler,
+    rgb: list[int],
+) -> Color:
+    """Set a color and return it as the new data value."""
+    color = Color(*rgb)
+    await set_color_func(device, color)
+    return color
+
+
+def _validate_option(
+    options_func: Callable[[Doppler | None], Sequence[str]], val: str
+) -> str:
+    """Validate that a value is one of a select's options."""
+    if val not in options_func(None):
+        raise vol.Invalid(f"{val} is not a valid option")
+    return val
+
+
+@functools.cache
+def get_settings() -> dict[str, DopplerSetting]:
+    """Return the settings of the switch, number, select and light entities."""
+    # The platforms import the coordinator from the package, so they can only be
+    # imported once it's loaded
+    # pylint: disable=import-outside-toplevel
+    from .light import LIGHT_ENTITY_DESCRIPTIONS, SMART_BUTTON_LIGHT_ENTITY_DESCRIPTIONS
+    from .number import NUMBER_ENTITY_DESCRIPTIONS
+    from .select import ENUM_SELECT_ENTITY_DESCRIPTIONS, SELECT_ENTITY_DESCRIPTIONS
+    from .switch import ENTITY_DESCRIPTIONS as SWITCH_ENTITY_DESCRIPTIONS
+
+    settings = [
+        DopplerSetting(
+            slugify(ed.key),
+            ed.state_key,
+            cv.boolean,
+            ed.state_func,
+            ed.set_value_func
+            or functools.partial(
+                lambda name, dev, val: getattr(dev, name)(val), ed.set_value_func_name
+            ),
+        )
+        for ed in SWITCH_ENTITY_DESCRIPTIONS
+    ]
+    settings.extend(
+        DopplerSetting(
+            slugify(ed.key),
+            ed.state_key,
+            vol.All(
+                vol.Coerce(int), vol.Range(ed.native_min_value, ed.native_max_value)
+            ),
+            ed.state_func,
+            ed.set_value_func,
+        )
+        for ed in NUMBER_ENTITY_DESCRIPTIONS
+    )
+    settings.extend(
+        DopplerSetting(
+            slugify(ed.key),
+            ed.state_key,
+            vol.In(get_enum_options(ed.enum_cls)),
+            functools.partial(
+                lambda state_func, raw: normalize_enum_name(state_func(raw)),
+                ed.state_func,
+            ),
+            functools.partial(
+                lambda ed, dev, val: ed.set_value_func(
+                    dev, get_enum_from_name(ed.enum_cls, val)
+                ),
+                ed,
+            ),
+        )
+        for ed in ENUM_SELECT_ENTITY_DESCRIPTIONS
+    )
+    settings.extend(
+        DopplerSetting(
+            slugify(ed.key),
+            ed.state_key,
+            vol.All(cv.string, functools.partial(_validate_option, ed.options_func)),
+            ed.state_func,
+            ed.set_value_func,
+        )
+        for ed in SELECT_ENTITY_DESCRIPTIONS
+    )
+    for ed in (*LIGHT_ENTITY_DESCRIPTIONS, *SMART_BUTTON_LIGHT_ENTITY_DESCRIPTIONS):
+        settings.append(
+            DopplerSetting(
+                f"{slugify(ed.key)}_color",
+                ed.color_key,
+                RGB_SCHEMA,
+                lambda color: color.to_list(),
+                functools.partial(_async_set_color, ed.set_color_func),
+            )
+        )
+        if ed.brightness_key:
+            settings.append(
+                DopplerSetting(
+                    f"{slugify(ed.key)}_brightness",
+                    ed.brightness_key,
+                    vol.All(vol.Coerce(int), vol.Range(0, 100)),
+                    lambda brightness: brightness,
+                    ed.set_brightness_func,
+                )
+            )
+    return {setting.key: setting for setting in settings}
+
+
+def validate_settings(value: Any) -> dict[str, Any]:
+    """Validate a map of setting keys to values."""
+    settings = get_settings()
+    return vol.Schema(
+        {vol.Optional(key): setting.validator for key, setting in settings.items()}
+    )(value)
+
+
+@callback
+def async_get_setting_values(
+    coordinator: DopplerDataUpdateCoordinator, keys: Iterable[str] | None = None
+) -> dict[str, Any]:
+    """Return the current values of settings that the device has reported."""
+    settings = get_settings()
+    return {
+        key: settings[key].get_func(raw)
+        for key in (settings if keys is None else keys)
+        if (raw := coordinator.data.get(settings[key].state_key)) is not None
+    }
+
+
+@callback
+def async_get_drift(
+    coordinator: DopplerDataUpdateCoordinator, desired: dict[str, Any]
+) -> dict[str, Any]:
+    """Return the desired values of settings that differ from the device's."""
+    current = async_get_setting_values(coordinator, desired)
+    return {
+        key: val
+        for key, val in desired.items()
+        if key in current and current[key] != val
+    }
+
+
+async def async_write_settings(
+    coordinator: DopplerDataUpdateCoordinator, values: dict[str, Any]
+) -> None:
+    """Write settings to a device one at a time and update the coordinator data."""
+    settings = get_settings()
+    written: list[str] = []
+    try:
+        for key, val in values.items():
+            setting = settings[key]
+            coordinator.data[setting.state_key] = await setting.set_func(
+                coordinator.doppler, val
+            )
+            coordinator.writes_sent += 1
+            written.append(setting.state_key)
+    finally:
+        if written:
+            coordinator.async_update_keys(*written)
@@ -0,0 +1,78 @@
+"""Snapshots of the settings of Sandman Doppler Clocks."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+
+class DopplerSnapshots:
+    """Named snapshots of device settings, keyed by snapshot name and dsn.
+
+    Snapshots are kept in memory, and the ones taken with `persist` set are also
+    stored so they survive a restart.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize snapshots."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.snapshots"
+        )
+        self._snapshots: dict[str, dict[str, dict[str, Any]]] = {}
+        self._persisted: set[str] = set()
+
+    async def async_load(self) -> None:
+        """Load the stored snapshots."""
+        if stored := await self._store.async_load():
+            self._snapshots = stored.get("snapshots", {})
+            self._persisted = set(self._snapshots)
+
+    @callback
+    def async_save(
+        self, name: str, values: dict[str, dict[str, Any]], persist: bool
+    ) -> None:
+        """Save the setting values of devices by dsn under a snapshot name.
+
+        Devices that were in an earlier snapshot with the same name keep their
+        values unless they are in `values`.
+        """
+        self._snapshots.setdefault(name, {}).update(values)
+        if persist:
+            self._persisted.add(name)
+        elif name in self._persisted:
+            self._persisted.discard(name)
+        else:
+            return
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_get(self, name: str, dsn: str) -> dict[str, Any] | None:
+        """Return the setting values of a device in a snapshot."""
+        return self._snapshots.get(name, {}).get(dsn)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the snapshots to store."""
+        return {
+            "snapshots": {
+                name: snapshot
+                for name, snapshot in self._snapshots.items()
+                if name in self._persisted
+            }
+        }
+
+
+async def async_remove_snapshots(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshots for a config entry."""
+    await Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.snapshots"
+    ).async_remove()
@@ -0,0 +1,185 @@
+"""Persistent storage of last known device state for Sandman Doppler."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import time, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+import zoneinfo
+
+from doppyler.client import DopplerClient
+from doppyler.const import (
+    ATTR_ALARM_SOUNDS,
+    ATTR_ALARMS,
+    ATTR_DAY_BUTTON_COLOR,
+    ATTR_DAY_DISPLAY_COLOR,
+    ATTR_NIGHT_BUTTON_COLOR,
+    ATTR_NIGHT_DISPLAY_COLOR,
+    ATTR_SMART_BUTTON_COLOR,
+    ATTR_SOUND_PRESET,
+    ATTR_TIME_OFFSET,
+    ATTR_TIMEZONE,
+    ATTR_WEATHER,
+    ATTR_WEATHER_WAKE_UP_TIME,
+    ATTR_WIFI,
+)
+from doppyler.model.alarm import Alarm
+from doppyler.model.color import Color
+from doppyler.model.doppler import Doppler
+from doppyler.model.sound import SoundPreset
+from doppyler.model.weather import WeatherConfiguration
+from doppyler.model.wifi import WifiStatus
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LOCAL_API_SEMAPHORE_LIMIT
+
+if TYPE_CHECKING:
+    from . import DopplerDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+COLOR_CODEC = (lambda x: x.to_list(), Color.from_list)
+
+# Data keys whose values aren't JSON serializable mapped to (encode, decode) funcs
+DATA_CODECS: dict[str, tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    ATTR_WIFI: (lambda x: x.to_dict(), WifiStatus.from_dict),
+    ATTR_TIMEZONE: (lambda x: x.key, zoneinfo.ZoneInfo),
+    ATTR_TIME_OFFSET: (
+        lambda x: x.total_seconds(),
+        lambda x: timedelta(seconds=x),
+    ),
+    ATTR_SOUND_PRESET: (lambda x: x.value, SoundPreset),
+    ATTR_ALARMS: (
+        lambda x: [alarm.to_dict() for alarm in x.values()],
+        lambda x: {alarm.id: alarm for alarm in map(Alarm.from_dict, x)},
+    ),
+    ATTR_WEATHER: (lambda x: x.to_dict(), WeatherConfiguration.from_dict),
+    ATTR_WEATHER_WAKE_UP_TIME: (lambda x: x.isoformat(), time.fromisoformat),
+    ATTR_DAY_DISPLAY_COLOR: COLOR_CODEC,
+    ATTR_DAY_BUTTON_COLOR: COLOR_CODEC,
+    ATTR_NIGHT_DISPLAY_COLOR: COLOR_CODEC,
+    ATTR_NIGHT_BUTTON_COLOR: COLOR_CODEC,
+    **{f"{ATTR_SMART_BUTTON_COLOR}_{i}": COLOR_CODEC for i in range(1, 3)},
+}
+
+
+def encode_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Encode coordinator data so it can be serialized to JSON."""
+    return {
+        key: DATA_CODECS[key][0](val) if key in DATA_CODECS and val is not None else val
+        for key, val in data.items()
+    }
+
+
+def decode_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Decode coordinator data that was encoded with `encode_data`."""
+    return {
+        key: DATA_CODECS[key][1](val) if key in DATA_CODECS and val is not None else val
+        for key, val in data.items()
+    }
+
+
+def get_device_dicts(doppler: Doppler) -> dict[str, Any]:
+    """Get the dicts needed to recreate a Doppler without calling the cloud API."""
+    device_info = doppler.device_info
+    local_info = doppler.local_info
+    return {
+        "name": doppler.name,
+        "device_info": {
+            "serialNum": device_info.dsn,
+            "mfgrName": device_info.manufacturer,
+            "modelNum": device_info.model_number,
+            "firmware": device_info.firmware_version,
+            "hardware": device_info.hardware_version,
+            "software": device_info.software_version,
+        },
+        "local_info": {
+            "localkey": local_info.local_key,
+            "ipAddie": local_info.ip_address,
+            "port": local_info.port,
+        },
+    }
+
+
+class DopplerStore:
+    """Store the device list and last known data for a config entry."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, client: DopplerClient
+    ) -> None:
+        """Initialize store."""
+        self.hass = hass
+        self.entry = entry
+        self.client = client
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+        )
+        self._coordinators: dict[str, DopplerDataUpdateCoordinator] = {}
+
+    async def async_load(self) -> dict[str, tuple[Doppler, dict[str, Any]]]:
+        """Load cached Dopplers and their last known data."""
+        if not (stored := await self._store.async_load()):
+            return {}
+
+        devices: dict[str, tuple[Doppler, dict[str, Any]]] = {}
+        for dsn, device_dict in stored.get("devices", {}).items():
+            try:
+                doppler = Doppler(
+                    self.client,
+                    device_dict["name"],
+                    device_dict["device_info"],
+                    device_dict["local_info"],
+                    self.client.local_control,
+                    LOCAL_API_SEMAPHORE_LIMIT,
+                )
+                data = decode_data(device_dict["data"])
+            except (KeyError, TypeError, ValueError) as err:
+                _LOGGER.warning("Ignoring invalid cached data for %s: %s", dsn, err)
+                continue
+            # Keep the library's view of alarms and sounds in line with the cache
+            if alarms := data.get(ATTR_ALARMS):
+                doppler.alarms.update(alarms)
+                data[ATTR_ALARMS] = doppler.alarms
+            if sounds := data.get(ATTR_ALARM_SOUNDS):
+                doppler.alarm_sounds.extend(sounds)
+                data[ATTR_ALARM_SOUNDS] = doppler.alarm_sounds
+            devices[dsn] = (doppler, data)
+        return devices
+
+    @callback
+    def async_schedule_save(self, coordinator: DopplerDataUpdateCoordinator) -> None:
+        """Schedule saving the latest data for a device."""
+        self._coordinators[coordinator.doppler.dsn] = coordinator
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove_device(self, dsn: str) -> None:
+        """Remove a device from the stored data."""
+        if self._coordinators.pop(dsn, None):
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the latest data for all devices."""
+        return {
+            "devices": {
+                dsn: {
+                    **get_device_dicts(coordinator.doppler),
+                    "data": encode_data(coordinator.data),
+                }
+                for dsn, coordinator in self._coordinators.items()
+                if coordinator.data
+            }
+        }
+
+
+async def async_remove_store(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data for a config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
@@ -0,0 +1,180 @@
+"""Mini display streaming for Sandman Doppler Clocks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import timedelta
+import functools
+import logging
+
+from doppyler.exceptions import DopplerException
+from doppyler.model.color import Color
+from doppyler.model.doppler import Doppler
+from doppyler.model.mini_display_number import MiniDisplayNumber
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+
+from .scheduler import REQUEST_PRIORITY, RequestPriority
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds before the displayed number times out to write it again
+KEEP_ALIVE_MARGIN = 1
+# Seconds to wait before trying a failed write again
+RETRY_INTERVAL = 5
+
+
+class DopplerMiniDisplayStream:
+    """Keep a Doppler's mini display in line with the state of a source entity.
+
+    Only the latest value is written, at most one write is in flight, writes are at
+    least `min_interval` apart, and changes smaller than `threshold` are ignored.
+    The number is written again before it times out on the display so it stays
+    up for as long as the stream runs, and a failed write is tried again until it
+    succeeds or a newer value replaces it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        doppler: Doppler,
+        source_entity_id: str,
+        duration: timedelta,
+        color: Color,
+        threshold: float,
+        min_interval: timedelta,
+    ) -> None:
+        """Initialize mini display stream."""
+        self.hass = hass
+        self.doppler = doppler
+        self.source_entity_id = source_entity_id
+        self.duration = duration
+        self.color = color
+        self.threshold = threshold
+        self.min_interval = min_interval
+        self._pending: int | None = None
+        self._last_written: int | None = None
+        self._last_write_at: float | None = None
+        self._task: asyncio.Task | None = None
+        self._unsub_state: Callable[[], None] | None = None
+        self._unsub_timer: Callable[[], None] | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start streaming the source entity's state to the mini display."""
+        self._unsub_state = async_track_state_change_event(
+            self.hass, [self.source_entity_id], self._async_handle_state_change
+        )
+        if state := self.hass.states.get(self.source_entity_id):
+            self._async_handle_value(state.state)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop streaming."""
+        if self._unsub_state:
+            self._unsub_state()
+            self._unsub_state = None
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._task:
+            self._task.cancel()
+
+    @callback
+    def _async_handle_state_change(self, event: Event) -> None:
+        """Handle a state change of the source entity."""
+        if new_state := event.data["new_state"]:
+            self._async_handle_value(new_state.state)
+
+    @callback
+    def _async_handle_value(self, state: str) -> None:
+        """Queue a write if the new value is different enough from the last one."""
+        if state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+        try:
+            value = round(float(state))
+        except ValueError:
+            _LOGGER.debug(
+                "Ignoring non-numeric state of %s: %s", self.source_entity_id, state
+            )
+            return
+        if self._last_written is not None and (
+            value == self._last_written
+            or abs(value - self._last_written) < self.threshold
+        ):
+            # Anything still queued is outdated by this value
+            self._pending = None
+            return
+        self._async_request_write(value)
+
+    @callback
+    def _async_request_write(self, value: int) -> None:
+        """Queue a value to be written."""
+        self._pending = value
+        if not self._task:
+            self._task = self.hass.async_create_task(self._async_write_pending())
+
+    @callback
+    def _async_write_again(self, value: int, _now: object) -> None:
+        """Write a number again unless a newer one is already queued."""
+        self._unsub_timer = None
+        if self._pending is None:
+            self._async_request_write(value)
+
+    async def _async_write_pending(self) -> None:
+        """Write the latest value until there are no more values to write."""
+        # The stream runs in the background, so don't hold up anything else
+        REQUEST_PRIORITY.set(RequestPriority.POLL)
+        try:
+            while self._pending is not None:
+                if (
+                    self._last_write_at is not None
+                    and (
+                        wait := self._last_write_at
+                        + self.min_interval.total_seconds()
+                        - self.hass.loop.time()
+                    )
+                    > 0
+                ):
+                    await asyncio.sleep(wait)
+                    if self._pending is None:
+                        break
+                value, self._pending = self._pending, None
+                self._last_write_at = self.hass.loop.time()
+                try:
+                    await self.doppler.set_mini_display_number(
+                        MiniDisplayNumber(value, self.duration, self.color)
+                    )
+                except DopplerException as err:
+                    _LOGGER.warning(
+                        "Error streaming %s to %s: %s", value, self.doppler, err
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Unexpected error streaming %s to %s", value, self.doppler
+                    )
+                else:
+                    self._last_written = value
+                    # Keep the number up before it times out on the display
+                    self._async_schedule_write_again(
+                        value, self.duration.total_seconds() - KEEP_ALIVE_MARGIN
+                    )
+                    continue
+                if self._pending is None:
+                    self._async_schedule_write_again(value, RETRY_INTERVAL)
+        finally:
+            self._task = None
+
+    @callback
+    def _async_schedule_write_again(self, value: int, delay: float) -> None:
+        """Schedule writing a number again, replacing any scheduled write."""
+        if self._unsub_timer:
+            self._unsub_timer()
+        self._unsub_timer = async_call_later(
+            self.hass,
+            max(delay, self.min_interval.total_seconds()),
+            functools.partial(self._async_write_again, value),
+        )
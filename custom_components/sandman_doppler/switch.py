@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Coroutine, Mapping
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, replace
 import functools
 import logging
 from typing import Any
 
 from doppyler.const import (
+    ATTR_ALARMS,
     ATTR_ALEXA_TAP_TO_TALK_TONE_ENABLED,
     ATTR_ALEXA_USE_ASCENDING_ALARMS,
     ATTR_ALEXA_WAKE_WORD_TONE_ENABLED,
@@ -206,22 +207,26 @@ class DopplerSwitch(DopplerEntity[DopplerSwitchEntityDescription], SwitchEntity)
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the switch on."""
-        if self.ed.set_value_func:
-            new_val = await self.ed.set_value_func(self.device, True)
-        else:
-            new_val = await getattr(self.device, self.ed.set_value_func_name)(True)
-
-        self.device_data[self.ed.state_key] = new_val
-        self.async_write_ha_state()
+        await self._async_set_value(True)
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the switch off."""
+        await self._async_set_value(False)
+
+    async def _async_set_value(self, value: bool) -> None:
+        """Set the switch value on the device."""
+        if not self.coordinator.async_should_write(
+            self.ed.state_key, self.is_on is value
+        ):
+            return
+
         if self.ed.set_value_func:
-            new_val = await self.ed.set_value_func(self.device, False)
+            new_val = await self.ed.set_value_func(self.device, value)
         else:
-            new_val = await getattr(self.device, self.ed.set_value_func_name)(False)
+            new_val = await getattr(self.device, self.ed.set_value_func_name)(value)
 
         self.device_data[self.ed.state_key] = new_val
+        self.coordinator.async_record_write(self.ed.state_key)
         self.async_write_ha_state()
 
 
@@ -265,9 +270,16 @@ class DopplerAlarmSwitch(CoordinatorEntity[DopplerDataUpdateCoordinator], Switch
 
     async def _async_update_alarm_status(self, status: str) -> None:
         """Update the alarm status."""
+        alarms = await self.device.update_alarm(
+            self.alarm.id, replace(self.alarm, status=status)
+        )
+        # The indexed alarm is this entity's alarm, so it's updated in place
+        if self.coordinator.alarm_index.async_process_response(self.device.dsn, alarms):
+            self.coordinator.async_update_keys(ATTR_ALARMS)
+            return
         self.alarm.status = status
-        await self.device.update_alarm(self.alarm.id, self.alarm)
         self.async_write_ha_state()
+        await self.coordinator.async_refresh_keys(ATTR_ALARMS)
 
     async_turn_on = functools.partialmethod(_async_update_alarm_status, "set")
     async_turn_off = functools.partialmethod(_async_update_alarm_status, "unarmed")
@@ -0,0 +1,209 @@
+"""Common helpers for sandman_doppler tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import time
+from typing import Any
+from unittest.mock import MagicMock
+
+from doppyler.model.alarm import Alarm, AlarmSource, RepeatDayOfWeek
+from doppyler.model.color import Color
+from doppyler.model.doppler import Doppler
+import orjson
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.setup import async_setup_component
+
+from custom_components.sandman_doppler import DopplerDataUpdateCoordinator
+from custom_components.sandman_doppler.alarms import DopplerAlarmIndex
+from custom_components.sandman_doppler.const import CONF_WEBHOOK_TOKEN, DOMAIN
+from custom_components.sandman_doppler.scheduler import DopplerRequestScheduler
+from custom_components.sandman_doppler.services import DopplerServices
+from custom_components.sandman_doppler.storage import get_device_dicts
+
+# Seconds the fake cloud takes to list the devices on the account
+CLOUD_LATENCY = 0.2
+
+# Called with the endpoint, method and data of a request and returns the response
+Responder = Callable[[str, str, dict | None], Any]
+
+
+def create_doppler(
+    dsn: str = "DSN1",
+    responder: Responder | None = None,
+    latency: float = 0,
+) -> Doppler:
+    """Create a Doppler whose local API calls are answered by `responder`.
+
+    Every call is recorded in `doppler.calls` as a (method, endpoint, data) tuple.
+    """
+    doppler = Doppler(
+        MagicMock(),
+        f"Clock {dsn}",
+        {
+            "serialNum": dsn,
+            "mfgrName": "Sandman",
+            "modelNum": "Doppler",
+            "firmware": "1.0",
+            "hardware": "1.0",
+            "software": "1.0",
+        },
+        {"localkey": "key", "ipAddie": "127.0.0.1", "port": 80},
+        True,
+        1,
+    )
+    doppler.calls = []
+
+    async def _call_api(
+        endpoint: str, method: str = "GET", data: dict | None = None
+    ) -> Any:
+        doppler.calls.append((method, endpoint, data))
+        await asyncio.sleep(latency)
+        return responder(endpoint, method, data) if responder else {}
+
+    doppler._call_api = _call_api  # pylint: disable=protected-access
+    return doppler
+
+
+def create_alarm(repeat: list[RepeatDayOfWeek], alarm_id: int = 1) -> Alarm:
+    """Create an alarm that repeats on the given days."""
+    return Alarm(
+        id=alarm_id,
+        name="Wake up",
+        time=time(7, 0),
+        repeat=repeat,
+        color=Color(255, 255, 255),
+        volume=50,
+        status="set",
+        src=AlarmSource.APP,
+        sound="birds",
+    )
+
+
+def create_entry(hass: HomeAssistant, **options: Any) -> MockConfigEntry:
+    """Create a config entry and add it to hass."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "email": "test@example.com",
+            "password": "password",
+            CONF_WEBHOOK_TOKEN: "webhook_token",
+        },
+        options=options,
+        unique_id="test@example.com",
+    )
+    entry.add_to_hass(hass)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {}
+    return entry
+
+
+def create_coordinator(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    doppler: Doppler,
+    scheduler: DopplerRequestScheduler | None = None,
+) -> DopplerDataUpdateCoordinator:
+    """Create a coordinator for a Doppler without a client or store."""
+    hass.config.internal_url = "http://127.0.0.1:8123"
+    coordinator = DopplerDataUpdateCoordinator(
+        hass,
+        entry,
+        MagicMock(),
+        scheduler or DopplerRequestScheduler(4),
+        MagicMock(),
+        DopplerAlarmIndex(hass),
+        doppler,
+        MagicMock(id="device_id"),
+    )
+    hass.data[DOMAIN][entry.entry_id][doppler.dsn] = coordinator
+    return coordinator
+
+
+def create_services(hass: HomeAssistant, **kwargs: Any) -> DopplerServices:
+    """Create services whose dependencies are mocks unless given."""
+    return DopplerServices(
+        hass,
+        er.async_get(hass),
+        dr.async_get(hass),
+        kwargs.get("client", MagicMock()),
+        kwargs.get("alarm_index", MagicMock()),
+        kwargs.get("reconciler", MagicMock()),
+        kwargs.get("snapshots", MagicMock()),
+    )
+
+
+class WebhookRequest:
+    """Request from a clock to the webhook view that is cheap to create."""
+
+    def __init__(self, hass: HomeAssistant, body: dict[str, Any]) -> None:
+        """Initialize request."""
+        self.app = {"hass": hass}
+        self._body = orjson.dumps(body)
+
+    async def read(self) -> bytes:
+        """Return the body."""
+        return self._body
+
+
+class FakeDopplerClient:
+    """Doppler client whose account has a single clock, DSN1."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize client."""
+        self.devices: dict[str, Doppler] = {}
+        self.local_control = True
+        self._added: list[Callable[[Doppler], None]] = []
+
+    def on_device_added(self, listener: Callable[[Doppler], None]) -> Callable:
+        """Register a device added listener."""
+        self._added.append(listener)
+        return lambda: self._added.remove(listener)
+
+    def on_device_removed(self, listener: Callable[[Doppler], None]) -> Callable:
+        """Register a device removed listener."""
+        return lambda: None
+
+    async def get_token(self) -> None:
+        """Get a token."""
+
+    async def get_devices(self) -> dict[str, Doppler]:
+        """List the devices after a delay, adding the ones we don't know yet."""
+        await asyncio.sleep(CLOUD_LATENCY)
+        if "DSN1" not in self.devices:
+            doppler = self.devices["DSN1"] = create_doppler("DSN1")
+            for listener in self._added:
+                listener(doppler)
+        return self.devices
+
+
+async def async_setup_integration(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    data: dict[str, Any] | None = None,
+) -> MockConfigEntry:
+    """Set up the integration without waiting for it to finish starting.
+
+    When `data` is given, it is stored as the last known data of DSN1 so the
+    entities are created right away.
+    """
+    hass.config.internal_url = "http://127.0.0.1:8123"
+    hass.http = MagicMock()
+    assert await async_setup_component(hass, DOMAIN, {})
+    entry = create_entry(hass)
+    hass.data[DOMAIN].pop(entry.entry_id)
+    if data is not None:
+        hass_storage[f"{DOMAIN}.{entry.entry_id}"] = {
+            "version": 1,
+            "key": f"{DOMAIN}.{entry.entry_id}",
+            "data": {
+                "devices": {
+                    "DSN1": {**get_device_dicts(create_doppler("DSN1")), "data": data}
+                }
+            },
+        }
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    return entry
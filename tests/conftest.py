@@ -1,12 +1,37 @@
 """Global fixtures for sandman_doppler integration."""
 
-from unittest.mock import patch
+from collections.abc import Generator
+from unittest.mock import AsyncMock, patch
 
+from doppyler.const import ATTR_VOLUME_LEVEL
+from doppyler.model.doppler import Doppler
 import pytest
 
+from .common import FakeDopplerClient
+
 pytest_plugins = "pytest_homeassistant_custom_component"
 
 
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations):
     yield
+
+
+@pytest.fixture
+def mock_client() -> Generator[None, None, None]:
+    """Replace the cloud client with one that lists a single clock."""
+    with patch(
+        "custom_components.sandman_doppler.DopplerClient", FakeDopplerClient
+    ), patch.object(Doppler, "set_smart_button_configuration", AsyncMock()):
+        yield
+
+
+@pytest.fixture
+def mock_tier_data() -> Generator[AsyncMock, None, None]:
+    """Answer every poll with the mock's return value."""
+    with patch(
+        "custom_components.sandman_doppler.DopplerDataUpdateCoordinator."
+        "_async_get_tier_data",
+        AsyncMock(return_value={ATTR_VOLUME_LEVEL: 10}),
+    ) as mock:
+        yield mock
@@ -0,0 +1,103 @@
+"""Tests for the sandman_doppler alarm index."""
+
+import dataclasses
+from typing import Any
+
+from doppyler.model.alarm import RepeatDayOfWeek
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.sandman_doppler.alarms import (
+    ALARM_CACHE_MAX_AGE,
+    DopplerAlarmIndex,
+    plan_alarm_sync,
+)
+
+from .common import create_alarm, create_doppler
+
+
+def test_sync_ignores_repeat_order() -> None:
+    """Test that syncing alarms again plans no writes when only the order differs."""
+    desired = create_alarm([RepeatDayOfWeek.FRIDAY, RepeatDayOfWeek.MONDAY])
+    current = create_alarm([RepeatDayOfWeek.MONDAY, RepeatDayOfWeek.FRIDAY])
+    assert not plan_alarm_sync({1: current}, {1: desired})
+
+    desired.repeat.append(RepeatDayOfWeek.SUNDAY)
+    assert plan_alarm_sync({1: current}, {1: desired}).update == [desired]
+
+
+async def test_is_fresh_keeps_counters(hass: HomeAssistant) -> None:
+    """Test that checking whether alarms are fresh doesn't count as a lookup."""
+    alarm_index = DopplerAlarmIndex(hass)
+    alarm_index.async_confirm("DSN1")
+    assert alarm_index.async_is_fresh("DSN1")
+    assert not alarm_index.async_is_fresh("DSN2")
+    assert (alarm_index.hits, alarm_index.misses) == (0, 0)
+
+    alarm_index.async_record_lookup(True)
+    alarm_index.async_record_lookup(False)
+    assert (alarm_index.hits, alarm_index.misses) == (1, 1)
+
+
+async def test_tracks_device_alarms(hass: HomeAssistant) -> None:
+    """Test that the index follows the alarms the library reads from a device."""
+    alarms = [create_alarm([], 1), create_alarm([], 2)]
+
+    def _respond(endpoint: str, method: str, data: dict | None) -> Any:
+        return {"alarms": [alarm.to_dict() for alarm in alarms]}
+
+    doppler = create_doppler("DSN1", _respond)
+    other = create_doppler("DSN2")
+    alarm_index = DopplerAlarmIndex(hass)
+    untrack = alarm_index.async_track(doppler)
+    untrack_other = alarm_index.async_track(other)
+    await doppler.get_all_alarms()
+    assert alarm_index.async_get_device_alarms("DSN1") == doppler.alarms
+    assert alarm_index.async_get("DSN1", 2) is doppler.alarms[2]
+    assert not alarm_index.async_get_device_alarms("DSN2")
+
+    del alarms[0]
+    await doppler.get_all_alarms()
+    assert list(alarm_index.async_get_device_alarms("DSN1")) == [2]
+    assert alarm_index.async_get("DSN1", 1) is None
+
+    untrack()
+    assert not alarm_index.async_get_device_alarms("DSN1")
+    untrack_other()
+
+
+async def test_process_response(hass: HomeAssistant) -> None:
+    """Test that a write response updates the index unless alarms came or went."""
+    doppler = create_doppler()
+    alarm = doppler.alarms[1] = create_alarm([])
+    alarm_index = DopplerAlarmIndex(hass)
+    untrack = alarm_index.async_track(doppler)
+
+    updated = dataclasses.replace(alarm, name="Get up")
+    assert alarm_index.async_process_response("DSN1", [updated])
+    # The library's alarm is updated in place, so its switch shows the new name
+    assert alarm.name == "Get up"
+    assert alarm_index.async_is_fresh("DSN1")
+
+    added = create_alarm([], 2)
+    assert not alarm_index.async_process_response("DSN1", [updated, added])
+    assert not alarm_index.async_is_fresh("DSN1")
+    assert alarm_index.async_get("DSN1", 2) is None
+    untrack()
+
+
+async def test_expiry(hass: HomeAssistant) -> None:
+    """Test that alarms are fresh until they are too old or expired."""
+    alarm_index = DopplerAlarmIndex(hass)
+    alarm_index.async_confirm("DSN1")
+    alarm_index.async_confirm("DSN2")
+    assert alarm_index.async_is_fresh("DSN1")
+
+    # pylint: disable-next=protected-access
+    alarm_index._synced_at["DSN1"] -= ALARM_CACHE_MAX_AGE.total_seconds()
+    assert not alarm_index.async_is_fresh("DSN1")
+
+    alarm_index.async_expire("DSN2")
+    assert not alarm_index.async_is_fresh("DSN2")
+    alarm_index.async_confirm("DSN2")
+    assert alarm_index.async_is_fresh("DSN2")
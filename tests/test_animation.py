@@ -0,0 +1,98 @@
+"""Tests for the sandman_doppler light bar animations."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aiohttp import ClientConnectionError
+from doppyler.const import ATTR_COLORS, ATTR_DEVICES, ATTR_DURATION
+from doppyler.exceptions import DopplerException
+from doppyler.model.color import Color
+from doppyler.model.doppler import Doppler
+import pytest
+
+from homeassistant.const import ATTR_TIME
+from homeassistant.core import HomeAssistant
+
+from custom_components.sandman_doppler import animation
+from custom_components.sandman_doppler.animation import (
+    MAX_CONSECUTIVE_FAILURES,
+    DopplerLightBarAnimation,
+)
+from custom_components.sandman_doppler.const import ATTR_FPS, ATTR_KEYFRAMES, ATTR_LOOP
+
+from .common import create_doppler, create_services
+
+# Frames per second of the test animations
+FPS = 100
+
+
+def _create_animation(hass: HomeAssistant) -> DopplerLightBarAnimation:
+    """Create an animation that shows the same frame forever."""
+    return DopplerLightBarAnimation(
+        hass, create_doppler(), lambda elapsed: [Color(255, 0, 0)], FPS
+    )
+
+
+@pytest.mark.parametrize(
+    "error", [DopplerException("Timed out"), ClientConnectionError("Refused")]
+)
+async def test_stops_after_consecutive_failures(
+    hass: HomeAssistant, error: Exception
+) -> None:
+    """Test that failed frames back off and eventually stop the animation."""
+    light_bar_animation = _create_animation(hass)
+    with patch.object(animation, "MAX_FAILURE_BACKOFF", 0.05), patch.object(
+        Doppler, "set_light_bar_effect", AsyncMock(side_effect=error)
+    ) as set_light_bar_effect:
+        light_bar_animation.async_start()
+        # pylint: disable-next=protected-access
+        await light_bar_animation._task
+
+    assert set_light_bar_effect.call_count == MAX_CONSECUTIVE_FAILURES
+    # Every failure but the last backs off for at least one slot
+    assert light_bar_animation.frames_dropped >= MAX_CONSECUTIVE_FAILURES - 1
+    assert light_bar_animation._task is None  # pylint: disable=protected-access
+
+
+async def test_unexpected_error_logged(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that an unexpected error is logged and ends the animation."""
+    light_bar_animation = _create_animation(hass)
+    with patch.object(
+        Doppler, "set_light_bar_effect", AsyncMock(side_effect=ValueError)
+    ):
+        light_bar_animation.async_start()
+        # pylint: disable-next=protected-access
+        await light_bar_animation._task
+
+    assert "Unexpected error animating" in caplog.text
+    assert light_bar_animation._task is None  # pylint: disable=protected-access
+
+
+async def test_ended_animation_forgotten(hass: HomeAssistant) -> None:
+    """Test that services forget animations that ended but not their replacements."""
+    services = create_services(hass)
+    call = MagicMock(
+        data={
+            ATTR_DEVICES: {create_doppler()},
+            ATTR_KEYFRAMES: [{ATTR_TIME: 0, ATTR_COLORS: [Color(255, 0, 0)]}],
+            ATTR_LOOP: False,
+            ATTR_FPS: FPS,
+            ATTR_DURATION: timedelta(seconds=0.05),
+        }
+    )
+    # pylint: disable=protected-access
+    with patch.object(Doppler, "set_light_bar_effect", AsyncMock()):
+        await services.handle_start_light_bar_animation(call)
+        replaced = services._animations["DSN1"]
+        await services.handle_start_light_bar_animation(call)
+        light_bar_animation = services._animations["DSN1"]
+        # Let the replaced animation end
+        await asyncio.sleep(0)
+        assert replaced._task is None
+        assert services._animations["DSN1"] is light_bar_animation
+
+        await light_bar_animation._task
+    assert not services._animations
@@ -0,0 +1,84 @@
+"""Tests for the sandman_doppler write coalescer."""
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.sandman_doppler.coalescer import (
+    WRITE_DEBOUNCE,
+    DopplerWriteCoalescer,
+)
+from custom_components.sandman_doppler.helpers import FORCE_WRITE
+
+# Seconds a write takes on the fake clock
+WRITE_LATENCY = 0.1
+
+
+async def test_burst_writes_latest_value_once(hass: HomeAssistant) -> None:
+    """Test that a slider drag of N calls results in a single write."""
+    writes: list[int] = []
+
+    async def _async_write(value: int, force: bool) -> None:
+        await asyncio.sleep(WRITE_LATENCY)
+        writes.append(value)
+
+    coalescer = DopplerWriteCoalescer(hass, _async_write)
+    calls = []
+    # Longer than the debounce window, but never a pause as long as it
+    for value in range(20):
+        calls.append(hass.async_create_task(coalescer.async_write(value)))
+        await asyncio.sleep(WRITE_DEBOUNCE / 5)
+    await asyncio.gather(*calls)
+    assert writes == [19]
+
+
+async def test_values_during_write_coalesce(hass: HomeAssistant) -> None:
+    """Test that values requested during a write result in one more write."""
+    writes: list[int] = []
+    write_started = asyncio.Event()
+
+    async def _async_write(value: int, force: bool) -> None:
+        write_started.set()
+        await asyncio.sleep(WRITE_LATENCY)
+        writes.append(value)
+
+    coalescer = DopplerWriteCoalescer(hass, _async_write)
+    calls = [hass.async_create_task(coalescer.async_write(0))]
+    await write_started.wait()
+    for value in range(1, 20):
+        calls.append(hass.async_create_task(coalescer.async_write(value)))
+    await asyncio.gather(*calls)
+    assert writes == [0, 19]
+
+
+async def test_write_error_reaches_callers(hass: HomeAssistant) -> None:
+    """Test that every caller of a failed write gets its error."""
+
+    async def _async_write(value: int, force: bool) -> None:
+        raise ValueError(value)
+
+    coalescer = DopplerWriteCoalescer(hass, _async_write)
+    results = await asyncio.gather(
+        coalescer.async_write(1), coalescer.async_write(2), return_exceptions=True
+    )
+    assert [str(result) for result in results] == ["2", "2"]
+
+
+async def test_forced_call_forces_shared_write(hass: HomeAssistant) -> None:
+    """Test that a forced call joining a write started without force forces it."""
+    writes: list[tuple[int, bool]] = []
+
+    async def _async_write(value: int, force: bool) -> None:
+        writes.append((value, force))
+
+    async def _async_forced_write(value: int) -> None:
+        FORCE_WRITE.set(True)
+        await coalescer.async_write(value)
+
+    coalescer = DopplerWriteCoalescer(hass, _async_write)
+    await asyncio.gather(
+        hass.async_create_task(coalescer.async_write(1)),
+        hass.async_create_task(_async_forced_write(2)),
+    )
+    await coalescer.async_write(3)
+    assert writes == [(2, True), (3, False)]
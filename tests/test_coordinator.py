@@ -0,0 +1,168 @@
+"""Tests for the sandman_doppler data update coordinator."""
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from aiohttp import ClientConnectionError
+from doppyler.const import (
+    ATTR_IS_IN_DAY_MODE,
+    ATTR_LIGHT_SENSOR_VALUE,
+    ATTR_VOLUME_LEVEL,
+)
+from doppyler.exceptions import DopplerException
+import pytest
+
+from homeassistant.core import HomeAssistant, callback
+
+from custom_components.sandman_doppler import SCAN_INTERVAL
+from custom_components.sandman_doppler.breaker import FAILURE_THRESHOLD, BreakerState
+from custom_components.sandman_doppler.const import CONF_ADAPTIVE_POLLING
+from custom_components.sandman_doppler.polling import POLL_TIERS, DopplerPollTier
+from custom_components.sandman_doppler.scheduler import (
+    REQUEST_PRIORITY,
+    DopplerRequestScheduler,
+    RequestPriority,
+)
+
+from .common import create_coordinator, create_doppler, create_entry
+
+
+async def test_adaptive_polling_ignores_volatile_keys(hass: HomeAssistant) -> None:
+    """Test that the poll interval backs off while only the light sensor changes."""
+    entry = create_entry(hass, **{CONF_ADAPTIVE_POLLING: True})
+    coordinator = create_coordinator(hass, entry, create_doppler())
+    data = {ATTR_VOLUME_LEVEL: 10, ATTR_LIGHT_SENSOR_VALUE: 0.0}
+    with patch.object(
+        coordinator, "_async_get_tier_data", AsyncMock(return_value=data)
+    ), patch.object(coordinator.doppler, "set_smart_button_configuration", AsyncMock()):
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == SCAN_INTERVAL
+
+        for light in (0.5, 0.7):
+            data[ATTR_LIGHT_SENSOR_VALUE] = light
+            await coordinator.async_refresh()
+        assert coordinator.update_interval == SCAN_INTERVAL * 4
+
+        data[ATTR_VOLUME_LEVEL] = 20
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == SCAN_INTERVAL
+    await coordinator.async_shutdown()
+
+
+async def test_background_writes_keep_backoff(hass: HomeAssistant) -> None:
+    """Test that only commands reset the poll interval, not background writes."""
+    entry = create_entry(hass, **{CONF_ADAPTIVE_POLLING: True})
+    scheduler = DopplerRequestScheduler(4)
+    doppler = create_doppler()
+    coordinator = create_coordinator(hass, entry, doppler, scheduler)
+    coordinator.update_interval = timedelta(minutes=8)
+
+    async def _async_background_write() -> None:
+        REQUEST_PRIORITY.set(RequestPriority.POLL)
+        await doppler._call_api("mini-display", "POST", {})
+
+    await hass.async_create_task(_async_background_write())
+    assert coordinator.update_interval == timedelta(minutes=8)
+
+    await doppler._call_api("volume", "POST", {})
+    assert coordinator.update_interval == SCAN_INTERVAL
+    await coordinator.async_shutdown()
+
+
+def _get_tier_data(tiers: list[DopplerPollTier], data: dict[str, Any]) -> dict:
+    """Return the data of the given tiers, taking values from `data`."""
+    return {key: data.get(key, 0) for tier in tiers for key in tier.keys}
+
+
+async def test_tiers_polled_on_own_intervals(hass: HomeAssistant) -> None:
+    """Test that each refresh only polls the tiers that are due."""
+    coordinator = create_coordinator(hass, create_entry(hass), create_doppler())
+    polled: list[list[str]] = []
+
+    async def _async_get_tier_data(tiers: list[DopplerPollTier]) -> dict[str, Any]:
+        polled.append([tier.name for tier in tiers])
+        return _get_tier_data(tiers, {})
+
+    with patch.object(
+        coordinator, "_async_get_tier_data", _async_get_tier_data
+    ), patch.object(coordinator.doppler, "set_smart_button_configuration", AsyncMock()):
+        for elapsed in (timedelta(0), *(tier.update_interval for tier in POLL_TIERS)):
+            # Let time pass by moving every tier's next refresh closer
+            # pylint: disable-next=protected-access
+            for name, next_refresh in coordinator._tier_next_refresh.items():
+                coordinator._tier_next_refresh[name] = (
+                    next_refresh - elapsed.total_seconds()
+                )
+            await coordinator.async_refresh()
+    await coordinator.async_shutdown()
+
+    assert polled == [
+        ["fast", "medium", "slow"],
+        ["fast"],
+        ["fast", "medium"],
+        ["fast", "medium", "slow"],
+    ]
+
+
+async def test_listeners_only_updated_for_changed_keys(hass: HomeAssistant) -> None:
+    """Test that a listener is only updated when one of its context keys changed."""
+    coordinator = create_coordinator(hass, create_entry(hass), create_doppler())
+    # Both keys are in the fast tier, so they are polled on every refresh
+    data = {ATTR_IS_IN_DAY_MODE: True, ATTR_LIGHT_SENSOR_VALUE: 0.0}
+    updates: dict[str, int] = {"day_mode": 0, "light": 0, "no_context": 0}
+
+    def _add_listener(name: str, context: frozenset[str] | None) -> None:
+        @callback
+        def _async_update() -> None:
+            updates[name] += 1
+
+        coordinator.async_add_listener(_async_update, context)
+
+    _add_listener("day_mode", frozenset({ATTR_IS_IN_DAY_MODE}))
+    _add_listener("light", frozenset({ATTR_LIGHT_SENSOR_VALUE}))
+    _add_listener("no_context", None)
+
+    with patch.object(
+        coordinator,
+        "_async_get_tier_data",
+        AsyncMock(side_effect=lambda tiers: _get_tier_data(tiers, data)),
+    ), patch.object(coordinator.doppler, "set_smart_button_configuration", AsyncMock()):
+        await coordinator.async_refresh()
+        assert updates == {"day_mode": 1, "light": 1, "no_context": 1}
+
+        data[ATTR_LIGHT_SENSOR_VALUE] = 0.5
+        # Make every tier due again
+        coordinator._tier_next_refresh.clear()  # pylint: disable=protected-access
+        await coordinator.async_refresh()
+        assert updates == {"day_mode": 1, "light": 2, "no_context": 2}
+
+        coordinator._tier_next_refresh.clear()  # pylint: disable=protected-access
+        await coordinator.async_refresh()
+        assert updates == {"day_mode": 1, "light": 2, "no_context": 3}
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        DopplerException("Timed out"),
+        ClientConnectionError("Connection refused"),
+        TimeoutError(),
+    ],
+)
+async def test_request_errors_open_breaker(
+    hass: HomeAssistant, error: Exception
+) -> None:
+    """Test that every way a request can fail counts towards opening the breaker."""
+    coordinator = create_coordinator(hass, create_entry(hass), create_doppler())
+    with patch.object(
+        coordinator, "_async_get_tier_data", AsyncMock(side_effect=error)
+    ):
+        for _ in range(FAILURE_THRESHOLD):
+            await coordinator.async_refresh()
+            assert not coordinator.last_update_success
+            # The entities haven't been created yet, so the refresh is retried
+            assert coordinator._unsub_retry  # pylint: disable=protected-access
+    assert coordinator.breaker.state == BreakerState.OPEN
+    await coordinator.async_shutdown()
@@ -0,0 +1,135 @@
+"""Tests for the sandman_doppler device triggers."""
+
+import asyncio
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+import voluptuous as vol
+
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.sandman_doppler import device_trigger, presses
+from custom_components.sandman_doppler.const import (
+    ATTR_BUTTON,
+    CONF_SUBTYPE,
+    CONF_WEBHOOK_TOKEN,
+    DOMAIN,
+    EVENT_BUTTON_PRESSED,
+)
+from custom_components.sandman_doppler.http import DopplerWebhookView
+
+from .common import WebhookRequest, create_entry
+
+# Presses timed for each number of triggers
+PRESSES = 2000
+
+
+async def test_benchmark_press_dispatch(hass: HomeAssistant) -> None:
+    """Benchmark the cost of a press against the number of attached triggers."""
+    entry = create_entry(hass)
+    device_id = (
+        dr.async_get(hass)
+        .async_get_or_create(
+            config_entry_id=entry.entry_id, identifiers={(DOMAIN, "DSN0")}
+        )
+        .id
+    )
+    view = DopplerWebhookView()
+    token = entry.data[CONF_WEBHOOK_TOKEN]
+    request = WebhookRequest(hass, {"dsn": "DSN0", "button": 1})
+    runs = []
+
+    @callback
+    def _async_action(run_variables: dict[str, Any], context: Any = None) -> None:
+        runs.append(run_variables)
+
+    timings = {}
+    for trigger_count in (10, 100, 1000):
+        # The first trigger is for the pressed button, the rest are for other
+        # clocks and buttons
+        unsubs = [
+            await device_trigger.async_attach_trigger(
+                hass,
+                device_trigger.TRIGGER_SCHEMA(
+                    {
+                        CONF_PLATFORM: "device",
+                        CONF_DOMAIN: DOMAIN,
+                        CONF_DEVICE_ID: device_id if idx == 0 else f"device{idx}",
+                        CONF_TYPE: EVENT_BUTTON_PRESSED,
+                        ATTR_BUTTON: idx % 2 + 1,
+                        CONF_SUBTYPE: idx % 2 + 1,
+                    }
+                ),
+                _async_action,
+                {"trigger_data": {"id": "0", "idx": "0", "alias": None}},
+            )
+            for idx in range(trigger_count)
+        ]
+        runs.clear()
+        # Every press is counted instead of being dropped as a duplicate
+        with patch.object(presses, "PRESS_DEDUP_WINDOW", 0):
+            start = time.perf_counter()
+            for _ in range(PRESSES):
+                await view.post(request, device_id, token)
+            timings[trigger_count] = (time.perf_counter() - start) / PRESSES
+        await hass.async_block_till_done()
+        assert len(runs) == PRESSES
+        for unsub in unsubs:
+            unsub()
+        print(
+            f"{trigger_count} triggers: {timings[trigger_count] * 1e6:.1f} us per press"
+        )
+
+    # A press only reaches the triggers of its own device and button
+    assert timings[1000] < 2 * timings[10]
+    # Let the press patterns go out
+    await asyncio.sleep(presses.MULTI_PRESS_WINDOW)
+
+
+async def test_string_button(hass: HomeAssistant) -> None:
+    """Test that a trigger for a button given as a string gets its presses."""
+    entry = create_entry(hass)
+    device_id = (
+        dr.async_get(hass)
+        .async_get_or_create(
+            config_entry_id=entry.entry_id, identifiers={(DOMAIN, "DSN0")}
+        )
+        .id
+    )
+    config = {
+        CONF_PLATFORM: "device",
+        CONF_DOMAIN: DOMAIN,
+        CONF_DEVICE_ID: device_id,
+        CONF_TYPE: EVENT_BUTTON_PRESSED,
+        ATTR_BUTTON: "2",
+        CONF_SUBTYPE: "2",
+    }
+    with pytest.raises(vol.Invalid):
+        device_trigger.TRIGGER_SCHEMA({**config, ATTR_BUTTON: "two"})
+    runs = []
+
+    @callback
+    def _async_action(run_variables: dict[str, Any], context: Any = None) -> None:
+        runs.append(run_variables)
+
+    unsub = await device_trigger.async_attach_trigger(
+        hass,
+        device_trigger.TRIGGER_SCHEMA(config),
+        _async_action,
+        {"trigger_data": {"id": "0", "idx": "0", "alias": None}},
+    )
+    view = DopplerWebhookView()
+    token = entry.data[CONF_WEBHOOK_TOKEN]
+    for button in (2, "2"):
+        await view.post(
+            WebhookRequest(hass, {"dsn": "DSN0", "button": button}), device_id, token
+        )
+        # Let the press pattern go out, so the next press isn't a second press
+        await asyncio.sleep(presses.MULTI_PRESS_WINDOW)
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+    unsub()
@@ -0,0 +1,144 @@
+"""Tests for the sandman_doppler webhook view."""
+
+import asyncio
+from http import HTTPStatus
+import statistics
+import time
+from typing import Any
+
+from doppyler.const import ATTR_VOLUME_LEVEL
+import pytest
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from custom_components.sandman_doppler.breaker import BreakerState
+from custom_components.sandman_doppler.const import (
+    CONF_WEBHOOK_TOKEN,
+    DOMAIN,
+    EVENT_BUTTON_PRESSED,
+)
+from custom_components.sandman_doppler.http import DopplerWebhookView
+from custom_components.sandman_doppler.presses import MULTI_PRESS_WINDOW
+
+from .common import WebhookRequest, async_setup_integration, create_entry
+
+# Clocks posting presses at the same time in the benchmark
+CLOCKS = 200
+# Presses each clock posts in the benchmark
+PRESSES_PER_CLOCK = 50
+
+
+@pytest.mark.usefixtures("mock_client", "mock_tier_data")
+async def test_webhook_token(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test that pushes need the entry's token and aren't trusted like polls."""
+    entry = await async_setup_integration(hass, hass_storage, {ATTR_VOLUME_LEVEL: 10})
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["DSN1"]
+    device = dr.async_get(hass).async_get_device({(DOMAIN, "DSN1")})
+    token = entry.data[CONF_WEBHOOK_TOKEN]
+    events = []
+    hass.bus.async_listen(EVENT_BUTTON_PRESSED, events.append)
+    view = DopplerWebhookView()
+    body = {"dsn": "DSN1", "button": 1, "state": {ATTR_VOLUME_LEVEL: 30}}
+
+    response = await view.post(WebhookRequest(hass, body), device.id, "guessed")
+    assert response.status == HTTPStatus.UNAUTHORIZED
+    await hass.async_block_till_done()
+    assert not events
+    assert coordinator.data[ATTR_VOLUME_LEVEL] == 10
+
+    coordinator.breaker.state = BreakerState.OPEN
+    response = await view.post(WebhookRequest(hass, body), device.id, token)
+    assert response.status == HTTPStatus.OK
+    await hass.async_block_till_done()
+    assert coordinator.data[ATTR_VOLUME_LEVEL] == 30
+    # Pushed values don't close the breaker or let writes of them be skipped
+    assert coordinator.breaker.state == BreakerState.OPEN
+    assert coordinator.async_should_write(ATTR_VOLUME_LEVEL, True)
+    assert len(events) == 1
+    assert "state" not in events[0].data
+    # Let the press pattern go out
+    await asyncio.sleep(MULTI_PRESS_WINDOW)
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("mock_client", "mock_tier_data")
+async def test_string_button(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test that a button sent as a string reaches the triggers of its number."""
+    entry = await async_setup_integration(hass, hass_storage, {ATTR_VOLUME_LEVEL: 10})
+    await hass.async_block_till_done()
+    device = dr.async_get(hass).async_get_device({(DOMAIN, "DSN1")})
+    token = entry.data[CONF_WEBHOOK_TOKEN]
+    events = []
+    hass.bus.async_listen(EVENT_BUTTON_PRESSED, events.append)
+    presses: list[Event] = []
+    unsub = async_dispatcher_connect(
+        hass, f"{DOMAIN}_{device.id}_1_{EVENT_BUTTON_PRESSED}", presses.append
+    )
+    view = DopplerWebhookView()
+
+    for button in ("1", "one", [1]):
+        body = {"dsn": "DSN1", "button": button, "action": "press"}
+        response = await view.post(WebhookRequest(hass, body), device.id, token)
+        assert response.status == HTTPStatus.OK
+    await hass.async_block_till_done()
+    # Buttons that aren't numbers are dropped
+    assert len(presses) == len(events) == 1
+    assert presses[0].data["button"] == events[0].data["button"] == 1
+    unsub()
+    await asyncio.sleep(MULTI_PRESS_WINDOW)
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_benchmark_concurrent_presses(hass: HomeAssistant) -> None:
+    """Benchmark presses/s and p99 latency with every clock posting at once."""
+    entry = create_entry(hass)
+    dev_reg = dr.async_get(hass)
+    device_ids = [
+        dev_reg.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={(DOMAIN, f"DSN{idx}")},
+            name=f"Clock {idx}",
+        ).id
+        for idx in range(CLOCKS)
+    ]
+    events = []
+    hass.bus.async_listen(
+        EVENT_BUTTON_PRESSED, callback(lambda event: events.append(event))
+    )
+    view = DopplerWebhookView()
+    token = entry.data[CONF_WEBHOOK_TOKEN]
+    latencies: list[float] = []
+
+    async def _async_press(device_id: str, requests: list[WebhookRequest]) -> None:
+        for request in requests:
+            start = time.perf_counter()
+            response = await view.post(request, device_id, token)
+            latencies.append(time.perf_counter() - start)
+            assert response.status == HTTPStatus.OK
+            await asyncio.sleep(0)
+
+    # Every press is of a different button so none of them is a duplicate
+    requests = {
+        device_id: [
+            WebhookRequest(hass, {"dsn": f"DSN{idx}", "button": button})
+            for button in range(PRESSES_PER_CLOCK)
+        ]
+        for idx, device_id in enumerate(device_ids)
+    }
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(_async_press(device_id, requests[device_id]) for device_id in device_ids)
+    )
+    elapsed = time.perf_counter() - start
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(
+        f"{len(latencies) / elapsed:.0f} presses/s, p99 {p99 * 1e6:.0f} us "
+        f"with {CLOCKS} clocks posting at once"
+    )
+    await hass.async_block_till_done()
+    assert len(events) == CLOCKS * PRESSES_PER_CLOCK
+    # Let the press patterns go out
+    await asyncio.sleep(MULTI_PRESS_WINDOW)
@@ -0,0 +1,83 @@
+"""Tests for setting up the sandman_doppler integration."""
+
+import asyncio
+import time
+from typing import Any
+from unittest.mock import AsyncMock
+
+from doppyler.const import ATTR_VOLUME_LEVEL
+import pytest
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+
+from custom_components.sandman_doppler.const import CONF_WEBHOOK_TOKEN
+
+from .common import CLOUD_LATENCY, async_setup_integration
+
+# Seconds a clock takes to return a full poll
+POLL_LATENCY = 0.1
+VOLUME_ENTITY_ID = "number.clock_dsn1_volume_level"
+
+
+async def _async_time_boot(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_tier_data: AsyncMock,
+    cached: bool,
+) -> float:
+    """Set up the integration and return how long until its entities are up."""
+
+    async def _async_get_tier_data(tiers):
+        await asyncio.sleep(POLL_LATENCY)
+        return {ATTR_VOLUME_LEVEL: 10}
+
+    mock_tier_data.side_effect = _async_get_tier_data
+    start = time.perf_counter()
+    entry = await async_setup_integration(
+        hass, hass_storage, {ATTR_VOLUME_LEVEL: 10} if cached else None
+    )
+    async with asyncio.timeout(5):
+        while (
+            not (state := hass.states.get(VOLUME_ENTITY_ID))
+            or state.state == STATE_UNAVAILABLE
+        ):
+            await asyncio.sleep(0.005)
+    duration = time.perf_counter() - start
+    assert state.state == "10"
+    await hass.async_block_till_done()
+    await hass.config_entries.async_remove(entry.entry_id)
+    return duration
+
+
+@pytest.mark.usefixtures("mock_client")
+async def test_benchmark_boot(
+    hass: HomeAssistant, hass_storage: dict[str, Any], mock_tier_data: AsyncMock
+) -> None:
+    """Benchmark a cold boot against a boot from the last known data."""
+    cold = await _async_time_boot(hass, hass_storage, mock_tier_data, False)
+    cached = await _async_time_boot(hass, hass_storage, mock_tier_data, True)
+    print(f"entities up after {cold * 1000:.0f} ms cold, {cached * 1000:.0f} ms cached")
+    # A cold boot waits for the cloud and the clock, a cached boot for neither
+    assert cold >= CLOUD_LATENCY + POLL_LATENCY
+    assert cached < CLOUD_LATENCY
+
+
+@pytest.mark.usefixtures("mock_client", "mock_tier_data")
+async def test_webhook_token_created(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that entries from before webhook tokens get one on setup."""
+    entry = await async_setup_integration(hass, hass_storage, {ATTR_VOLUME_LEVEL: 10})
+    token = entry.data[CONF_WEBHOOK_TOKEN]
+    await hass.config_entries.async_unload(entry.entry_id)
+
+    hass.config_entries.async_update_entry(
+        entry,
+        data={key: val for key, val in entry.data.items() if key != CONF_WEBHOOK_TOKEN},
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert len(entry.data[CONF_WEBHOOK_TOKEN]) >= 32
+    assert entry.data[CONF_WEBHOOK_TOKEN] != token
+    await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,123 @@
+"""Tests for the sandman_doppler light platform."""
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from doppyler.const import (
+    ATTR_DAY_BUTTON_BRIGHTNESS,
+    ATTR_DAY_DISPLAY_BRIGHTNESS,
+    ATTR_NIGHT_DISPLAY_BRIGHTNESS,
+    ATTR_SYNC_BUTTON_AND_DISPLAY_BRIGHTNESS,
+    ATTR_SYNC_BUTTON_AND_DISPLAY_COLOR,
+    ATTR_SYNC_DAY_AND_NIGHT_COLOR,
+)
+from doppyler.model.doppler import Doppler
+import pytest
+
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_RGB_COLOR,
+    DOMAIN as LIGHT_DOMAIN,
+)
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_ON
+from homeassistant.core import HomeAssistant
+
+from custom_components.sandman_doppler.coalescer import WRITE_DEBOUNCE
+from custom_components.sandman_doppler.const import DOMAIN
+
+from .common import async_setup_integration
+
+DAY_DISPLAY_ENTITY_ID = "light.clock_dsn1_day_display"
+DAY_BUTTON_ENTITY_ID = "light.clock_dsn1_day_button"
+NIGHT_DISPLAY_ENTITY_ID = "light.clock_dsn1_night_display"
+
+
+@pytest.mark.usefixtures("mock_client", "mock_tier_data")
+async def test_brightness_drag(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that dragging the brightness slider results in at most two writes."""
+    entry = await async_setup_integration(
+        hass, hass_storage, {ATTR_DAY_DISPLAY_BRIGHTNESS: 10}
+    )
+    await hass.async_block_till_done()
+    with patch.object(
+        Doppler,
+        "set_day_display_brightness",
+        AsyncMock(side_effect=lambda brightness: brightness),
+    ) as set_brightness:
+        for brightness in range(30, 255, 10):
+            await hass.services.async_call(
+                LIGHT_DOMAIN,
+                SERVICE_TURN_ON,
+                {ATTR_ENTITY_ID: DAY_DISPLAY_ENTITY_ID, ATTR_BRIGHTNESS: brightness},
+            )
+            await asyncio.sleep(WRITE_DEBOUNCE / 10)
+        await hass.async_block_till_done()
+
+    assert 1 <= set_brightness.call_count <= 2
+    assert set_brightness.call_args.args == (250 * 100 // 255,)
+    assert hass.states.get(DAY_DISPLAY_ENTITY_ID).attributes[ATTR_BRIGHTNESS] == (
+        250 * 100 // 255 * 255 // 100
+    )
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("mock_client", "mock_tier_data")
+async def test_sync_follows_switches(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that a write only syncs the lights whose sync switch is on."""
+    entry = await async_setup_integration(
+        hass,
+        hass_storage,
+        {
+            ATTR_DAY_DISPLAY_BRIGHTNESS: 10,
+            ATTR_DAY_BUTTON_BRIGHTNESS: 10,
+            ATTR_NIGHT_DISPLAY_BRIGHTNESS: 10,
+            ATTR_SYNC_BUTTON_AND_DISPLAY_BRIGHTNESS: False,
+            ATTR_SYNC_BUTTON_AND_DISPLAY_COLOR: False,
+            ATTR_SYNC_DAY_AND_NIGHT_COLOR: True,
+        },
+    )
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["DSN1"]
+
+    async def _async_turn_on(**data: Any) -> None:
+        await hass.services.async_call(
+            LIGHT_DOMAIN,
+            SERVICE_TURN_ON,
+            {ATTR_ENTITY_ID: DAY_DISPLAY_ENTITY_ID, **data},
+            blocking=True,
+        )
+        await hass.async_block_till_done()
+
+    with patch.object(
+        Doppler,
+        "set_day_display_brightness",
+        AsyncMock(side_effect=lambda brightness: brightness),
+    ), patch.object(Doppler, "set_day_display_color", AsyncMock()):
+        await _async_turn_on(**{ATTR_BRIGHTNESS: 255})
+        assert coordinator.data[ATTR_DAY_BUTTON_BRIGHTNESS] == 10
+
+        coordinator.data[ATTR_SYNC_BUTTON_AND_DISPLAY_BRIGHTNESS] = True
+        await _async_turn_on(**{ATTR_BRIGHTNESS: 128})
+        assert hass.states.get(DAY_BUTTON_ENTITY_ID).attributes[ATTR_BRIGHTNESS] == (
+            hass.states.get(DAY_DISPLAY_ENTITY_ID).attributes[ATTR_BRIGHTNESS]
+        )
+        # There is no switch to sync day and night brightness
+        assert coordinator.data[ATTR_NIGHT_DISPLAY_BRIGHTNESS] == 10
+
+        await _async_turn_on(**{ATTR_RGB_COLOR: (255, 0, 0)})
+        assert hass.states.get(NIGHT_DISPLAY_ENTITY_ID).attributes[ATTR_RGB_COLOR] == (
+            255,
+            0,
+            0,
+        )
+        assert hass.states.get(DAY_BUTTON_ENTITY_ID).attributes.get(ATTR_RGB_COLOR) != (
+            255,
+            0,
+            0,
+        )
+    await hass.config_entries.async_unload(entry.entry_id)
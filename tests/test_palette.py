@@ -0,0 +1,71 @@
+"""Tests for the sandman_doppler light bar gradients."""
+
+from doppyler.model.color import Color
+import pytest
+
+from custom_components.sandman_doppler.palette import (
+    PALETTES,
+    InterpolationSpace,
+    gradient,
+    palette_gradient,
+)
+
+BLACK = Color(0, 0, 0)
+WHITE = Color(255, 255, 255)
+
+
+@pytest.mark.parametrize("space", list(InterpolationSpace))
+@pytest.mark.parametrize("name", list(PALETTES))
+def test_palette_endpoints(name: str, space: InterpolationSpace) -> None:
+    """Test that a gradient starts and ends on the first and last stops."""
+    colors = palette_gradient(name, 75, space)
+    assert len(colors) == 75
+    assert colors[0] == Color(*PALETTES[name][0])
+    assert colors[-1] == Color(*PALETTES[name][-1])
+
+
+@pytest.mark.parametrize("space", list(InterpolationSpace))
+@pytest.mark.parametrize("led_count", [1, 2, 3, 75])
+def test_step_count(led_count: int, space: InterpolationSpace) -> None:
+    """Test that there is a color for every LED, however many stops there are."""
+    assert len(gradient([BLACK, WHITE], led_count, space)) == led_count
+    assert gradient([WHITE], led_count, space) == [WHITE] * led_count
+    # Every stop gets an LED of its own when there are as many LEDs as stops
+    stops = [Color(*stop) for stop in PALETTES["rainbow"]]
+    assert gradient(stops, len(stops), space) == stops
+
+
+@pytest.mark.parametrize(
+    ("space", "middle"),
+    [
+        (InterpolationSpace.RGB, Color(128, 128, 128)),
+        # Blending light rather than channel values gives a brighter middle
+        (InterpolationSpace.LINEAR_RGB, Color(186, 186, 186)),
+    ],
+)
+def test_blend(space: InterpolationSpace, middle: Color) -> None:
+    """Test the color halfway between black and white."""
+    assert gradient([BLACK, WHITE], 3, space) == [BLACK, middle, WHITE]
+
+
+def test_hue_wraps_around() -> None:
+    """Test that HSV gradients take the short way around the hue circle."""
+    pink, orange = Color(255, 0, 128), Color(255, 128, 0)
+    # The short way from pink to orange passes red, not green and blue
+    assert gradient([pink, orange], 3, InterpolationSpace.HSV) == [
+        pink,
+        Color(255, 0, 0),
+        orange,
+    ]
+    assert gradient([orange, pink], 3, InterpolationSpace.HSV) == [
+        orange,
+        Color(255, 0, 0),
+        pink,
+    ]
+
+
+def test_cached_gradient_not_shared() -> None:
+    """Test that changing a returned gradient doesn't change the cached one."""
+    colors = gradient([BLACK, WHITE], 3)
+    colors.append(WHITE)
+    assert gradient([BLACK, WHITE], 3) == [BLACK, Color(128, 128, 128), WHITE]
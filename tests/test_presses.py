@@ -0,0 +1,151 @@
+"""Tests for the sandman_doppler smart button press patterns."""
+
+import asyncio
+from collections.abc import Generator
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.sandman_doppler import presses
+from custom_components.sandman_doppler.presses import (
+    PATTERN_DOUBLE,
+    PATTERN_LONG,
+    PATTERN_SINGLE,
+    PATTERN_TRIPLE,
+    DopplerPressTracker,
+)
+
+# Shorter windows than the real ones so the tests run quickly
+PRESS_DEDUP_WINDOW = 0.02
+MULTI_PRESS_WINDOW = 0.1
+LONG_PRESS_DURATION = 0.2
+# Seconds between the presses of a multi-press
+PRESS_GAP = 0.04
+# Clocks and deliveries of each clock timed for the per-press overhead
+CLOCKS = 200
+DELIVERIES_PER_CLOCK = 300
+
+
+@pytest.fixture(autouse=True)
+def short_windows() -> Generator[None, None, None]:
+    """Shorten the press windows."""
+    with patch.object(presses, "PRESS_DEDUP_WINDOW", PRESS_DEDUP_WINDOW), patch.object(
+        presses, "MULTI_PRESS_WINDOW", MULTI_PRESS_WINDOW
+    ), patch.object(presses, "LONG_PRESS_DURATION", LONG_PRESS_DURATION):
+        yield
+
+
+def _create_tracker(
+    hass: HomeAssistant,
+) -> tuple[DopplerPressTracker, list[str]]:
+    """Create a press tracker and the list its patterns are added to."""
+    patterns: list[str] = []
+
+    def _on_pattern(pattern: str, data: dict[str, Any]) -> None:
+        patterns.append(pattern)
+
+    return DopplerPressTracker(hass, _on_pattern), patterns
+
+
+async def _async_deliver(
+    tracker: DopplerPressTracker, *actions: str, gap: float = PRESS_GAP
+) -> None:
+    """Deliver actions of button 1 `gap` seconds apart."""
+    for idx, action in enumerate(actions):
+        if idx:
+            await asyncio.sleep(gap)
+        tracker.async_process("device_id", 1, action, {})
+
+
+@pytest.mark.parametrize(
+    ("press_count", "pattern"),
+    [(1, PATTERN_SINGLE), (2, PATTERN_DOUBLE), (3, PATTERN_TRIPLE)],
+)
+async def test_multi_press(hass: HomeAssistant, press_count: int, pattern: str) -> None:
+    """Test that presses within the window are emitted as a single pattern."""
+    tracker, patterns = _create_tracker(hass)
+    await _async_deliver(tracker, *["press"] * press_count)
+    if pattern != PATTERN_TRIPLE:
+        # Nothing is emitted while another press could follow
+        assert patterns == []
+    await asyncio.sleep(MULTI_PRESS_WINDOW * 1.5)
+    assert patterns == [pattern]
+
+
+async def test_presses_after_window(hass: HomeAssistant) -> None:
+    """Test that presses further apart than the window are separate patterns."""
+    tracker, patterns = _create_tracker(hass)
+    await _async_deliver(tracker, "press", "press", gap=MULTI_PRESS_WINDOW * 1.5)
+    await asyncio.sleep(MULTI_PRESS_WINDOW * 1.5)
+    assert patterns == [PATTERN_SINGLE, PATTERN_SINGLE]
+
+
+async def test_hold(hass: HomeAssistant) -> None:
+    """Test that a hold reported by the clock is a long press right away."""
+    tracker, patterns = _create_tracker(hass)
+    await _async_deliver(tracker, "press", "hold")
+    # The press before the hold was the start of the long press
+    assert patterns == [PATTERN_LONG]
+    await asyncio.sleep(MULTI_PRESS_WINDOW * 1.5)
+    assert patterns == [PATTERN_LONG]
+
+
+async def test_long_press_with_releases(hass: HomeAssistant) -> None:
+    """Test long presses on a clock that reports releases."""
+    tracker, patterns = _create_tracker(hass)
+    # The first release shows that the clock reports them
+    await _async_deliver(tracker, "press", "release")
+    await asyncio.sleep(MULTI_PRESS_WINDOW * 1.5)
+    assert patterns == [PATTERN_SINGLE]
+
+    # A short press is counted on release
+    await _async_deliver(tracker, "press", "release")
+    await asyncio.sleep(MULTI_PRESS_WINDOW * 1.5)
+    assert patterns == [PATTERN_SINGLE, PATTERN_SINGLE]
+
+    # A held press is a long press once it's held long enough, and its release
+    # is ignored
+    await _async_deliver(tracker, "press", "release", gap=LONG_PRESS_DURATION * 1.5)
+    await asyncio.sleep(MULTI_PRESS_WINDOW * 1.5)
+    assert patterns == [PATTERN_SINGLE, PATTERN_SINGLE, PATTERN_LONG]
+
+
+async def test_duplicate_delivery(hass: HomeAssistant) -> None:
+    """Test that a delivery repeated within the dedup window is dropped."""
+    tracker, patterns = _create_tracker(hass)
+    assert tracker.async_process("device_id", 1, "press", {})
+    assert not tracker.async_process("device_id", 1, "press", {})
+    # Other buttons and actions aren't duplicates
+    assert tracker.async_process("device_id", 2, "press", {})
+    assert tracker.async_process("device_id", 1, "hold", {})
+    assert tracker.duplicates == 1
+
+    await asyncio.sleep(PRESS_DEDUP_WINDOW * 1.5)
+    assert tracker.async_process("device_id", 2, "press", {})
+    await asyncio.sleep(MULTI_PRESS_WINDOW * 1.5)
+    assert patterns == [PATTERN_LONG, PATTERN_DOUBLE]
+
+
+async def test_benchmark_press_overhead(hass: HomeAssistant) -> None:
+    """Benchmark the cost of processing a delivery."""
+    tracker, patterns = _create_tracker(hass)
+    deliveries = CLOCKS * DELIVERIES_PER_CLOCK
+    # Debug mode records where every timer was created, which isn't the cost in
+    # production
+    debug = hass.loop.get_debug()
+    hass.loop.set_debug(False)
+    with patch.object(presses, "PRESS_DEDUP_WINDOW", 0):
+        start = time.perf_counter()
+        for idx in range(deliveries):
+            tracker.async_process(f"device{idx % CLOCKS}", 1, "press", {})
+        overhead = (time.perf_counter() - start) / deliveries
+    hass.loop.set_debug(debug)
+    print(f"{overhead * 1e6:.2f} us per delivery")
+    assert overhead < 0.00005
+    await asyncio.sleep(MULTI_PRESS_WINDOW * 1.5)
+    # Every third press of a clock completes a triple press
+    assert patterns == [PATTERN_TRIPLE] * (deliveries // 3)
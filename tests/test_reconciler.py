@@ -0,0 +1,150 @@
+"""Tests for the sandman_doppler reconciler."""
+
+# pylint: disable=protected-access
+
+import asyncio
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from aiohttp import ClientConnectionError
+from doppyler.const import ATTR_DAY_TO_NIGHT_TRANSITION_VALUE, ATTR_VOLUME_LEVEL
+from doppyler.model.doppler import Doppler
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.sandman_doppler import DopplerDataUpdateCoordinator, reconciler
+from custom_components.sandman_doppler.reconciler import DopplerReconciler
+
+from .common import create_coordinator, create_doppler, create_entry
+
+# Writes per second in the tests, so passes don't take seconds
+WRITES_PER_SECOND = 50
+
+
+@pytest.fixture(autouse=True)
+def fast_writes() -> Generator[None, None, None]:
+    """Let the reconciler write faster than it does against real clocks."""
+    with patch.object(reconciler, "RECONCILE_WRITES_PER_SECOND", WRITES_PER_SECOND):
+        yield
+
+
+def _create_coordinators(
+    hass: HomeAssistant, data: dict[str, dict[str, Any]]
+) -> tuple[DopplerReconciler, list[DopplerDataUpdateCoordinator]]:
+    """Create a reconciler and a coordinator holding the given data per DSN."""
+    entry = create_entry(hass)
+    coordinators = []
+    for dsn, device_data in data.items():
+        coordinator = create_coordinator(hass, entry, create_doppler(dsn))
+        coordinator.data = device_data
+        coordinators.append(coordinator)
+    return DopplerReconciler(hass, entry), coordinators
+
+
+async def test_only_drift_written(hass: HomeAssistant) -> None:
+    """Test that drifted settings are written and untrusted devices skipped."""
+    doppler_reconciler, coordinators = _create_coordinators(
+        hass,
+        {
+            "DSN1": {ATTR_VOLUME_LEVEL: 10},
+            "DSN2": {ATTR_VOLUME_LEVEL: 30},
+            "DSN3": {ATTR_VOLUME_LEVEL: 10},
+        },
+    )
+    # Data restored at startup hasn't been confirmed by the device yet
+    coordinators[2].stale = True
+    for dsn in ("DSN1", "DSN2", "DSN3", "DSN4"):
+        doppler_reconciler._profiles[dsn] = {"volume_level": 30}
+
+    with patch.object(
+        Doppler, "set_volume_level", AsyncMock(return_value=30)
+    ) as set_volume_level:
+        await doppler_reconciler._async_reconcile()
+    set_volume_level.assert_called_once_with(30)
+    assert coordinators[0].data[ATTR_VOLUME_LEVEL] == 30
+    metrics = doppler_reconciler.async_get_metrics()
+    assert metrics["devices_converged"] == 2
+    assert metrics["devices_drifted"] == 0
+    # Devices without trusted data count as neither converged nor drifted
+    assert metrics["devices_skipped"] == 2
+    assert metrics["skipped"] == ["DSN3", "DSN4"]
+    assert metrics["writes_sent"] == 1
+
+    doppler_reconciler.async_clear_profile("DSN3")
+    assert doppler_reconciler.async_get_metrics()["skipped"] == ["DSN4"]
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+
+
+async def test_write_pacing(hass: HomeAssistant) -> None:
+    """Test that writes across devices are spaced by the write rate."""
+    doppler_reconciler, coordinators = _create_coordinators(
+        hass,
+        {
+            "DSN1": {ATTR_VOLUME_LEVEL: 10, ATTR_DAY_TO_NIGHT_TRANSITION_VALUE: 0},
+            "DSN2": {ATTR_VOLUME_LEVEL: 10},
+        },
+    )
+    doppler_reconciler._profiles["DSN1"] = {
+        "volume_level": 30,
+        "day_to_night_transition": 5,
+    }
+    doppler_reconciler._profiles["DSN2"] = {"volume_level": 30}
+    written_at = []
+
+    async def _async_write(val: int) -> int:
+        written_at.append(hass.loop.time())
+        return val
+
+    with patch.object(
+        Doppler, "set_volume_level", AsyncMock(side_effect=_async_write)
+    ), patch.object(
+        Doppler,
+        "set_day_to_night_transition_value",
+        AsyncMock(side_effect=_async_write),
+    ):
+        await doppler_reconciler._async_reconcile()
+
+    assert len(written_at) == 3
+    for prev, written in zip(written_at, written_at[1:]):
+        # Allow for the loop's clock resolution
+        assert written - prev >= 0.99 / WRITES_PER_SECOND
+    assert doppler_reconciler.async_get_metrics()["devices_converged"] == 2
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+
+
+async def test_failed_writes_dont_end_pass(hass: HomeAssistant) -> None:
+    """Test that failed and hanging writes are counted and the pass goes on."""
+    doppler_reconciler, coordinators = _create_coordinators(
+        hass,
+        {
+            "DSN1": {ATTR_VOLUME_LEVEL: 10},
+            "DSN2": {ATTR_VOLUME_LEVEL: 10},
+            "DSN3": {ATTR_VOLUME_LEVEL: 10},
+        },
+    )
+    for dsn in ("DSN1", "DSN2", "DSN3"):
+        doppler_reconciler._profiles[dsn] = {"volume_level": 30}
+
+    async def _async_write(val: int) -> int:
+        if len(set_volume_level.mock_calls) == 1:
+            raise ClientConnectionError("Refused")
+        if len(set_volume_level.mock_calls) == 2:
+            await asyncio.sleep(1)
+        return val
+
+    with patch.object(reconciler, "RECONCILE_WRITE_TIMEOUT", 0.05), patch.object(
+        Doppler, "set_volume_level", AsyncMock(side_effect=_async_write)
+    ) as set_volume_level:
+        await doppler_reconciler._async_reconcile()
+
+    assert set_volume_level.call_count == 3
+    metrics = doppler_reconciler.async_get_metrics()
+    assert (metrics["writes_sent"], metrics["writes_failed"]) == (1, 2)
+    assert metrics["drift"] == {"DSN1": ["volume_level"], "DSN2": ["volume_level"]}
+    assert metrics["devices_converged"] == 1
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
@@ -0,0 +1,157 @@
+"""Tests for the sandman_doppler request scheduler."""
+
+import asyncio
+import statistics
+import time
+
+from custom_components.sandman_doppler.scheduler import (
+    REQUEST_PRIORITY,
+    DopplerRequestScheduler,
+    RequestPriority,
+)
+
+from .common import create_doppler
+
+# Seconds every request takes on the fake clocks
+REQUEST_LATENCY = 0.01
+# Requests in the poll of a single clock
+REQUESTS_PER_POLL = 3
+
+
+async def _async_poll_fleet(fleet_size: int, max_concurrent_requests: int) -> float:
+    """Poll a fleet of clocks at once and return how long the cycle took."""
+    scheduler = DopplerRequestScheduler(max_concurrent_requests)
+    dopplers = [
+        create_doppler(f"DSN{idx}", latency=REQUEST_LATENCY)
+        for idx in range(fleet_size)
+    ]
+    detach = [scheduler.async_attach(doppler) for doppler in dopplers]
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            doppler._call_api("endpoint")  # pylint: disable=protected-access
+            for doppler in dopplers
+            for _ in range(REQUESTS_PER_POLL)
+        )
+    )
+    duration = time.perf_counter() - start
+    for unsub in detach:
+        unsub()
+    assert scheduler.peak_requests_in_flight == min(fleet_size, max_concurrent_requests)
+    return duration
+
+
+async def test_lanes_run_devices_in_parallel() -> None:
+    """Test that requests to one device are serialized and devices run in parallel."""
+    scheduler = DopplerRequestScheduler(4)
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+    dopplers = [create_doppler(f"DSN{idx}") for idx in range(2)]
+    for doppler in dopplers:
+
+        async def _call_api(endpoint, method="GET", data=None, dsn=doppler.dsn):
+            in_flight[dsn] = in_flight.get(dsn, 0) + 1
+            peak[dsn] = max(peak.get(dsn, 0), in_flight[dsn])
+            await asyncio.sleep(REQUEST_LATENCY)
+            in_flight[dsn] -= 1
+            return {}
+
+        doppler._call_api = _call_api  # pylint: disable=protected-access
+        scheduler.async_attach(doppler)
+
+    await asyncio.gather(
+        *(
+            doppler._call_api("endpoint")  # pylint: disable=protected-access
+            for doppler in dopplers
+            for _ in range(3)
+        )
+    )
+    assert peak == {"DSN0": 1, "DSN1": 1}
+    assert scheduler.peak_requests_in_flight == 2
+
+
+async def test_benchmark_poll_cycle_time() -> None:
+    """Benchmark that poll cycle time grows with fleet size divided by the cap."""
+    max_concurrent_requests = 4
+    durations = {
+        fleet_size: await _async_poll_fleet(fleet_size, max_concurrent_requests)
+        for fleet_size in (4, 8, 16, 32)
+    }
+    for fleet_size, duration in durations.items():
+        expected = (
+            fleet_size / max_concurrent_requests * REQUESTS_PER_POLL * REQUEST_LATENCY
+        )
+        print(
+            f"{fleet_size} clocks, cap {max_concurrent_requests}: "
+            f"{duration * 1000:.0f} ms (ideal {expected * 1000:.0f} ms)"
+        )
+        assert expected <= duration < expected * 2
+
+    # Eight times the clocks take about eight times as long
+    assert 6 < durations[32] / durations[4] < 10
+
+
+async def test_attach_twice_replaces_attachment() -> None:
+    """Test that attaching a device again replaces its attachment."""
+    scheduler = DopplerRequestScheduler(4)
+    doppler = create_doppler()
+    call_api = doppler._call_api  # pylint: disable=protected-access
+    detach_old = scheduler.async_attach(doppler)
+    detach_new = scheduler.async_attach(doppler)
+
+    async with asyncio.timeout(1):
+        await doppler._call_api("endpoint")  # pylint: disable=protected-access
+    assert doppler.calls == [("GET", "endpoint", None)]
+
+    # The old attachment going away doesn't affect the new one
+    detach_old()
+    assert doppler._call_api is not call_api  # pylint: disable=protected-access
+    assert scheduler.async_get_refresh_time(doppler.dsn, 10, 60) == 0
+
+    detach_new()
+    assert doppler._call_api is call_api  # pylint: disable=protected-access
+
+
+async def _async_command_latencies(priority: RequestPriority) -> dict[str, float]:
+    """Send commands during a poll storm and return their latency percentiles."""
+    scheduler = DopplerRequestScheduler(4)
+    dopplers = [
+        create_doppler(f"DSN{idx}", latency=REQUEST_LATENCY) for idx in range(8)
+    ]
+    for doppler in dopplers:
+        scheduler.async_attach(doppler)
+    latencies = []
+
+    async def _async_poll(doppler) -> None:
+        REQUEST_PRIORITY.set(RequestPriority.POLL)
+        await asyncio.gather(*(doppler._call_api("endpoint") for _ in range(10)))
+
+    async def _async_command(doppler) -> None:
+        REQUEST_PRIORITY.set(priority)
+        start = time.perf_counter()
+        await doppler._call_api("endpoint", "POST", {})
+        latencies.append(time.perf_counter() - start)
+
+    polls = [asyncio.create_task(_async_poll(doppler)) for doppler in dopplers]
+    commands = []
+    for idx in range(20):
+        await asyncio.sleep(REQUEST_LATENCY / 2)
+        commands.append(asyncio.create_task(_async_command(dopplers[idx % 8])))
+    await asyncio.gather(*polls, *commands)
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {"p50": percentiles[49], "p99": percentiles[98]}
+
+
+async def test_benchmark_command_latency_during_poll_storm() -> None:
+    """Benchmark p50/p99 command latency while every clock is being polled."""
+    prioritized = await _async_command_latencies(RequestPriority.COMMAND)
+    fifo = await _async_command_latencies(RequestPriority.POLL)
+    for name, latencies in (("prioritized", prioritized), ("fifo", fifo)):
+        print(
+            f"{name} command latency during poll storm: "
+            f"p50 {latencies['p50'] * 1000:.0f} ms, "
+            f"p99 {latencies['p99'] * 1000:.0f} ms"
+        )
+    # Commands skip the poll requests already queued for their clock
+    assert prioritized["p99"] < fifo["p99"] / 2
@@ -0,0 +1,62 @@
+"""Tests for the sandman_doppler select platform."""
+
+import time
+from typing import Any
+
+from doppyler.const import ATTR_VOLUME_LEVEL
+from doppyler.model.sound import SoundPreset
+import pytest
+
+from homeassistant.components.select import ATTR_OPTIONS, DOMAIN as SELECT_DOMAIN
+from homeassistant.core import HomeAssistant
+
+from custom_components.sandman_doppler.helpers import get_enum_options
+from custom_components.sandman_doppler.select import get_timezone_options
+
+from .common import async_setup_integration
+
+TIMEZONE_ENTITY_ID = "select.clock_dsn1_timezone"
+SOUND_PRESET_ENTITY_ID = "select.clock_dsn1_sound_preset"
+# State writes timed for each select
+STATE_WRITES = 1000
+
+
+@pytest.mark.usefixtures("mock_client", "mock_tier_data")
+async def test_options_not_shared(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that changing an entity's options doesn't change the cached ones."""
+    entry = await async_setup_integration(hass, hass_storage, {ATTR_VOLUME_LEVEL: 10})
+    await hass.async_block_till_done()
+    component = hass.data[SELECT_DOMAIN]
+    for entity_id, cached_options in (
+        (TIMEZONE_ENTITY_ID, get_timezone_options()),
+        (SOUND_PRESET_ENTITY_ID, get_enum_options(SoundPreset)),
+    ):
+        entity = component.get_entity(entity_id)
+        entity.options.append("Invalid")
+        assert "Invalid" not in cached_options
+        assert hass.states.get(entity_id).attributes[ATTR_OPTIONS] == list(
+            cached_options
+        )
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("mock_client", "mock_tier_data")
+async def test_benchmark_state_write(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Benchmark writing the state of the timezone and sound preset selects."""
+    entry = await async_setup_integration(hass, hass_storage, {ATTR_VOLUME_LEVEL: 10})
+    await hass.async_block_till_done()
+    component = hass.data[SELECT_DOMAIN]
+    for entity_id in (TIMEZONE_ENTITY_ID, SOUND_PRESET_ENTITY_ID):
+        entity = component.get_entity(entity_id)
+        start = time.perf_counter()
+        for _ in range(STATE_WRITES):
+            entity.async_write_ha_state()
+        state_write = (time.perf_counter() - start) / STATE_WRITES
+        print(f"{entity_id}: {state_write * 1e6:.1f} us per state write")
+        # Listing the timezones from disk alone takes tens of milliseconds
+        assert state_write < 0.001
+    await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,61 @@
+"""Tests for the sandman_doppler sensor platform."""
+
+from typing import Any
+from unittest.mock import AsyncMock
+
+from doppyler.const import ATTR_VOLUME_LEVEL
+from doppyler.exceptions import DopplerException
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.sandman_doppler.breaker import FAILURE_THRESHOLD
+from custom_components.sandman_doppler.const import DOMAIN
+
+from .common import async_setup_integration
+
+BREAKER_ENTITY_ID = "sensor.clock_dsn1_circuit_breaker"
+
+
+@pytest.mark.usefixtures("mock_client")
+async def test_circuit_breaker_sensor(
+    hass: HomeAssistant, hass_storage: dict[str, Any], mock_tier_data: AsyncMock
+) -> None:
+    """Test that the breaker sensor follows the breaker through failed refreshes."""
+    entry = await async_setup_integration(hass, hass_storage, {ATTR_VOLUME_LEVEL: 10})
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["DSN1"]
+    assert hass.states.get(BREAKER_ENTITY_ID).state == "closed"
+
+    mock_tier_data.side_effect = DopplerException("Clock unplugged")
+    for _ in range(FAILURE_THRESHOLD - 1):
+        await coordinator.async_refresh()
+        assert hass.states.get(BREAKER_ENTITY_ID).state == "closed"
+    await coordinator.async_refresh()
+    assert hass.states.get(BREAKER_ENTITY_ID).state == "open"
+
+    # Once the backoff is over, a probe that fails opens the breaker again
+    coordinator.breaker.retry_at = hass.loop.time()
+    coordinator.doppler.get_is_in_day_mode = AsyncMock(
+        side_effect=DopplerException("Still unplugged")
+    )
+    states = []
+    hass.bus.async_listen(
+        "state_changed",
+        lambda event: (
+            states.append(event.data["new_state"].state)
+            if event.data["entity_id"] == BREAKER_ENTITY_ID
+            else None
+        ),
+    )
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert states == ["half_open", "open"]
+
+    # A probe that succeeds closes it
+    coordinator.breaker.retry_at = hass.loop.time()
+    coordinator.doppler.get_is_in_day_mode = AsyncMock(return_value=True)
+    mock_tier_data.side_effect = None
+    await coordinator.async_refresh()
+    assert hass.states.get(BREAKER_ENTITY_ID).state == "closed"
+    await hass.config_entries.async_unload(entry.entry_id)
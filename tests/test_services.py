@@ -0,0 +1,325 @@
+"""Tests for the sandman_doppler services."""
+
+import asyncio
+import dataclasses
+import time
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aiohttp import ClientConnectionError
+from doppyler.const import ATTR_ALARMS, ATTR_VOLUME_LEVEL
+from doppyler.exceptions import DopplerException
+from doppyler.model.doppler import Doppler
+import pytest
+import voluptuous as vol
+
+from homeassistant.components.number import ATTR_VALUE, SERVICE_SET_VALUE
+from homeassistant.const import (
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
+    ATTR_SERVICE,
+    ATTR_SERVICE_DATA,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.sandman_doppler import DopplerDataUpdateCoordinator
+from custom_components.sandman_doppler.alarms import AlarmSyncPlan, DopplerAlarmIndex
+from custom_components.sandman_doppler.const import (
+    DOMAIN,
+    SERVICE_FORCE_WRITE,
+    SERVICE_SET_WEATHER_LOCATION,
+)
+from custom_components.sandman_doppler.fanout import (
+    FanOutResult,
+    async_fan_out,
+    async_iter_fan_out,
+)
+
+from .common import (
+    CLOUD_LATENCY,
+    async_setup_integration,
+    create_alarm,
+    create_coordinator,
+    create_doppler,
+    create_entry,
+    create_services,
+)
+
+VOLUME_ENTITY_ID = "number.clock_dsn1_volume_level"
+# Resolutions timed for each fleet size
+RESOLUTIONS = 1000
+# Rounds of resolutions to take the best of
+ROUNDS = 5
+
+
+@pytest.mark.usefixtures("mock_client", "mock_tier_data")
+async def test_target_resolved_after_device_added(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that a target isn't cached as empty before its device is added.
+
+    After a restart without cached data, the registry entries of the device
+    already exist unchanged, so adding the device doesn't fire a registry event.
+    """
+    entry = await async_setup_integration(hass, hass_storage)
+    await hass.async_block_till_done()
+    await hass.config_entries.async_unload(entry.entry_id)
+    hass_storage.pop(f"{DOMAIN}.{entry.entry_id}", None)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    device_entry = dr.async_get(hass).async_get_device({(DOMAIN, "DSN1")})
+    service_data = {ATTR_DEVICE_ID: [device_entry.id], "location": "Boston"}
+
+    with patch.object(
+        Doppler, "set_weather_configuration", AsyncMock()
+    ) as set_weather_configuration, patch.object(
+        DopplerDataUpdateCoordinator, "async_refresh_keys", AsyncMock()
+    ):
+        with pytest.raises(vol.Invalid):
+            await hass.services.async_call(
+                DOMAIN, SERVICE_SET_WEATHER_LOCATION, service_data, blocking=True
+            )
+        await asyncio.sleep(CLOUD_LATENCY)
+        await hass.async_block_till_done()
+        await hass.services.async_call(
+            DOMAIN, SERVICE_SET_WEATHER_LOCATION, service_data, blocking=True
+        )
+        await hass.async_block_till_done()
+
+    set_weather_configuration.assert_called_once()
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_benchmark_target_resolution(hass: HomeAssistant) -> None:
+    """Benchmark resolving a single device target against the fleet size."""
+    entry = create_entry(hass)
+    dev_reg = dr.async_get(hass)
+    timings = {}
+    for fleet_size in (10, 100, 1000):
+        for idx in range(len(dev_reg.devices), fleet_size):
+            dev_reg.async_get_or_create(
+                config_entry_id=entry.entry_id, identifiers={(DOMAIN, f"DSN{idx}")}
+            )
+        client = MagicMock(
+            devices={
+                dsn: create_doppler(dsn)
+                for device in dev_reg.devices.values()
+                for _, dsn in device.identifiers
+            }
+        )
+        services = create_services(hass, client=client)
+        device_id = next(iter(dev_reg.devices))
+        rounds = []
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            for _ in range(RESOLUTIONS):
+                services.get_dopplers_from_targets({ATTR_DEVICE_ID: [device_id]})
+            rounds.append((time.perf_counter() - start) / RESOLUTIONS)
+        timings[fleet_size] = min(rounds)
+        print(f"{fleet_size} clocks: {timings[fleet_size] * 1e6:.1f} us per resolution")
+
+    # Resolutions after the first come from the cache, whatever the fleet size
+    assert timings[1000] < 3 * timings[10]
+
+
+@pytest.mark.usefixtures("mock_client", "mock_tier_data")
+async def test_force_write(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test that forced writes skip the cache and only sent writes are counted."""
+    entry = await async_setup_integration(hass, hass_storage, {ATTR_VOLUME_LEVEL: 10})
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["DSN1"]
+    set_data = {ATTR_ENTITY_ID: VOLUME_ENTITY_ID, ATTR_VALUE: 10}
+
+    with patch.object(
+        Doppler, "set_volume_level", AsyncMock(return_value=10)
+    ) as set_volume_level:
+        await hass.services.async_call(
+            "number", SERVICE_SET_VALUE, set_data, blocking=True
+        )
+        set_volume_level.assert_not_called()
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FORCE_WRITE,
+            {ATTR_SERVICE: f"number.{SERVICE_SET_VALUE}", ATTR_SERVICE_DATA: set_data},
+            blocking=True,
+        )
+        set_volume_level.assert_called_once_with(10)
+    assert (coordinator.writes_sent, coordinator.writes_skipped) == (1, 1)
+
+    with patch.object(
+        Doppler, "set_volume_level", AsyncMock(side_effect=DopplerException)
+    ), pytest.raises(DopplerException):
+        await hass.services.async_call(
+            "number", SERVICE_SET_VALUE, {**set_data, ATTR_VALUE: 20}, blocking=True
+        )
+    assert coordinator.writes_sent == 1
+
+    # Only writes to Doppler entities can be forced
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FORCE_WRITE,
+            {ATTR_SERVICE: "homeassistant.restart", ATTR_SERVICE_DATA: set_data},
+            blocking=True,
+        )
+    assert hass.states.get("switch.clock_dsn1_colon_blink")
+    for entity_id in ("number.other_volume", "switch.clock_dsn1_colon_blink"):
+        with pytest.raises(HomeAssistantError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_FORCE_WRITE,
+                {
+                    ATTR_SERVICE: f"number.{SERVICE_SET_VALUE}",
+                    ATTR_SERVICE_DATA: {**set_data, ATTR_ENTITY_ID: entity_id},
+                },
+                blocking=True,
+            )
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_fan_out_concurrency_cap() -> None:
+    """Test that at most `max_concurrent` calls run at the same time."""
+    devices = [create_doppler(f"DSN{idx}") for idx in range(7)]
+    running = peak = 0
+
+    async def _async_call(device: Doppler) -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return device.dsn
+
+    result = await async_fan_out(devices, _async_call, max_concurrent=3)
+    assert peak == 3
+    assert result.succeeded == {device: device.dsn for device in devices}
+    assert not result.failed and not result.timed_out
+
+
+async def test_fan_out_timeout() -> None:
+    """Test that slow devices time out and the deadline scales with the requests."""
+    fast, slow, serial = (create_doppler(dsn) for dsn in ("DSN1", "DSN2", "DSN3"))
+    delays = {fast: 0, slow: 1, serial: 0.15}
+
+    async def _async_call(device: Doppler) -> None:
+        await asyncio.sleep(delays[device])
+
+    result = await async_fan_out(
+        delays,
+        _async_call,
+        timeout=0.1,
+        requests=lambda device: 2 if device is serial else 1,
+    )
+    assert list(result.succeeded) == [fast, serial]
+    assert result.timed_out == [slow]
+
+    result = await async_fan_out(delays, _async_call, timeout=0.1)
+    assert set(result.timed_out) == {serial, slow}
+
+
+async def test_fan_out_raise_for_errors() -> None:
+    """Test that every failed and timed out device is listed in the error."""
+    devices = [create_doppler(f"DSN{idx}") for idx in range(3)]
+    FanOutResult(succeeded={devices[0]: None}).raise_for_errors()
+
+    result = FanOutResult(
+        failed={devices[0]: DopplerException("Refused")}, timed_out=[devices[1]]
+    )
+    with pytest.raises(HomeAssistantError) as exc_info:
+        result.raise_for_errors()
+    assert str(exc_info.value) == (
+        "2 error(s):\n"
+        f"{devices[0]} - DopplerException: Refused\n"
+        f"{devices[1]} - timed out"
+    )
+
+    result = FanOutResult(failed={devices[2]: ValueError("Bad value")})
+    with pytest.raises(HomeAssistantError) as exc_info:
+        result.raise_for_errors()
+    assert str(exc_info.value) == f"{devices[2]} - ValueError: Bad value"
+
+
+async def test_iter_fan_out_streams_results() -> None:
+    """Test that results are yielded as devices finish, not in the given order."""
+    devices = [create_doppler(f"DSN{idx}") for idx in range(3)]
+    delays = dict(zip(devices, (0.1, 0, 0.05)))
+    failing = devices[2]
+
+    async def _async_call(device: Doppler) -> str:
+        await asyncio.sleep(delays[device])
+        if device is failing:
+            raise DopplerException("Refused")
+        return device.dsn
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    finished = []
+    async for device, value, err in async_iter_fan_out(devices, _async_call):
+        finished.append((device, value, type(err)))
+        if device is devices[1]:
+            # The first result doesn't wait for the slowest device
+            assert loop.time() - start < delays[devices[0]]
+    assert finished == [
+        (devices[1], "DSN1", type(None)),
+        (failing, None, DopplerException),
+        (devices[0], "DSN0", type(None)),
+    ]
+
+
+async def _async_hang(*args: Any) -> None:
+    """Take longer than any fan-out deadline in the tests."""
+    await asyncio.sleep(1)
+
+
+@pytest.mark.parametrize(
+    ("side_effect", "timeout"),
+    [
+        (ClientConnectionError("Refused"), 1),
+        # Cancelled by the fan-out deadline partway through the writes
+        (_async_hang, 0.05),
+    ],
+)
+async def test_failed_alarm_sync_rereads_alarms(
+    hass: HomeAssistant, side_effect: Any, timeout: float
+) -> None:
+    """Test that alarms are read again after a failed sync and kept after success."""
+    doppler = create_doppler()
+    alarm = doppler.alarms[1] = create_alarm([])
+    alarm_index = DopplerAlarmIndex(hass)
+    untrack = alarm_index.async_track(doppler)
+    coordinator = create_coordinator(hass, create_entry(hass), doppler)
+    services = create_services(hass, alarm_index=alarm_index)
+    plan = AlarmSyncPlan(update=[dataclasses.replace(alarm, name="Get up")])
+
+    # pylint: disable=protected-access
+    with patch.object(
+        Doppler, "update_alarm", AsyncMock(side_effect=side_effect)
+    ) as update_alarm, patch.object(
+        coordinator, "async_refresh_keys", AsyncMock()
+    ) as async_refresh_keys, patch.object(
+        coordinator, "async_update_keys"
+    ) as async_update_keys:
+        alarm_index.async_confirm("DSN1")
+        result = await async_fan_out(
+            [doppler],
+            lambda device: services._async_apply_alarm_sync(device, plan),
+            timeout=timeout,
+        )
+        await hass.async_block_till_done()
+        assert result.failed or result.timed_out
+        assert not alarm_index.async_is_fresh("DSN1")
+        async_refresh_keys.assert_called_once_with(ATTR_ALARMS)
+        async_update_keys.assert_not_called()
+
+        update_alarm.side_effect = None
+        update_alarm.return_value = plan.update
+        await services._async_apply_alarm_sync(doppler, plan)
+        await hass.async_block_till_done()
+        assert alarm_index.async_is_fresh("DSN1")
+        assert alarm.name == "Get up"
+        async_refresh_keys.assert_called_once()
+        async_update_keys.assert_called_once_with(ATTR_ALARMS)
+
+    untrack()
+    await coordinator.async_shutdown()
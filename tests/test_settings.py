@@ -0,0 +1,73 @@
+"""Tests for the sandman_doppler settings."""
+
+from unittest.mock import AsyncMock, patch
+
+from aiohttp import ClientConnectionError
+from doppyler.const import ATTR_DAY_TO_NIGHT_TRANSITION_VALUE, ATTR_VOLUME_LEVEL
+from doppyler.model.doppler import Doppler
+import pytest
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.sandman_doppler.settings import (
+    async_get_drift,
+    async_write_settings,
+    validate_settings,
+)
+
+from .common import create_coordinator, create_doppler, create_entry
+
+
+def test_validate_settings() -> None:
+    """Test that settings are coerced and unknown or invalid ones rejected."""
+    assert validate_settings({"volume_level": "30", "colon_blink": "on"}) == {
+        "volume_level": 30,
+        "colon_blink": True,
+    }
+    with pytest.raises(vol.Invalid):
+        validate_settings({"volume_level": 101})
+    with pytest.raises(vol.Invalid):
+        validate_settings({"volume": 30})
+
+
+async def test_drift(hass: HomeAssistant) -> None:
+    """Test that only settings the device reported with another value drift."""
+    coordinator = create_coordinator(hass, create_entry(hass), create_doppler())
+    coordinator.data = {ATTR_VOLUME_LEVEL: 10, "colon_blink": True}
+    assert async_get_drift(
+        coordinator,
+        {"volume_level": 30, "colon_blink": True, "day_to_night_transition": 5},
+    ) == {"volume_level": 30}
+    await coordinator.async_shutdown()
+
+
+async def test_write_settings_failure(hass: HomeAssistant) -> None:
+    """Test that the settings written before a failure are kept and counted."""
+    coordinator = create_coordinator(hass, create_entry(hass), create_doppler())
+    coordinator.data = {
+        ATTR_VOLUME_LEVEL: 10,
+        ATTR_DAY_TO_NIGHT_TRANSITION_VALUE: 0,
+    }
+    with patch.object(
+        Doppler, "set_volume_level", AsyncMock(return_value=30)
+    ), patch.object(
+        Doppler,
+        "set_day_to_night_transition_value",
+        AsyncMock(side_effect=ClientConnectionError("Refused")),
+    ), patch.object(
+        coordinator, "async_update_keys"
+    ) as async_update_keys, pytest.raises(
+        ClientConnectionError
+    ):
+        await async_write_settings(
+            coordinator, {"volume_level": 30, "day_to_night_transition": 5}
+        )
+
+    assert coordinator.data == {
+        ATTR_VOLUME_LEVEL: 30,
+        ATTR_DAY_TO_NIGHT_TRANSITION_VALUE: 0,
+    }
+    assert coordinator.writes_sent == 1
+    async_update_keys.assert_called_once_with(ATTR_VOLUME_LEVEL)
+    await coordinator.async_shutdown()
@@ -0,0 +1,136 @@
+"""Tests for the sandman_doppler snapshots and the restore service."""
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from doppyler.const import ATTR_DEVICES, ATTR_VOLUME_LEVEL
+from doppyler.model.doppler import Doppler
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from custom_components.sandman_doppler.const import (
+    ATTR_PERSIST,
+    ATTR_SNAPSHOT,
+    DOMAIN,
+)
+from custom_components.sandman_doppler.snapshot import SAVE_DELAY, DopplerSnapshots
+
+from .common import create_coordinator, create_doppler, create_entry, create_services
+
+
+async def _async_flush_saves(hass: HomeAssistant) -> None:
+    """Let the delayed saves of the snapshots go out."""
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SAVE_DELAY))
+    await hass.async_block_till_done()
+
+
+async def test_snapshot_taken(hass: HomeAssistant) -> None:
+    """Test that a snapshot holds the setting values each device reported."""
+    entry = create_entry(hass)
+    snapshots = DopplerSnapshots(hass, entry)
+    services = create_services(hass, snapshots=snapshots)
+    doppler = create_doppler()
+    coordinator = create_coordinator(hass, entry, doppler)
+    coordinator.data = {ATTR_VOLUME_LEVEL: 10, "colon_blink": True}
+
+    await services.handle_snapshot(
+        MagicMock(
+            data={ATTR_DEVICES: {doppler}, ATTR_SNAPSHOT: "evening", ATTR_PERSIST: True}
+        )
+    )
+    assert snapshots.async_get("evening", "DSN1") == {
+        "volume_level": 10,
+        "colon_blink": True,
+    }
+    assert snapshots.async_get("evening", "DSN2") is None
+    assert snapshots.async_get("morning", "DSN1") is None
+
+    # Devices without data can't be snapshotted
+    coordinator.data = {}
+    with pytest.raises(HomeAssistantError):
+        await services.handle_snapshot(
+            MagicMock(
+                data={
+                    ATTR_DEVICES: {doppler},
+                    ATTR_SNAPSHOT: "evening",
+                    ATTR_PERSIST: False,
+                }
+            )
+        )
+    await coordinator.async_shutdown()
+
+
+async def test_unpersisted_snapshot_replaces_persisted(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that a snapshot taken without persist stops a stored one surviving."""
+    entry = create_entry(hass)
+    snapshots = DopplerSnapshots(hass, entry)
+    snapshots.async_save("evening", {"DSN1": {"volume_level": 10}}, True)
+    snapshots.async_save("morning", {"DSN1": {"volume_level": 50}}, True)
+    await _async_flush_saves(hass)
+
+    snapshots.async_save("evening", {"DSN1": {"volume_level": 20}}, False)
+    await _async_flush_saves(hass)
+    assert snapshots.async_get("evening", "DSN1") == {"volume_level": 20}
+    assert hass_storage[f"{DOMAIN}.{entry.entry_id}.snapshots"]["data"] == {
+        "snapshots": {"morning": {"DSN1": {"volume_level": 50}}}
+    }
+
+    restarted = DopplerSnapshots(hass, entry)
+    await restarted.async_load()
+    assert restarted.async_get("evening", "DSN1") is None
+    assert restarted.async_get("morning", "DSN1") == {"volume_level": 50}
+
+
+async def test_restore_writes_changed_settings(hass: HomeAssistant) -> None:
+    """Test that restoring only writes the settings that changed since."""
+    entry = create_entry(hass)
+    snapshots = DopplerSnapshots(hass, entry)
+    snapshots.async_save(
+        "default", {"DSN1": {"volume_level": 10, "colon_blink": True}}, False
+    )
+    services = create_services(hass, snapshots=snapshots)
+    doppler = create_doppler()
+    coordinator = create_coordinator(hass, entry, doppler)
+    coordinator.data = {ATTR_VOLUME_LEVEL: 30, "colon_blink": True}
+    call = MagicMock(
+        data={ATTR_DEVICES: {doppler}, ATTR_SNAPSHOT: "default"}, return_response=True
+    )
+
+    with patch.object(
+        Doppler, "set_volume_level", AsyncMock(return_value=10)
+    ) as set_volume_level, patch.object(
+        Doppler, "set_colon_blink_mode", AsyncMock(return_value=True)
+    ) as set_colon_blink:
+        assert await services.handle_restore(call) == {"DSN1": ["volume_level"]}
+        assert await services.handle_restore(call) == {"DSN1": []}
+    set_volume_level.assert_called_once_with(10)
+    set_colon_blink.assert_not_called()
+    assert coordinator.data[ATTR_VOLUME_LEVEL] == 10
+    await coordinator.async_shutdown()
+
+
+async def test_restore_unknown_snapshot(hass: HomeAssistant) -> None:
+    """Test that restoring a snapshot a device isn't in raises an error."""
+    entry = create_entry(hass)
+    snapshots = DopplerSnapshots(hass, entry)
+    snapshots.async_save("default", {"DSN2": {"volume_level": 10}}, False)
+    services = create_services(hass, snapshots=snapshots)
+    doppler = create_doppler()
+    coordinator = create_coordinator(hass, entry, doppler)
+    coordinator.data = {ATTR_VOLUME_LEVEL: 30}
+
+    with patch.object(Doppler, "set_volume_level", AsyncMock()) as set_volume_level:
+        for name in ("default", "evening"):
+            with pytest.raises(HomeAssistantError, match=f"Snapshot {name} not found"):
+                await services.handle_restore(
+                    MagicMock(data={ATTR_DEVICES: {doppler}, ATTR_SNAPSHOT: name})
+                )
+    set_volume_level.assert_not_called()
+    await coordinator.async_shutdown()
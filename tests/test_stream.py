@@ -0,0 +1,50 @@
+"""Tests for the sandman_doppler mini display stream."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from doppyler.exceptions import DopplerException
+from doppyler.model.color import Color
+from doppyler.model.doppler import Doppler
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.sandman_doppler import stream
+from custom_components.sandman_doppler.stream import DopplerMiniDisplayStream
+
+from .common import create_doppler
+
+SOURCE_ENTITY_ID = "sensor.source"
+# Seconds to wait before trying a failed write again in the tests
+RETRY_INTERVAL = 0.05
+
+
+@pytest.mark.parametrize("error", [DopplerException, ValueError])
+async def test_failed_write_retried(hass: HomeAssistant, error: type) -> None:
+    """Test that a failed write is tried again and doesn't end the stream."""
+    hass.states.async_set(SOURCE_ENTITY_ID, "10")
+    mini_display_stream = DopplerMiniDisplayStream(
+        hass,
+        create_doppler(),
+        SOURCE_ENTITY_ID,
+        timedelta(minutes=1),
+        Color(255, 255, 255),
+        1,
+        timedelta(0),
+    )
+    with patch.object(stream, "RETRY_INTERVAL", RETRY_INTERVAL), patch.object(
+        Doppler, "set_mini_display_number", AsyncMock(side_effect=[error, None, None])
+    ) as set_mini_display_number:
+        mini_display_stream.async_start()
+        await asyncio.sleep(RETRY_INTERVAL * 2)
+        assert [call.args[0].number for call in set_mini_display_number.mock_calls] == [
+            10,
+            10,
+        ]
+
+        hass.states.async_set(SOURCE_ENTITY_ID, "20")
+        await hass.async_block_till_done()
+        assert set_mini_display_number.mock_calls[-1].args[0].number == 20
+    mini_display_stream.async_stop()